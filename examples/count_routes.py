@@ -14,7 +14,7 @@ import pathlib
 import re
 import sys
 
-from pybgproutesapi import vantage_points, rib
+from pybgproutesapi import BGPRoutesClient
 
 argp = argparse.ArgumentParser(description=__doc__)
 argp.add_argument(
@@ -48,10 +48,8 @@ config.read(args.config)
 api_endpoint    = config['bgproutes.io']['endpoint']
 api_key         = config['bgproutes.io']['key']
 
-api_req_headers = {
-    'accept':       'application/json',
-    'x-api-key':    api_key,
-}
+# One client for the whole run: every rib() call below reuses the same pooled connection.
+client = BGPRoutesClient(base_url=f'https://{api_endpoint}', api_key=api_key)
 
 vantage_points_sources  = ('bgproutes.io', 'pch' , 'ris', 'routeviews', 'cgtf')
 vantage_points_asns     = (701, 1299, 2914, 3257, 3320, 3356, 3491, 5511, 6453,
@@ -66,7 +64,7 @@ def route_count(afi, asn, date=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S")):
         return 0
 
     try:
-        req_vantage_points = vantage_points(
+        req_vantage_points = client.vantage_points(
             sources=vantage_points_sources,
             vp_asns=vantage_points_asns,
             data_afi=6 if '6' in afi else 4,
@@ -76,17 +74,30 @@ def route_count(afi, asn, date=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S")):
         _log.error(f'https://{api_endpoint}/vantage_point for returned error: {e}')
         sys.exit(1)
 
-    route_count = {}
+    rib_args = dict(
+        date=date,
+        aspath_regexp=f'.*{asn}.*',
+        return_count=True,
+        data_afi=6 if '6' in afi else 4)
+
+    # One logical query per VP; the planner sends them as a few merged rib() calls.
+    planner = client.planner()
     for vp in req_vantage_points:
+        planner.rib(vp, **rib_args)
+
+    try:
+        responses = planner.run()
+    except Exception as e:
+        # One failing VP fails its whole merged call: ask VP by VP to skip only the failing ones.
+        _log.error(f'https://{api_endpoint}/rib for merged VPs returned error: {e}, querying VP by VP')
+        responses = [None] * len(req_vantage_points)
+
+    route_count = {}
+    for vp, response in zip(req_vantage_points, responses):
         print (f'Processing VP: {vp}')
         try:
-            
-            response = rib(
-                vp,
-                date=date,
-                aspath_regexp=f'.*{asn}.*',
-                return_count=True,
-                data_afi=6 if '6' in afi else 4)
+            if response is None:
+                response = client.rib(vp, **rib_args)
 
             if str(vp.unique_id) in response[vp.peering_protocol]:
                 route_count[vp] = response[vp.peering_protocol][str(vp.unique_id)]
@@ -95,7 +106,7 @@ def route_count(afi, asn, date=datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S")):
 
         except Exception as e:
             _log.error(f'https://{api_endpoint}/rib for {vp} returned error: {e}')
-            continue     
+            continue
 
         if route_count[vp] == 0:
             _log.debug(f'{vp} does not see {asn}')
@@ -1,6 +1,5 @@
-from pybgproutesapi import vantage_points, topology, chunked
+from pybgproutesapi import vantage_points, topology, chunked, TopologyGraph
 from datetime import datetime, timedelta
-import networkx as nx
 
 # Compute yesterday's date (only the day part is used for topology API)
 rib_date = (datetime.utcnow() - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
@@ -17,8 +16,8 @@ vps = vantage_points(
 # WARNING: This line speeds up the processing, but DO NOT FORGET to remove the line if you want complete data.
 vps = vps[:30]
 
-# Initialize empty graph
-G = nx.Graph()
+# Initialize empty graph (links are deduplicated across batches)
+G = TopologyGraph()
 
 # Process in batches of 10
 for vp_batch in chunked(vps, 10):
@@ -33,12 +32,12 @@ for vp_batch in chunked(vps, 10):
     topo = topology(vp_batch, date=rib_date_str, with_rib=True, with_updates=False)
 
     # Add edges to the graph from the topology data
-    for as1, as2 in topo['links']:
-        G.add_edge(as1, as2)
+    G.add_topology(topo)
 
 # Identify ASes that are single-homed to AS5511
-neighbors = [asn for asn in G.neighbors(5511)]
-single_homed = [asn for asn in G.neighbors(5511) if G.degree[asn] == 1]
+neighbors = G.neighbors(5511).tolist()
+degrees = G.degree()
+single_homed = [asn for asn in neighbors if degrees[G.index(asn)] == 1]
 
 print (f"\n✅ Found {len(neighbors)} neighbors ASes of AS5511")
 print (f"\n✅ Found {len(single_homed)} single-homed ASes of AS5511")
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from pybgproutesapi import vantage_points, topology, chunked
+from pybgproutesapi import vantage_points, topology, chunked, TopologyGraph
 
 # Use current day minus one day
 yesterday = datetime.utcnow() - timedelta(days=1)
@@ -9,8 +9,8 @@ date_str = date.strftime("%Y-%m-%d")
 i = 0
 
 for source in ['routeviews', 'ris', 'pch']:
-    # Store unique AS links (as tuples)
-    all_links = set()
+    # Store unique AS links (deduplicated across batches)
+    all_links = TopologyGraph()
 
     outfile = f'links_{source}.txt'
     fd = open(outfile, 'w', 1)
@@ -30,18 +30,13 @@ for source in ['routeviews', 'ris', 'pch']:
         
         try:
             topo = topology(batch, date_str)
-            # Normalize links as tuples of integers
-            for as1, as2 in topo["links"]:
-                if as1 < as2:
-                    all_links.add((as1, as2))
-                else:
-                    all_links.add((as2, as1))
+            all_links.add_topology(topo)
         except Exception as e:
             print(f"Error processing batch {i // batch_size + 1}: {e}")
     
         i += 1
 
-    for as1, as2 in all_links:
+    for as1, as2 in all_links.links().tolist():
         fd.write(f'{as1} {as2}\n')
 
     fd.close()
@@ -52,7 +47,7 @@ for source in ['routeviews', 'ris', 'pch']:
 
 def read_links(filename):
     with open(filename, 'r') as f:
-        return set(tuple(map(int, line.strip().split())) for line in f if line.strip())
+        return TopologyGraph(tuple(map(int, line.split())) for line in f if line.strip())
 
 # Load link sets
 pch_links = read_links('links_pch.txt')
@@ -1,4 +1,4 @@
-from pybgproutesapi import vantage_points, rib
+from pybgproutesapi import BGPRoutesClient, RetryPolicy
 from datetime import datetime, timedelta
 import requests  # only used for exception types
 
@@ -8,7 +8,10 @@ rib_date_str = rib_date.strftime("%Y-%m-%dT%H:%M:%S")
 
 min_hops = None
 
-vps = vantage_points(
+# Transient 5xx / invalid JSON / timeouts are retried by the client; the except below only sees persistent failures.
+client = BGPRoutesClient(retry=RetryPolicy(max_retries=3))
+
+vps = client.vantage_points(
     sources=["bgproutes.io"],
     date=rib_date_str,
 )
@@ -19,7 +22,7 @@ for vp in vps[:100]:
     print(vp)
 
     try:
-        rib_dic = rib(
+        rib_dic = client.rib(
             vp,
             date=rib_date_str,
             aspath_regexp=aspath_re,
@@ -36,8 +39,9 @@ for vp in vps[:100]:
     vp_dic = proto_dic.get(str(vp.unique_id), {})
 
     for tup in vp_dic.values():
-        aspath_str = tup[0]
-        aspath = [int(asn) for asn in aspath_str.split() if asn.isdigit()]
+        # Paths are shared by many prefixes and VPs: the client pool parses each distinct one once.
+        # AS sets (frozenset hops) are skipped, as they are not single ASNs.
+        aspath = [asn for asn in client.paths.parse(tup[0]) if isinstance(asn, int)]
 
         # Guard: only compute if both ASNs are present
         if 1853 not in aspath or 2914 not in aspath:
@@ -1,25 +1,65 @@
 from .endpoints.vantage_points import vantage_points
-from .endpoints.updates import updates
-from .endpoints.rib import rib
-from .endpoints.topology import topology
+from .endpoints.updates import updates, updates_sharded
+from .endpoints.rib import rib, rib_many, rib_as_completed
+from .endpoints.topology import topology, topology_graph
+from .endpoints.planner import QueryPlanner, plan_queries
 from .endpoints.messages import messages
 from .endpoints.monitoring import monitoring
 from .endpoints.internal import (
     bmp_rib_with_status,
+    iter_bmp_rib_with_status,
     bmp_updates_for_analysis,
     route_propagation_path,
 )
 from .utils.prints import format_updates_response, format_rib_response
 from .utils.helpers import chunked, merge_responses
+from .utils.concurrency import AdaptiveConcurrency
+from .utils.retry import RetryPolicy
+from .utils.cache import DiskCache
+from .utils.filters import RouteFilter
+from .utils.catalog import VPCatalog
+from .utils.table import RibTable
+from .utils.prefix import PrefixIndex
+from .utils.replay import RibReplayer
+from .utils.graph import TopologyGraph
+from .utils.frame import UpdatesFrame
+from .utils.intern import InternPool, parse_aspath, parse_communities
+from .utils.pathmatch import PathMatcher
+from .client import BGPRoutesClient, AsyncBGPRoutesClient, default_client, set_default_client
 
 __all__ = [
+    "BGPRoutesClient",
+    "AsyncBGPRoutesClient",
+    "default_client",
+    "set_default_client",
+    "AdaptiveConcurrency",
+    "RetryPolicy",
+    "DiskCache",
+    "RouteFilter",
+    "VPCatalog",
+    "RibTable",
+    "PrefixIndex",
+    "RibReplayer",
+    "TopologyGraph",
+    "UpdatesFrame",
+    "InternPool",
+    "PathMatcher",
+    "parse_aspath",
+    "parse_communities",
     "vantage_points",
     "rib",
+    "rib_many",
+    "rib_as_completed",
     "updates",
+    "updates_sharded",
     "topology",
+    "topology_graph",
+    "QueryPlanner",
+    "plan_queries",
     "messages",
     "monitoring",
     "bmp_rib_with_status",
+    "iter_bmp_rib_with_status",
     "bmp_updates_for_analysis",
     "route_propagation_path",
     "format_updates_response",
@@ -0,0 +1,547 @@
+import asyncio
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .constants import BASE_URL
+from .utils.cache import CACHE_MODES, SUPERSET_PATHS, DiskCache
+from .utils.concurrency import AdaptiveConcurrency
+from .utils.encoding import (
+    ACCEPT_ENCODING,
+    COMPRESS_MIN_BYTES,
+    COMPRESSION_REJECTED,
+    accept_header,
+    binary_format,
+    gzip_body,
+)
+from .utils.decoder import get_decoder
+from .utils.errors import InvalidJSONResponse
+from .utils.filters import apply_filters, narrows, split_params
+from .utils.intern import aspath_pool, community_pool
+from .utils.retry import RetryPolicy
+from .utils.shard import MAX_URL_BYTES, SPLIT_TARGET_BYTES
+from .utils.query import _api_key, _decode, _stream, _unwrap, _url
+from .endpoints.vantage_points import vantage_points
+from .endpoints.updates import updates, updates_sharded
+from .endpoints.rib import rib, rib_as_completed, rib_many
+from .endpoints.topology import topology, topology_graph
+from .endpoints.planner import QueryPlanner
+from .endpoints.messages import messages
+from .endpoints.monitoring import monitoring
+from .endpoints.internal import (
+    bmp_rib_with_status,
+    iter_bmp_rib_with_status,
+    bmp_updates_for_analysis,
+    route_propagation_path,
+)
+
+
+DEFAULT_TIMEOUT = 300
+
+
+class BGPRoutesClient:
+    """
+    Client holding a pooled keep-alive HTTP session to the bgproutes.io API.
+
+    The underlying connection pool is shared by every call made through the
+    client, so repeated queries reuse TCP/TLS connections instead of setting
+    up a new one per request. A single client can be used from several threads.
+
+    :param base_url: API origin, defaults to `https://api.bgproutes.io`.
+    :param api_key: API key. If omitted, `BGP_API_KEY` is read from the environment at request time.
+    :param pool_size: Maximum number of connections kept open per host.
+    :param timeout: Default request timeout in seconds.
+    :param timeouts: Per-endpoint timeout overrides, e.g. `{"/updates": 600}`.
+    :param concurrency: Optional :class:`AdaptiveConcurrency` governor limiting
+        the requests in flight and resending rate-limited ones.
+    :param retry: Optional :class:`RetryPolicy` for transient failures and hedged GETs.
+    :param cache: Optional :class:`DiskCache` storing responses on disk. Each
+        call can then pass `cache_mode="use"` (default), `"bypass"` or `"refresh"`.
+    :param compress_min_bytes: POST bodies of at least this many bytes are sent
+        gzip-compressed (None disables it). If the server rejects a compressed
+        body but accepts the plain one, compression is turned off for the client.
+    :param response_format: `"json"`, or `"msgpack"`/`"cbor"` to ask for a
+        binary response. JSON stays accepted, so this is only a preference,
+        and it is ignored when the decoding package is not installed.
+    :param json_decoder: JSON backend (`"orjson"`, `"simdjson"`, `"ujson"` or
+        `"json"`). By default, the fastest installed one is used.
+    :param max_url_bytes: Queries (except `vantage_points`, always GET) are
+        sent as GET unless their URL would be longer than this, in which case
+        they are sent as POST.
+    :param split_target_bytes: `rib`, `updates`, `topology` and
+        `bmp_rib_with_status` queries whose encoded parameters are larger than
+        this are split into sub-requests of at most this size over their VP and
+        exact-match lists, and the results are merged (None disables it).
+    :param split_workers: Number of sub-requests of a split query sent concurrently.
+
+    Responses are requested with the strongest content encodings urllib3 can
+    decode (zstd and brotli when `urllib3[zstd,brotli]` is installed, else gzip).
+
+    The client owns two :class:`InternPool`, `paths` and `communities`, shared
+    by every `RibTable` and `UpdatesFrame` it builds: each distinct AS path or
+    community string is stored and parsed once across VPs and calls.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        pool_size: int = 10,
+        timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Optional[Dict[str, float]] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        retry: Optional[RetryPolicy] = None,
+        cache: Optional[DiskCache] = None,
+        compress_min_bytes: Optional[int] = COMPRESS_MIN_BYTES,
+        response_format: str = "json",
+        json_decoder: Optional[str] = None,
+        max_url_bytes: int = MAX_URL_BYTES,
+        split_target_bytes: Optional[int] = SPLIT_TARGET_BYTES,
+        split_workers: int = 4,
+    ):
+        self.base_url = BASE_URL if base_url is None else base_url
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.timeouts = {self._endpoint(k): v for k, v in (timeouts or {}).items()}
+        self.concurrency = concurrency
+        self.retry = retry
+        self.cache = cache
+        self.compress_min_bytes = compress_min_bytes
+        self.response_format = response_format
+        self.max_url_bytes = max_url_bytes
+        self.split_target_bytes = split_target_bytes
+        self.split_workers = split_workers
+        self.paths = aspath_pool()
+        self.communities = community_pool()
+
+        self._binary = binary_format(response_format)
+        self._loads = get_decoder(json_decoder)
+        self._compress_bodies = compress_min_bytes is not None
+
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    # ---------- Context manager ----------
+    def __enter__(self) -> "BGPRoutesClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections, and the hedging threads of `retry`."""
+        if self.retry is not None:
+            self.retry.close()
+        self.session.close()
+
+    # ---------- Transport ----------
+    @staticmethod
+    def _endpoint(path: str) -> str:
+        return path if path.startswith('/') else '/' + path
+
+    def timeout_for(self, path: str) -> float:
+        """Return the timeout used for the given endpoint path."""
+        return self.timeouts.get(self._endpoint(path), self.timeout)
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any],
+        details: bool = True,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+        stream: Optional[Callable[[Iterable[bytes]], Iterator[Any]]] = None,
+        cache_mode: str = "use",
+    ) -> Any:
+        """
+        Send one API request and return the decoded result.
+
+        If `stream` is given, the body is not buffered: the response is
+        returned as the iterator produced by `stream` over the raw body chunks.
+        Streamed responses are never cached. With a :class:`DiskCache`,
+        `cache_mode="use"` answers from the cache when possible, `"refresh"`
+        always queries the API and overwrites the cached entry, and `"bypass"`
+        leaves the cache untouched.
+        """
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"cache_mode must be one of {CACHE_MODES}, got {cache_mode!r}")
+
+        key = None
+        family = None
+        if self.cache is not None and stream is None and cache_mode != "bypass":
+            endpoint_base = base_url if base_url is not None else self.base_url
+            key = self.cache.key(endpoint_base, self._endpoint(path), params)
+            base, filters = split_params(params)
+            if self._endpoint(path) in SUPERSET_PATHS and not base.get("return_count"):
+                family = self.cache.key(endpoint_base, self._endpoint(path), base)
+            if cache_mode == "use":
+                content = self.cache.get(key)
+                if content is None and family is not None and filters:
+                    content = self._from_superset(path, family, base, filters)
+                if content is not None:
+                    result = content if details else content["data"]
+                    return parse(result) if parse is not None else result
+
+        headers = {"x-api-key": _api_key(api_key if api_key is not None else self.api_key)}
+        url = _url(path, base_url if base_url is not None else self.base_url)
+
+        # Streamed bodies go through the incremental JSON decoder.
+        binary = self._binary if stream is None else None
+        headers.update(accept_header(binary))
+
+        body = None
+        if method == "GET":
+            kwargs = {"params": {k: v for k, v in params.items() if v is not None}}
+        else:
+            headers["Content-Type"] = "application/json"
+            body = json.dumps(params, allow_nan=False).encode()
+            kwargs = {"data": body}
+        gzipped = None
+        if self._compress_bodies and body is not None and len(body) >= self.compress_min_bytes:
+            gzipped = gzip_body(body)
+
+        def _http():
+            options = {"timeout": self.timeout_for(path), "stream": stream is not None}
+            if gzipped is not None and self._compress_bodies:
+                response = self.session.request(method, url, headers={**headers, "Content-Encoding": "gzip"},
+                                                data=gzipped, **options)
+                if response.status_code not in COMPRESSION_REJECTED:
+                    return response
+                response.close()
+                response = self.session.request(method, url, headers=headers, **options, **kwargs)
+                if response.status_code < 400:
+                    # Only the compressed body was refused: stop compressing for this server.
+                    self._compress_bodies = False
+                return response
+            return self.session.request(method, url, headers=headers, **options, **kwargs)
+
+        def _send():
+            response = _http()
+            if stream is not None:
+                if response.status_code >= 400:
+                    _decode(response, details)
+                return _stream(response, stream)
+            if key is not None:
+                # Cache the full envelope so that both `details` values can be served from it.
+                content = _decode(response, True, binary, self._loads)
+                self.cache.set(key, content, self.cache.expires(params))
+                if family is not None:
+                    self.cache.remember(family, key, filters)
+                return content if details else content["data"]
+            return _decode(response, details, binary, self._loads)
+
+        def _attempt():
+            if self.concurrency is not None:
+                return self.concurrency.call(_send)
+            return _send()
+
+        if self.retry is not None:
+            result = self.retry.call(method, self._endpoint(path), _attempt, hedge=stream is None)
+        else:
+            result = _attempt()
+
+        if stream is not None:
+            return result
+        return parse(result) if parse is not None else result
+
+    def _from_superset(self, path: str, family: str, base: Dict[str, Any],
+                       filters: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Answer a `/rib` or `/updates` query from a cached response to the same
+        query with fewer filters, by applying the missing filters locally.
+        """
+        for superset_key, superset in self.cache.supersets(family):
+            if not narrows(filters, superset, base):
+                continue
+            content = self.cache.get(superset_key)
+            if content is not None:
+                return {**content, "data": apply_filters(path, content["data"], filters, superset)}
+        return None
+
+    def get(self, path: str, params: Dict[str, Any], details: bool = True, base_url: str = None,
+            api_key: str = None, parse: Optional[Callable[[Any], Any]] = None, stream=None,
+            cache_mode: str = "use") -> Any:
+        return self.request("GET", path, params, details, base_url=base_url, api_key=api_key, parse=parse,
+                            stream=stream, cache_mode=cache_mode)
+
+    def post(self, path: str, json_payload: Dict[str, Any], details: bool = True, base_url: str = None,
+             api_key: str = None, parse: Optional[Callable[[Any], Any]] = None, stream=None,
+            cache_mode: str = "use") -> Any:
+        return self.request("POST", path, json_payload, details, base_url=base_url, api_key=api_key, parse=parse,
+                            stream=stream, cache_mode=cache_mode)
+
+    # ---------- Endpoints ----------
+    def vantage_points(self, *args, **kwargs):
+        """Query `/vantage_points`, see :func:`pybgproutesapi.vantage_points`."""
+        return vantage_points(*args, client=self, **kwargs)
+
+    def updates(self, *args, **kwargs):
+        """Query `/updates`, see :func:`pybgproutesapi.updates`."""
+        return updates(*args, client=self, **kwargs)
+
+    def updates_sharded(self, *args, **kwargs):
+        """Query `/updates` in concurrent time windows, see :func:`pybgproutesapi.updates_sharded`."""
+        return updates_sharded(*args, client=self, **kwargs)
+
+    def rib(self, *args, **kwargs):
+        """Query `/rib`, see :func:`pybgproutesapi.rib`."""
+        return rib(*args, client=self, **kwargs)
+
+    def rib_many(self, *args, **kwargs):
+        """Query `/rib` in concurrent VP batches, see :func:`pybgproutesapi.rib_many`."""
+        return rib_many(*args, client=self, **kwargs)
+
+    def rib_as_completed(self, *args, **kwargs):
+        """Iterate over concurrent `/rib` VP batches, see :func:`pybgproutesapi.rib_as_completed`."""
+        return rib_as_completed(*args, client=self, **kwargs)
+
+    def planner(self, **kwargs) -> QueryPlanner:
+        """Return a :class:`QueryPlanner` merging `rib`/`updates` queries sent through this client."""
+        return QueryPlanner(client=self, **kwargs)
+
+    def topology(self, *args, **kwargs):
+        """Query `/topology`, see :func:`pybgproutesapi.topology`."""
+        return topology(*args, client=self, **kwargs)
+
+    def topology_graph(self, *args, **kwargs):
+        """Build a :class:`TopologyGraph` from concurrent `/topology` VP batches, see :func:`pybgproutesapi.topology_graph`."""
+        return topology_graph(*args, client=self, **kwargs)
+
+    def messages(self, *args, **kwargs):
+        """Query `/messages`, see :func:`pybgproutesapi.messages`."""
+        return messages(*args, client=self, **kwargs)
+
+    def monitoring(self, *args, **kwargs):
+        """Query `/monitoring`, see :func:`pybgproutesapi.monitoring`."""
+        return monitoring(*args, client=self, **kwargs)
+
+    def bmp_rib_with_status(self, *args, **kwargs):
+        """Query `/bmp_rib_with_status`, see :func:`pybgproutesapi.bmp_rib_with_status`."""
+        return bmp_rib_with_status(*args, client=self, **kwargs)
+
+    def iter_bmp_rib_with_status(self, *args, **kwargs):
+        """Iterate over `/bmp_rib_with_status` pages, see :func:`pybgproutesapi.iter_bmp_rib_with_status`."""
+        return iter_bmp_rib_with_status(*args, client=self, **kwargs)
+
+    def bmp_updates_for_analysis(self, *args, **kwargs):
+        """Query `/bmp_updates_for_analysis`, see :func:`pybgproutesapi.bmp_updates_for_analysis`."""
+        return bmp_updates_for_analysis(*args, client=self, **kwargs)
+
+    def route_propagation_path(self, *args, **kwargs):
+        """Query `/route_propagation_path`, see :func:`pybgproutesapi.route_propagation_path`."""
+        return route_propagation_path(*args, client=self, **kwargs)
+
+
+class AsyncBGPRoutesClient:
+    """
+    asyncio counterpart of :class:`BGPRoutesClient` (requires `aiohttp`).
+
+    All endpoints are coroutines taking the same arguments as the module-level
+    functions. Requests share one connection pool, and at most
+    `max_concurrency` of them are in flight at any time. Cancelling the task
+    awaiting a call closes the underlying connection, which aborts the request.
+
+    :param base_url: API origin, defaults to `https://api.bgproutes.io`.
+    :param api_key: API key. If omitted, `BGP_API_KEY` is read from the environment at request time.
+    :param pool_size: Maximum number of open connections.
+    :param max_concurrency: Maximum number of requests in flight, defaults to `pool_size`.
+    :param timeout: Default request timeout in seconds.
+    :param timeouts: Per-endpoint timeout overrides, e.g. `{"/updates": 600}`.
+    :param json_decoder: JSON backend, see :class:`BGPRoutesClient`.
+    :param max_url_bytes: See :class:`BGPRoutesClient`.
+    :param split_target_bytes: See :class:`BGPRoutesClient`. Sub-requests are
+        gathered concurrently, within the `max_concurrency` limit.
+
+    Not supported, unlike :class:`BGPRoutesClient`: `retry`
+    (:class:`RetryPolicy`), `concurrency` (:class:`AdaptiveConcurrency`),
+    `cache` (:class:`DiskCache`, so `cache_mode` is ignored),
+    `compress_min_bytes`, binary `response_format`s, `split_workers`, the
+    fan-out helpers (`rib_many`, ...) and `stream=True`, which raises
+    `NotImplementedError`.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        pool_size: int = 10,
+        max_concurrency: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        timeouts: Optional[Dict[str, float]] = None,
+        json_decoder: Optional[str] = None,
+        max_url_bytes: int = MAX_URL_BYTES,
+        split_target_bytes: Optional[int] = SPLIT_TARGET_BYTES,
+    ):
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("AsyncBGPRoutesClient requires aiohttp: pip install aiohttp")
+
+        self._aiohttp = aiohttp
+        self.base_url = BASE_URL if base_url is None else base_url
+        self.api_key = api_key
+        self.pool_size = pool_size
+        self.max_concurrency = pool_size if max_concurrency is None else max_concurrency
+        self.timeout = timeout
+        self.timeouts = {BGPRoutesClient._endpoint(k): v for k, v in (timeouts or {}).items()}
+        self.max_url_bytes = max_url_bytes
+        self.split_target_bytes = split_target_bytes
+        self.paths = aspath_pool()
+        self.communities = community_pool()
+        self._loads = get_decoder(json_decoder)
+
+        # Created on first use so that they bind to the running event loop.
+        self._session = None
+        self._semaphore = None
+
+    # ---------- Context manager ----------
+    async def __aenter__(self) -> "AsyncBGPRoutesClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+
+    # ---------- Transport ----------
+    def timeout_for(self, path: str) -> float:
+        """Return the timeout used for the given endpoint path."""
+        return self.timeouts.get(BGPRoutesClient._endpoint(path), self.timeout)
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = self._aiohttp.TCPConnector(limit=self.pool_size)
+            self._session = self._aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, Any],
+        details: bool = True,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        parse: Optional[Callable[[Any], Any]] = None,
+        stream=None,
+        cache_mode: str = "use",
+    ) -> Any:
+        """Send one API request and return the decoded result (`cache_mode` is ignored, there is no disk cache)."""
+        if stream is not None:
+            raise NotImplementedError("stream=True is only supported by BGPRoutesClient")
+
+        headers = {"x-api-key": _api_key(api_key if api_key is not None else self.api_key)}
+        url = _url(path, base_url if base_url is not None else self.base_url)
+        session = self._get_session()
+        timeout = self._aiohttp.ClientTimeout(total=self.timeout_for(path))
+
+        if method == "GET":
+            # aiohttp rejects bool query values; encode them the way requests does.
+            kwargs = {"params": {k: str(v) if isinstance(v, bool) else v
+                                 for k, v in params.items() if v is not None}}
+        else:
+            kwargs = {"json": params}
+
+        async with self._semaphore:
+            response = await session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            try:
+                body = await response.read()
+            except asyncio.CancelledError:
+                # Drop the connection instead of returning a half-read one to the pool.
+                response.close()
+                raise
+            finally:
+                response.release()
+
+        try:
+            content = self._loads(body)
+        except Exception:
+            raise InvalidJSONResponse(f"Invalid JSON response: {body.decode(errors='replace')}")
+
+        result = _unwrap(response.status, content, details)
+        return parse(result) if parse is not None else result
+
+    def get(self, path: str, params: Dict[str, Any], details: bool = True, base_url: str = None,
+            api_key: str = None, parse: Optional[Callable[[Any], Any]] = None, stream=None,
+            cache_mode: str = "use"):
+        return self.request("GET", path, params, details, base_url=base_url, api_key=api_key, parse=parse,
+                            stream=stream, cache_mode=cache_mode)
+
+    def post(self, path: str, json_payload: Dict[str, Any], details: bool = True, base_url: str = None,
+             api_key: str = None, parse: Optional[Callable[[Any], Any]] = None, stream=None,
+            cache_mode: str = "use"):
+        return self.request("POST", path, json_payload, details, base_url=base_url, api_key=api_key, parse=parse,
+                            stream=stream, cache_mode=cache_mode)
+
+    # ---------- Endpoints ----------
+    async def vantage_points(self, *args, **kwargs):
+        """Query `/vantage_points`, see :func:`pybgproutesapi.vantage_points`."""
+        return await vantage_points(*args, client=self, **kwargs)
+
+    async def updates(self, *args, **kwargs):
+        """Query `/updates`, see :func:`pybgproutesapi.updates`."""
+        return await updates(*args, client=self, **kwargs)
+
+    async def rib(self, *args, **kwargs):
+        """Query `/rib`, see :func:`pybgproutesapi.rib`."""
+        return await rib(*args, client=self, **kwargs)
+
+    async def topology(self, *args, **kwargs):
+        """Query `/topology`, see :func:`pybgproutesapi.topology`."""
+        return await topology(*args, client=self, **kwargs)
+
+    async def messages(self, *args, **kwargs):
+        """Query `/messages`, see :func:`pybgproutesapi.messages`."""
+        return await messages(*args, client=self, **kwargs)
+
+    async def monitoring(self, *args, **kwargs):
+        """Query `/monitoring`, see :func:`pybgproutesapi.monitoring`."""
+        return await monitoring(*args, client=self, **kwargs)
+
+    async def bmp_rib_with_status(self, *args, **kwargs):
+        """Query `/bmp_rib_with_status`, see :func:`pybgproutesapi.bmp_rib_with_status`."""
+        return await bmp_rib_with_status(*args, client=self, **kwargs)
+
+    async def bmp_updates_for_analysis(self, *args, **kwargs):
+        """Query `/bmp_updates_for_analysis`, see :func:`pybgproutesapi.bmp_updates_for_analysis`."""
+        return await bmp_updates_for_analysis(*args, client=self, **kwargs)
+
+    async def route_propagation_path(self, *args, **kwargs):
+        """Query `/route_propagation_path`, see :func:`pybgproutesapi.route_propagation_path`."""
+        return await route_propagation_path(*args, client=self, **kwargs)
+
+
+_default_client: Optional[BGPRoutesClient] = None
+_default_client_lock = threading.Lock()
+
+
+def default_client() -> BGPRoutesClient:
+    """Return the client used by the module-level endpoint functions, creating it on first use."""
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = BGPRoutesClient()
+    return _default_client
+
+
+def set_default_client(client: Optional[BGPRoutesClient]) -> None:
+    """Replace the client used by the module-level endpoint functions (`None` resets it)."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = client
@@ -1,3 +1,6 @@
-BASE_URL = "https://api.bgproutes.io"
+import os
+
+# BGP_API_URL points the client at another server, e.g. a LocalServer stand-in.
+BASE_URL = os.getenv("BGP_API_URL", "https://api.bgproutes.io")
 API_VERSION = 'v1'
-#BASE_URL = "http://localhost:12345"
\ No newline at end of file
+#BASE_URL = "http://localhost:12345"
@@ -1,8 +1,14 @@
-from typing import Any, List, Optional, Tuple, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 
-from ..utils.query import _csv, get, post
+from ..utils.query import _csv, _resolve_client, get, send
+from ..utils.shard import BMP_RIB_SPLITS, merge_rows
 from ..utils.vp import VPBMP
 
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
 
 def _prefix_filter_csv(prefix_filter: Optional[Union[List[Tuple[str, str]], str]]) -> Optional[str]:
     if isinstance(prefix_filter, list):
@@ -37,6 +43,8 @@ def bmp_rib_with_status(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """Query `/bmp_rib_with_status` for one BMP VP."""
     params = {
@@ -59,15 +67,84 @@ def bmp_rib_with_status(
         "stop_index": stop_index,
     }
 
-    if (
-        isinstance(prefix_exact_match, list)
-        and len(prefix_exact_match) > 10
-    ) or (
-        isinstance(aspath_exact_match, list)
-        and len(aspath_exact_match) > 10
-    ):
-        return post("/bmp_rib_with_status", params, details, base_url=base_url, api_key=api_key)
-    return get("/bmp_rib_with_status", params, details, base_url=base_url, api_key=api_key)
+    # An index window selects rows of the whole result: it cannot be split over prefixes.
+    paged = start_index is not None or stop_index is not None
+    return send("/bmp_rib_with_status", params, details, splits=BMP_RIB_SPLITS,
+                merge=None if paged else merge_rows, base_url=base_url, api_key=api_key, client=client,
+                cache_mode=cache_mode)
+
+
+def iter_bmp_rib_with_status(
+    vp: Union[VPBMP, int],
+    date: str,
+    page_size: int = 10000,
+    prefetch: int = 2,
+    client: Optional["BGPRoutesClient"] = None,
+    **kwargs,
+) -> Iterator[list]:
+    """
+    Iterate over the full `/bmp_rib_with_status` result of one BMP VP.
+
+    Rows are fetched in pages requested as `[start_index, start_index +
+    page_size)`, and up to `prefetch` following pages are downloaded in the
+    background while the current one is consumed, so at most `prefetch + 1`
+    pages are held in memory. The server may return more rows than the
+    window asks for, so the next page starts after the rows actually
+    returned: prefetched pages that do not start there are fetched again,
+    and the prefetch stride follows the length of the last page.
+
+    Iteration stops at an empty page, at a page shorter than `page_size`, or
+    at a page identical to the previous one (a server ignoring
+    `start_index`). Other keyword arguments are passed to
+    :func:`bmp_rib_with_status`.
+    """
+    if kwargs.get("details"):
+        raise ValueError("details=True is not supported when iterating over pages")
+
+    client = _resolve_client(client)
+
+    def _page(start: int) -> list:
+        return bmp_rib_with_status(
+            vp,
+            date,
+            start_index=start,
+            stop_index=start + page_size,
+            client=client,
+            **kwargs,
+        )
+
+    executor = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    pending = deque()
+    start = 0
+    stride = page_size
+    previous = None
+    try:
+        while True:
+            if pending and pending[0][0] != start:
+                # Prefetched for another page length: fetch again from the actual offset.
+                for _, future in pending:
+                    future.cancel()
+                pending.clear()
+            offset = pending[-1][0] + stride if pending else start
+            while len(pending) <= prefetch:
+                pending.append((offset, executor.submit(_page, offset)))
+                offset += stride
+
+            rows = pending.popleft()[1].result()
+            signature = (len(rows), rows[0], rows[-1]) if rows else None
+            if signature is None or signature == previous:
+                return
+            yield from rows
+
+            if len(rows) < page_size:
+                return
+            start += len(rows)
+            stride = len(rows)
+            previous = signature
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 def bmp_updates_for_analysis(
@@ -92,6 +169,8 @@ def bmp_updates_for_analysis(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """Query `/bmp_updates_for_analysis` for one BMP VP."""
     params = {
@@ -115,9 +194,8 @@ def bmp_updates_for_analysis(
         "aspa_status_filter": _csv(aspa_status_filter),
     }
 
-    if isinstance(prefix_exact_match, list) and len(prefix_exact_match) > 10:
-        return post("/bmp_updates_for_analysis", params, details, base_url=base_url, api_key=api_key)
-    return get("/bmp_updates_for_analysis", params, details, base_url=base_url, api_key=api_key)
+    return send("/bmp_updates_for_analysis", params, details, base_url=base_url, api_key=api_key, client=client,
+                cache_mode=cache_mode)
 
 
 def route_propagation_path(
@@ -133,6 +211,8 @@ def route_propagation_path(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """Trace a route propagation path from one received BMP route."""
     params = {
@@ -146,4 +226,5 @@ def route_propagation_path(
         "med": med,
         "max_depth": max_depth,
     }
-    return get("/route_propagation_path", params, details, base_url=base_url, api_key=api_key)
+    return get("/route_propagation_path", params, details, base_url=base_url, api_key=api_key, client=client,
+               cache_mode=cache_mode)
@@ -1,8 +1,11 @@
-from typing import Any, List, Optional, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union, TYPE_CHECKING
 
 from ..utils.query import _csv, get
 from ..utils.vp import VPBGP, VPBMP
 
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
 
 def _prefix_filter_csv(prefix_filter: Optional[Union[List[Tuple[str, str]], str]]) -> Optional[str]:
     if isinstance(prefix_filter, list):
@@ -26,6 +29,8 @@ def messages(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """Count BGP/BMP messages in fixed-size time buckets."""
     if isinstance(vps, (VPBGP, VPBMP)):
@@ -54,4 +59,5 @@ def messages(
         "aspa_status_filter": _csv(aspa_status_filter),
         "bmp_visibility": bmp_visibility,
     }
-    return get("/messages", params, details, base_url=base_url, api_key=api_key)
+    return get("/messages", params, details, base_url=base_url, api_key=api_key, client=client,
+               cache_mode=cache_mode)
@@ -1,7 +1,10 @@
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Union, TYPE_CHECKING
 
 from ..utils.query import _csv, get
 
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
 
 def monitoring(
     start_date: str,
@@ -12,6 +15,8 @@ def monitoring(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """Aggregate BMP update counters per BMP parent session."""
     params = {
@@ -21,4 +26,5 @@ def monitoring(
         "bmp_parent_asns": _csv(bmp_parent_asns),
         "frequency": frequency,
     }
-    return get("/monitoring", params, details, base_url=base_url, api_key=api_key)
+    return get("/monitoring", params, details, base_url=base_url, api_key=api_key, client=client,
+               cache_mode=cache_mode)
@@ -0,0 +1,221 @@
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from ..utils.vp import VPBGP, VPBMP
+from ..utils.query import _resolve_client
+from ..utils.filters import RouteFilter, _REQUIRES, _split
+from ..utils.table import RibTable
+from ..utils.frame import UpdatesFrame
+from ..utils.helpers import fan_out
+from .rib import rib
+from .updates import updates
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
+# Arguments merged across queries: their union is fetched once, then each
+# query's own values are applied locally to its share of the result.
+_EXACT_LISTS = ("prefix_exact_match", "aspath_exact_match")
+
+# Arguments handled by the planner rather than sent as part of a merged call.
+_LOCAL = ("details", "as_table", "as_frame")
+
+
+class _Spec:
+    __slots__ = ("endpoint", "vps", "kwargs", "exact")
+
+    def __init__(self, endpoint: str, vps: List[Union[VPBGP, VPBMP]], kwargs: Dict[str, Any]):
+        self.endpoint = endpoint
+        self.vps = vps
+        self.kwargs = kwargs
+        # None means "no restriction" for each exact-match list.
+        self.exact = {name: (frozenset(_split(kwargs[name])) if kwargs.get(name) is not None else None)
+                      for name in _EXACT_LISTS}
+
+    def shared(self) -> str:
+        """Key of the arguments that must be equal for two queries to share a call."""
+        shared = {k: v for k, v in self.kwargs.items() if k not in _EXACT_LISTS and k not in _LOCAL}
+        return json.dumps([self.endpoint, shared], sort_keys=True, default=str)
+
+    def returns(self, name: str) -> bool:
+        """True if the response has the field needed to narrow `name` locally (e.g. AS paths)."""
+        needed = _REQUIRES.get(name)
+        return needed is None or self.kwargs.get(needed, True) not in (False, "false", "False")
+
+    def truncated(self) -> bool:
+        """True if the server result per VP cannot be narrowed locally (counts, truncated updates)."""
+        return bool(self.kwargs.get("return_count")) or self.kwargs.get("max_updates_to_return") is not None
+
+
+class _Call:
+    """One server call answering several queries."""
+
+    __slots__ = ("endpoint", "kwargs", "vps", "exact", "members")
+
+    def __init__(self, spec: _Spec):
+        self.endpoint = spec.endpoint
+        self.kwargs = {k: v for k, v in spec.kwargs.items() if k not in _EXACT_LISTS and k not in _LOCAL}
+        self.vps: Dict[Tuple[str, int], Union[VPBGP, VPBMP]] = {}
+        self.exact: Dict[str, Optional[set]] = {name: set() for name in _EXACT_LISTS}
+        self.members: List[int] = []
+
+    def accepts(self, spec: _Spec, max_vps: int, max_exact: int) -> bool:
+        new_vps = {(vp.peering_protocol, vp.unique_id) for vp in spec.vps} - self.vps.keys()
+        if len(self.vps) + len(new_vps) > max_vps:
+            return False
+        if not self.members:
+            return True
+        for name in _EXACT_LISTS:
+            current, wanted = self.exact[name], spec.exact[name]
+            if (current is None) != (wanted is None):
+                # Lifting a restriction would fetch whole tables for the restricted queries.
+                return False
+            if (spec.truncated() or not spec.returns(name)) and current != wanted:
+                # Counts, truncated lists and routes without the filtered field (e.g. return_aspath=False)
+                # can only be split per VP: exact lists must be equal.
+                return False
+            if current is not None and len(current | wanted) > max_exact:
+                return False
+        return True
+
+    def add(self, index: int, spec: _Spec) -> None:
+        for vp in spec.vps:
+            self.vps.setdefault((vp.peering_protocol, vp.unique_id), vp)
+        for name in _EXACT_LISTS:
+            wanted = spec.exact[name]
+            if wanted is None:
+                self.exact[name] = None
+            else:
+                self.exact[name] = (self.exact[name] or set()) | wanted if self.members else set(wanted)
+        self.members.append(index)
+
+    def arguments(self) -> Dict[str, Any]:
+        kwargs = dict(self.kwargs)
+        for name in _EXACT_LISTS:
+            if self.exact[name] is not None:
+                kwargs[name] = sorted(self.exact[name])
+        return kwargs
+
+
+class QueryPlanner:
+    """
+    Collect many `rib()` / `updates()` queries, merge the compatible ones
+    into as few API calls as possible, and split the results back per query.
+
+    Queries are compatible when all their arguments are equal except the VPs,
+    `prefix_exact_match` and `aspath_exact_match`. A merged call asks for the
+    union of the VPs and of the exact-match lists. Each query then gets the
+    routes of its own VPs, narrowed to its own exact-match lists. A query
+    without an exact-match list is only merged with queries without one, so
+    that no call fetches whole tables for queries that asked for a few
+    prefixes. Queries with `return_count=True` or `max_updates_to_return`
+    cannot be narrowed locally, so they are only merged with queries having
+    the same exact-match lists. Likewise for `aspath_exact_match` with
+    `return_aspath=False`, whose routes have no AS path to narrow on.
+
+    :param client: Client used for the calls (default client if None).
+    :param max_vps: Maximum number of VPs per merged call.
+    :param max_exact: Maximum length of each merged exact-match list.
+    :param max_workers: Number of merged calls sent concurrently.
+    """
+
+    def __init__(self, client: Optional["BGPRoutesClient"] = None, max_vps: int = 100,
+                 max_exact: int = 1000, max_workers: int = 4):
+        self.client = client
+        self.max_vps = max_vps
+        self.max_exact = max_exact
+        self.max_workers = max_workers
+        self._specs: List[_Spec] = []
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    # ---------- Queries ----------
+    def _add(self, endpoint: str, vps: Any, kwargs: Dict[str, Any]) -> int:
+        if kwargs.get("stream"):
+            raise ValueError("stream=True cannot be combined with a QueryPlanner")
+        if kwargs.get("client") is not None:
+            raise ValueError("the client of planned queries is the planner's client")
+        self._specs.append(_Spec(endpoint, vps if isinstance(vps, list) else [vps], kwargs))
+        return len(self._specs) - 1
+
+    def rib(self, vps: Union[VPBGP, VPBMP, List[Union[VPBGP, VPBMP]]], date: str, **kwargs) -> int:
+        """Plan a :func:`rib` query; return its position in the results of :meth:`run`."""
+        return self._add("rib", vps, {"date": date, **kwargs})
+
+    def updates(self, vps: Union[VPBGP, VPBMP, List[Union[VPBGP, VPBMP]]], start_date: str, end_date: str,
+                **kwargs) -> int:
+        """Plan an :func:`updates` query; return its position in the results of :meth:`run`."""
+        return self._add("updates", vps, {"start_date": start_date, "end_date": end_date, **kwargs})
+
+    # ---------- Planning ----------
+    def plan(self) -> List[_Call]:
+        """Group the planned queries into merged calls (in order of first appearance)."""
+        calls: List[_Call] = []
+        open_calls: Dict[str, List[_Call]] = {}
+        for index, spec in enumerate(self._specs):
+            candidates = open_calls.setdefault(spec.shared(), [])
+            for call in candidates:
+                if call.accepts(spec, self.max_vps, self.max_exact):
+                    break
+            else:
+                call = _Call(spec)
+                candidates.append(call)
+                calls.append(call)
+            call.add(index, spec)
+        return calls
+
+    def run(self) -> List[Any]:
+        """Send the merged calls and return the result of every planned query, in order."""
+        client = _resolve_client(self.client)
+        results: List[Any] = [None] * len(self._specs)
+
+        def _query(call: _Call):
+            fn = rib if call.endpoint == "rib" else updates
+            return fn(list(call.vps.values()), details=True, client=client, **call.arguments())
+
+        for call, response in fan_out(_query, self.plan(), max_workers=self.max_workers):
+            for index in call.members:
+                results[index] = self._split(self._specs[index], call, response, client)
+        return results
+
+    def _split(self, spec: _Spec, call: _Call, response: Dict[str, Any], client: "BGPRoutesClient") -> Any:
+        wanted = {(vp.peering_protocol, str(vp.unique_id)) for vp in spec.vps}
+        data = {
+            proto: {vp_id: value for vp_id, value in (entries or {}).items() if (proto, str(vp_id)) in wanted}
+            for proto, entries in response["data"].items()
+        }
+
+        narrower = {name: sorted(spec.exact[name]) for name in _EXACT_LISTS
+                    if spec.exact[name] is not None and spec.exact[name] != call.exact[name]}
+        if narrower:
+            route_filter = RouteFilter(**narrower)
+            data = route_filter.filter_rib(data) if spec.endpoint == "rib" else route_filter.filter_updates(data)
+
+        if spec.kwargs.get("as_table"):
+            data = RibTable.from_response(data, paths=client.paths, communities=client.communities)
+        elif spec.kwargs.get("as_frame"):
+            data = UpdatesFrame.from_response(data, paths=client.paths, communities=client.communities)
+        if spec.kwargs.get("details"):
+            return {**response, "data": data}
+        return data
+
+
+def plan_queries(
+    specs: List[Tuple[str, tuple, Dict[str, Any]]],
+    client: Optional["BGPRoutesClient"] = None,
+    max_vps: int = 100,
+    max_exact: int = 1000,
+    max_workers: int = 4,
+) -> List[Any]:
+    """
+    Run `(endpoint, args, kwargs)` query specs (endpoint `"rib"` or
+    `"updates"`, with the positional and keyword arguments of that function)
+    through a :class:`QueryPlanner`, and return their results in order.
+    """
+    planner = QueryPlanner(client=client, max_vps=max_vps, max_exact=max_exact, max_workers=max_workers)
+    for endpoint, args, kwargs in specs:
+        if endpoint not in ("rib", "updates"):
+            raise ValueError(f"endpoint must be 'rib' or 'updates', got {endpoint!r}")
+        getattr(planner, endpoint)(*args, **kwargs)
+    return planner.run()
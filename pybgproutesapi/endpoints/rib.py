@@ -1,6 +1,14 @@
-from typing import List, Optional, Any, Dict, Union, Tuple
+from functools import partial
+from typing import List, Optional, Any, Dict, Union, Tuple, Iterator, TYPE_CHECKING
 from ..utils.vp import VPBGP, VPBMP
-from ..utils.query import get, post, _csv
+from ..utils.query import send, _csv, _resolve_client
+from ..utils.shard import RIB_SPLITS, merge_rib
+from ..utils.stream import iter_rib_rows
+from ..utils.table import RibTable
+from ..utils.helpers import chunked, fan_out, merge_responses
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
 
 def rib(
     vps: Union[VPBGP | VPBMP, List[VPBGP | VPBMP]],
@@ -23,7 +31,16 @@ def rib(
     rov_status_filter: list[int] = None,
     aspa_status_filter: list[int] = None,
     api_key: str = None,
+    stream: bool = False,
+    as_table: bool = False,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
+    if stream and return_count:
+        raise ValueError("stream=True cannot be combined with return_count=True")
+    if as_table and return_count:
+        raise ValueError("as_table=True cannot be combined with return_count=True")
+
     # Normalize prefix_filter
     if isinstance(prefix_filter, list):
         pf_str = ",".join(f"{op}:{prefix}" for op, prefix in prefix_filter)
@@ -69,11 +86,80 @@ def rib(
         "aspa_status_filter": aspa_status_filter
     }
 
-    # Use POST if large lists are provided
-    if (len(vp_bgp_ids) + len(vp_bmp_ids) > 100
-        or (isinstance(aspath_exact_match, list) and len(aspath_exact_match) > 10)
-        or (isinstance(prefix_exact_match, list) and len(prefix_exact_match) > 10)
-    ):
-        return post("/rib", params, details, base_url=base_url, api_key=api_key)
-    else:
-        return get("/rib", params, details, base_url=base_url, api_key=api_key)
+    parse = None
+    if as_table and not stream:
+        # Share the AS paths and communities of every call made through the client.
+        pools = _resolve_client(client)
+        build = partial(RibTable.from_response, paths=pools.paths, communities=pools.communities)
+        parse = partial(_to_table_envelope, build=build) if details else build
+
+    # GET or POST by encoded size; oversized VP or exact-match lists are split into sub-requests.
+    result = send("/rib", params, details, splits=RIB_SPLITS, merge=merge_rib, base_url=base_url,
+                  api_key=api_key, client=client, stream=iter_rib_rows if stream else None, parse=parse,
+                  cache_mode=cache_mode)
+
+    if as_table and stream:
+        # Build the table while the body is being read, without holding the full response.
+        pools = _resolve_client(client)
+        return RibTable.from_rows(result, paths=pools.paths, communities=pools.communities)
+    return result
+
+
+def _to_table_envelope(response: Dict[str, Any], build) -> Dict[str, Any]:
+    return {**response, "data": build(response["data"])}
+
+
+def rib_as_completed(
+    vps: List[VPBGP | VPBMP],
+    date: str,
+    batch_size: int = 10,
+    max_workers: int = 4,
+    client: Optional["BGPRoutesClient"] = None,
+    **kwargs,
+) -> Iterator[Tuple[List[VPBGP | VPBMP], Any]]:
+    """
+    Query `/rib` for `vps` in batches of `batch_size` VPs, sending up to
+    `max_workers` batches concurrently, and yield `(batch, response)` as soon
+    as each batch returns. Other keyword arguments are passed to :func:`rib`.
+    """
+    client = _resolve_client(client)
+    if not isinstance(vps, list):
+        vps = [vps]
+
+    def _query(batch):
+        return rib(list(batch), date, client=client, **kwargs)
+
+    batches = [tuple(batch) for batch in chunked(vps, batch_size)]
+    for batch, response in fan_out(_query, batches, max_workers=max_workers):
+        yield list(batch), response
+
+
+def rib_many(
+    vps: List[VPBGP | VPBMP],
+    date: str,
+    batch_size: int = 10,
+    max_workers: int = 4,
+    client: Optional["BGPRoutesClient"] = None,
+    **kwargs,
+) -> Any:
+    """
+    Same as :func:`rib_as_completed`, but return all batches merged into one
+    `{proto: {vp_id: ...}}` response. With `details=True`, `seconds` and
+    `bytes` are summed over all batches.
+    """
+    details = kwargs.get("details", False)
+    merged = {"bgp": {}, "bmp": {}}
+    seconds = 0
+    nbytes = 0
+
+    for _, response in rib_as_completed(vps, date, batch_size=batch_size, max_workers=max_workers,
+                                        client=client, **kwargs):
+        if details:
+            seconds += response.get("seconds") or 0
+            nbytes += response.get("bytes") or 0
+            response = response["data"]
+        merge_responses(merged, response)
+
+    if details:
+        return {"seconds": seconds, "bytes": nbytes, "data": merged}
+    return merged
@@ -1,6 +1,12 @@
-from typing import List, Optional, Any, Dict, Union, Tuple
+from typing import List, Optional, Any, Dict, Union, Tuple, TYPE_CHECKING
 from ..utils.vp import VPBGP, VPBMP
-from ..utils.query import get, post, _csv
+from ..utils.query import send, _csv, _resolve_client
+from ..utils.shard import TOPOLOGY_SPLITS, merge_topology
+from ..utils.graph import TopologyGraph
+from ..utils.helpers import chunked, fan_out
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
 
 def topology(
     vps: Union[VPBGP, VPBMP, List[Union[VPBGP, VPBMP]]],
@@ -17,6 +23,8 @@ def topology(
     details: bool = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
     """
     Fetch the AS-level topology built from the RIB/updates of multiple vantage points.
@@ -61,7 +69,37 @@ def topology(
         "ignore_private_asns": ignore_private_asns,
     }
 
-    if len(vp_bgp_ids) + len(vp_bmp_ids) > 10 or (as_to_ignore is not None and len(as_to_ignore) > 10):
-        return post("/topology", params, details, base_url=base_url, api_key=api_key)
-    else:
-        return get("/topology", params, details, base_url=base_url, api_key=api_key)
+    # GET or POST by encoded size; an oversized VP list is split into sub-requests.
+    return send("/topology", params, details, splits=TOPOLOGY_SPLITS, merge=merge_topology, base_url=base_url,
+                api_key=api_key, client=client, cache_mode=cache_mode)
+
+
+def topology_graph(
+    vps: List[Union[VPBGP, VPBMP]],
+    date: str,
+    batch_size: int = 10,
+    max_workers: int = 4,
+    directed: bool = False,
+    graph: Optional[TopologyGraph] = None,
+    client: Optional["BGPRoutesClient"] = None,
+    **kwargs,
+) -> TopologyGraph:
+    """
+    Query `/topology` for `vps` in batches of `batch_size` VPs, sending up to
+    `max_workers` batches concurrently, and add the links of every batch to
+    a :class:`TopologyGraph` (a new one unless `graph` is given). Other
+    keyword arguments are passed to :func:`topology`.
+    """
+    client = _resolve_client(client)
+    if not isinstance(vps, list):
+        vps = [vps]
+    if graph is None:
+        graph = TopologyGraph(directed=directed)
+
+    def _query(batch):
+        return topology(list(batch), date, directed=graph.directed, client=client, **kwargs)
+
+    for _, response in fan_out(_query, [tuple(batch) for batch in chunked(vps, batch_size)],
+                               max_workers=max_workers):
+        graph.add_topology(response)
+    return graph
@@ -1,6 +1,15 @@
-from typing import List, Optional, Any, Dict, Union, Tuple
+from collections import Counter
+from functools import partial
+from typing import List, Optional, Any, Dict, Union, Tuple, TYPE_CHECKING
 from ..utils.vp import VPBGP, VPBMP
-from ..utils.query import get, post, _csv
+from ..utils.query import send, _csv, _resolve_client
+from ..utils.shard import UPDATES_SPLITS, merge_updates
+from ..utils.stream import iter_updates_rows
+from ..utils.frame import UpdatesFrame
+from ..utils.helpers import fan_out, split_time_window
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
 
 def updates(
     vps: Union[VPBGP | VPBMP, List[VPBGP | VPBMP]],
@@ -26,8 +35,17 @@ def updates(
     return_aspa_status: bool = False,
     rov_status_filter: list[int] = None,
     aspa_status_filter: list[int] = None,
+    stream: bool = False,
+    as_frame: bool = False,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> Any:
 
+    if stream and return_count:
+        raise ValueError("stream=True cannot be combined with return_count=True")
+    if as_frame and return_count:
+        raise ValueError("as_frame=True cannot be combined with return_count=True")
+
     # Normalize prefix_filter
     if isinstance(prefix_filter, list):
         pf_str = ",".join(f"{op}:{prefix}" for op, prefix in prefix_filter)
@@ -76,12 +94,129 @@ def updates(
         "aspa_status_filter": aspa_status_filter
     }
 
-    # Use POST if too many exact matches, otherwise GET
-    if (len(vp_bgp_ids) + len(vp_bmp_ids) > 100
-        or (isinstance(aspath_exact_match, list) and len(aspath_exact_match) > 10)
-        or (isinstance(prefix_exact_match, list) and len(prefix_exact_match) > 10)
-    ):
-        return post("/updates", params, details, base_url=base_url, api_key=api_key)
-    else:
-        return get(f"/updates", params, details, base_url=base_url, api_key=api_key)
+    parse = None
+    if as_frame and not stream:
+        # Share the AS paths and communities of every call made through the client.
+        pools = _resolve_client(client)
+        build = partial(UpdatesFrame.from_response, paths=pools.paths, communities=pools.communities)
+        parse = partial(_to_frame_envelope, build=build) if details else build
+
+    # GET or POST by encoded size; oversized VP or exact-match lists are split into sub-requests.
+    result = send("/updates", params, details, splits=UPDATES_SPLITS, merge=merge_updates, base_url=base_url,
+                  api_key=api_key, client=client, stream=iter_updates_rows if stream else None, parse=parse,
+                  cache_mode=cache_mode)
+
+    if as_frame and stream:
+        # Build the frame while the body is being read, without holding the full response.
+        pools = _resolve_client(client)
+        return UpdatesFrame.from_rows(result, paths=pools.paths, communities=pools.communities)
+    return result
+
+
+def _to_frame_envelope(response: Dict[str, Any], build) -> Dict[str, Any]:
+    return {**response, "data": build(response["data"])}
+
+
+def updates_sharded(
+    vps: Union[VPBGP | VPBMP, List[VPBGP | VPBMP]],
+    start_date: str,
+    end_date: str,
+    shards: int = 4,
+    max_workers: int = 4,
+    client: Optional["BGPRoutesClient"] = None,
+    **kwargs,
+) -> Any:
+    """
+    Query `/updates` over [start_date, end_date) as `shards` contiguous
+    sub-windows fetched concurrently (up to `max_workers` at a time), and
+    merge them back into a single response. Other keyword arguments are
+    passed to :func:`updates`.
+
+    Per VP, updates are returned in the order given by `chronological_order`
+    and truncated to `max_updates_to_return`, as for a single query. With
+    `return_count=True`, counts are summed over the sub-windows. With
+    `as_frame=True`, the merged response is returned as an :class:`UpdatesFrame`.
+    """
+    client = _resolve_client(client)
+    as_frame = kwargs.pop("as_frame", False)
+    details = kwargs.get("details", False)
+    return_count = kwargs.get("return_count", False)
+    chronological_order = kwargs.get("chronological_order", True)
+    max_updates = kwargs.get("max_updates_to_return")
+
+    if kwargs.get("stream"):
+        raise ValueError("stream=True cannot be combined with updates_sharded()")
+
+    windows = split_time_window(start_date, end_date, shards)
+
+    def _query(window):
+        return updates(vps, window[0], window[1], client=client, **kwargs)
+
+    results = {}
+    seconds = 0
+    nbytes = 0
+    for window, response in fan_out(_query, windows, max_workers=max_workers):
+        if details:
+            seconds += response.get("seconds") or 0
+            nbytes += response.get("bytes") or 0
+            response = response["data"]
+        results[window] = response
 
+    ordered = [results[window] for window in windows]
+    if not chronological_order:
+        ordered.reverse()
+
+    merged = {"bgp": {}, "bmp": {}}
+    for response in ordered:
+        for proto, vp_entries in response.items():
+            if not vp_entries:
+                continue
+            merged_proto = merged.setdefault(proto, {})
+            for vp_id, entries in vp_entries.items():
+                if return_count:
+                    counts = merged_proto.setdefault(vp_id, {})
+                    for kind, count in entries.items():
+                        counts[kind] = counts.get(kind, 0) + count
+                elif vp_id not in merged_proto:
+                    merged_proto[vp_id] = list(entries)
+                else:
+                    _extend_across_boundary(merged_proto[vp_id], entries)
+
+    if max_updates is not None and not return_count:
+        for vp_entries in merged.values():
+            for vp_id, entries in vp_entries.items():
+                del entries[max_updates:]
+
+    if as_frame:
+        merged = UpdatesFrame.from_response(merged, paths=client.paths, communities=client.communities)
+    if details:
+        return {"seconds": seconds, "bytes": nbytes, "data": merged}
+    return merged
+
+
+def _extend_across_boundary(rows: list, next_rows: list) -> None:
+    """
+    Append the updates of the next sub-window to `rows`. Sub-windows are
+    disjoint, so appending keeps the order; the only overlap is the shared
+    boundary timestamp, returned by both sub-windows. Rows at that timestamp
+    are counted: each one already in `rows` is dropped once from
+    `next_rows`, so that identical updates really sent twice are kept.
+    """
+    if rows and next_rows:
+        boundary = rows[-1][0]
+        seen = Counter()
+        for row in reversed(rows):
+            if row[0] != boundary:
+                break
+            seen[tuple(map(str, row))] += 1
+        i = 0
+        while i < len(next_rows) and next_rows[i][0] == boundary:
+            key = tuple(map(str, next_rows[i]))
+            if seen[key]:
+                seen[key] -= 1
+            else:
+                rows.append(next_rows[i])
+            i += 1
+        rows.extend(next_rows[i:])
+    else:
+        rows.extend(next_rows)
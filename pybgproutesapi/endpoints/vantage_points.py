@@ -1,6 +1,10 @@
-from typing import List, Optional, Any, Dict, Union, Tuple
+from functools import partial
+from typing import List, Optional, Any, Dict, Union, Tuple, TYPE_CHECKING
 from ..utils.vp import VPBGP, VPBMP
-from ..utils.query import get, post, _csv
+from ..utils.query import get, _csv
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
 
 def vantage_points(
     vp_bgp_ids: Optional[Union[List[str], str]] = None,
@@ -29,6 +33,8 @@ def vantage_points(
     details: Optional[bool] = False,
     base_url: str = None,
     api_key: str = None,
+    cache_mode: str = "use",
+    client: Optional["BGPRoutesClient"] = None,
 ) -> List[Union[VPBGP, VPBMP]]:
     # Normalize params to CSV where the API expects comma-separated strings
     params = {
@@ -57,8 +63,12 @@ def vantage_points(
         "return_metadata": return_metadata
     }
 
-    items = get("/vantage_points", params, details, base_url=base_url, api_key=api_key)
+    return get(
+        "/vantage_points", params, details, base_url=base_url, api_key=api_key, client=client,
+        parse=partial(_parse_response, details=details), cache_mode=cache_mode,
+    )
 
+def _parse_response(items, details: bool):
     if details:
         vp_items = items['data']
     else:
@@ -74,118 +84,13 @@ def vantage_points(
 def parse_vps(vp_items):
     vps: List[Union[VPBGP, VPBMP]] = []
 
-    for it in vp_items.get('bgp', []):
-        # Common fields with fallbacks for possible key names
-        unique_id = it.get("id")
-        ip = it.get("ip")
-        asn = it.get("asn")
-
-        if unique_id is None:
+    # Single pass per item; history and metadata fields are only read on access.
+    for it in vp_items.get('bgp') or []:
+        if it.get("id") is None:
             continue
+        vps.append(VPBGP.from_item(it))
 
-        # Optional common fields
-        source = it.get("source")
-        rib_size_v4 = it.get("rib_size_v4")
-        rib_size_v6 = it.get("rib_size_v6")
-        country = it.get("country")
-        org_name = it.get("org_name")
-        org_country = it.get("org_country")
-        ixp_id = it.get("ixp_id")
-        ixp_rs_ip = it.get("ixp_rs_ip")
-        status = it.get("status")
-        status_since = it.get("status_since")
-        status_history = it.get("status_history")
-        rib_status = it.get('rib_status')
-        rib_history = it.get('rib_history')
-        metadata = it.get('metadata')
-
-        # Build objects
-        vps.append(
-            VPBGP(
-                unique_id=int(unique_id),
-                ip=str(ip),
-                asn=int(asn),
-                source=source,
-                rib_size_v4=rib_size_v4,
-                rib_size_v6=rib_size_v6,
-                country=country,
-                org_name=org_name,
-                org_country=org_country,
-                ixp_id=ixp_id,
-                ixp_rs_ip=ixp_rs_ip,
-                status=status,
-                status_since=status_since,
-                status_history=status_history,
-                rib_status=rib_status,
-                rib_history=rib_history,
-                metadata=metadata
-            )
-        )
-
-    for it in vp_items.get('bmp', []):
-        # Common fields with fallbacks for possible key names
-        unique_id = it.get("id")
-        ip = it.get("ip")
-        asn = it.get("asn")
-
-        # Optional common fields
-        source = it.get("source")
-        rib_size_v4 = it.get("rib_size_v4")
-        rib_size_v6 = it.get("rib_size_v6")
-        country = it.get("country")
-        org_name = it.get("org_name")
-        org_country = it.get("org_country")
-        ixp_id = it.get("ixp_id")
-        ixp_rs_ip = it.get("ixp_rs_ip")
-        status = it.get("status")
-        status_since = it.get("status_since")
-        status_history = it.get("status_history")
-        rib_status = it.get('rib_status')
-        rib_history = it.get('rib_history')
-        metadata = it.get('metadata')
-
-        # BMP-specific info can be nested or flat depending on your API
-        peer_id = it.get("peer_id", {})
-        bmp_info = it.get("bmp_info", {})
-        ixp_rs_ip = it.get("ixp_rs_ip") or bmp_info.get("ixp_rs_ip")
-        bmp_parent_org_name = bmp_info.get("parent_org_name")
-        bmp_parent_asn = bmp_info.get("parent_asn")
-        bmp_parent_asn_country = bmp_info.get("parent_asn_country")
-        bmp_parent_ip = bmp_info.get("parent_ip")
-        bmp_parent_ip_country = bmp_info.get("parent_ip_country")
-        bmp_feed_types = bmp_info.get("feed_types")
-        rib_size_v4_per_feed = bmp_info.get("rib_size_v4_per_feed")
-        rib_size_v6_per_feed = bmp_info.get("rib_size_v6_per_feed")
-
-        vps.append(
-            VPBMP(
-                unique_id=int(unique_id),
-                ip=str(ip),
-                asn=int(asn),
-                source=source,
-                rib_size_v4=rib_size_v4,
-                rib_size_v6=rib_size_v6,
-                country=country,
-                org_name=org_name,
-                org_country=org_country,
-                ixp_id=ixp_id,
-                ixp_rs_ip=ixp_rs_ip,
-                status=status,
-                status_since=status_since,
-                status_history=status_history,
-                rib_status=rib_status,
-                rib_history=rib_history,
-                metadata=metadata,
-                peer_id=peer_id,
-                bmp_parent_org_name=bmp_parent_org_name,
-                bmp_parent_asn=bmp_parent_asn,
-                bmp_parent_asn_country=bmp_parent_asn_country,
-                bmp_parent_ip=bmp_parent_ip,
-                bmp_parent_ip_country=bmp_parent_ip_country,
-                bmp_feed_types=[int(x) for x in bmp_feed_types] if bmp_feed_types else [],
-                rib_size_v4_per_feed=rib_size_v4_per_feed,
-                rib_size_v6_per_feed=rib_size_v6_per_feed
-            )
-        )
+    for it in vp_items.get('bmp') or []:
+        vps.append(VPBMP.from_item(it))
 
     return vps
@@ -0,0 +1,10 @@
+"""
+Test and development helpers: a local stand-in for the API.
+
+This package is not imported by `pybgproutesapi`; import it explicitly
+(`from pybgproutesapi.testing import LocalServer`) or run it with
+`python -m pybgproutesapi.testing`.
+"""
+from .server import Fixtures, LocalServer
+
+__all__ = ["Fixtures", "LocalServer"]
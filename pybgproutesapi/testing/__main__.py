@@ -0,0 +1,48 @@
+import argparse
+import logging
+from typing import List, Optional
+
+from .server import Fixtures, LocalServer
+
+_log = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local stand-in for the bgproutes.io API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--fixtures", help="Fixtures file saved with Fixtures.save() (.json or .json.gz)")
+    parser.add_argument("--bgp-vps", type=int, default=8, help="Synthetic BGP VPs (without --fixtures)")
+    parser.add_argument("--bmp-vps", type=int, default=2, help="Synthetic BMP VPs (without --fixtures)")
+    parser.add_argument("--prefixes", type=int, default=5000, help="Synthetic prefixes (without --fixtures)")
+    parser.add_argument("--updates-per-vp", type=int, default=2000, help="Synthetic updates (without --fixtures)")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--bandwidth", type=float, default=None, help="Bytes per second")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--max-concurrent", type=int, default=None)
+    parser.add_argument("--recordings", help="Directory of recorded responses")
+    parser.add_argument("--upstream", help="API to forward and record unknown queries to")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    else:
+        fixtures = Fixtures.synthetic(bgp_vps=args.bgp_vps, bmp_vps=args.bmp_vps, prefixes=args.prefixes,
+                                      updates_per_vp=args.updates_per_vp, seed=args.seed)
+    server = LocalServer(fixtures, host=args.host, port=args.port, latency=args.latency, jitter=args.jitter,
+                         bandwidth=args.bandwidth, error_rate=args.error_rate,
+                         rate_limit_rate=args.rate_limit_rate, max_concurrent=args.max_concurrent,
+                         recordings=args.recordings, upstream=args.upstream, seed=args.seed)
+    _log.info("Serving on %s", server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,663 @@
+import gzip
+import ipaddress
+import json
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from ..constants import API_VERSION
+from ..utils.cache import DiskCache
+from ..utils.filters import _split
+from ..utils.frame import _timestamp
+
+ENDPOINTS = ("/rib", "/updates", "/topology", "/vantage_points", "/messages", "/monitoring")
+
+# Size of the body chunks written when the bandwidth is limited.
+_CHUNK = 16 * 1024
+
+_PRIVATE_ASNS = ((64512, 65534), (4200000000, 4294967294))
+
+
+def _time(value: Any) -> float:
+    """Epoch of an API date: epoch number or string, ISO 8601 date or datetime (UTC)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return _timestamp(str(value))
+
+
+def _flag(params: Dict[str, Any], name: str, default: bool = False) -> bool:
+    value = params.get(name)
+    if value is None:
+        return default
+    return str(value).lower() in ("true", "1")
+
+
+def _ids(params: Dict[str, Any], name: str) -> Optional[Set[str]]:
+    values = _split(params.get(name))
+    return set(values) if values is not None else None
+
+
+def _bmp_info(key: str):
+    return lambda item: (item.get("bmp_info") or {}).get(key)
+
+
+# vantage_points() filters on one field: argument -> field of an item.
+_VP_FIELDS = {
+    "vp_ips": lambda item: item.get("ip"),
+    "vp_asns": lambda item: item.get("asn"),
+    "sources": lambda item: item.get("source"),
+    "countries": lambda item: item.get("country"),
+    "org_countries": lambda item: item.get("org_country"),
+    "bmp_parent_ips": _bmp_info("parent_ip"),
+    "bmp_parent_asns": _bmp_info("parent_asn"),
+    "ixp_ids": lambda item: item.get("ixp_id"),
+    "ixp_rs_ips": lambda item: item.get("ixp_rs_ip"),
+    "status": lambda item: item.get("status"),
+}
+
+_RIB_SIZE_OPS = {
+    ">": float.__gt__, ">=": float.__ge__, "<": float.__lt__, "<=": float.__le__, "=": float.__eq__,
+    "==": float.__eq__,
+}
+
+
+def _rib_size(params: Dict[str, Any], name: str):
+    """Predicate of a `rib_size_v4`/`rib_size_v6` filter (`"op,bound"`), or None if absent."""
+    value = params.get(name)
+    if value is None:
+        return None
+    op, _, bound = str(value).partition(",")
+    if op not in _RIB_SIZE_OPS:
+        raise ValueError(f"unsupported {name} operator {op!r}")
+    compare, bound = _RIB_SIZE_OPS[op], float(bound)
+    return lambda item: item.get(name) is not None and compare(float(item[name]), bound)
+
+
+def _asns(aspath: Optional[str]) -> List[int]:
+    """ASNs of an AS path string, without prepending repetitions; AS sets are skipped."""
+    asns: List[int] = []
+    for token in (aspath or "").split():
+        if token.isdigit() and (not asns or asns[-1] != int(token)):
+            asns.append(int(token))
+    return asns
+
+
+# ---------- Route filters ----------
+# Evaluated with a naive implementation of the API's semantics, independent
+# of the client's RouteFilter, so that tests comparing the client's local
+# filtering with the server's answers are not circular.
+
+_PG_ESCAPES = ((r"\y", r"\b"), (r"\m", r"\b(?=\w)"), (r"\M", r"\b(?<=\w)"))
+
+
+def _regex(pattern: Optional[str]) -> Optional["re.Pattern"]:
+    if not pattern:
+        return None
+    for pg, py in _PG_ESCAPES:
+        pattern = pattern.replace(pg, py)
+    return re.compile(pattern)
+
+
+def _prefix_matches(op: str, network: Any, term: Any) -> bool:
+    if network.version != term.version:
+        return False
+    if op == "=":
+        return network == term
+    if op in ("<<", "<<="):
+        return network.subnet_of(term) and (op == "<<=" or network != term)
+    if op in (">>", ">>="):
+        return network.supernet_of(term) and (op == ">>=" or network != term)
+    raise ValueError(f"unsupported prefix operator {op!r}")
+
+
+def _route_filter(params: Dict[str, Any]) -> Callable[..., bool]:
+    """Predicate `(prefix, aspath, community, aspa, rov, kind)` of the route filters of a query."""
+    afi = int(params["data_afi"]) if params.get("data_afi") is not None else None
+    types = {kind[0].upper() for kind in _ids(params, "type_filter") or ()} or None
+    terms = [(term.split(":", 1)[0], ipaddress.ip_network(term.split(":", 1)[1], strict=False))
+             for term in _split(params.get("prefix_filter")) or ()]
+    exact = {ipaddress.ip_network(p, strict=False) for p in _split(params.get("prefix_exact_match")) or ()} or None
+    paths = _ids(params, "aspath_exact_match") or None
+    aspath_regexp, community_regexp = _regex(params.get("aspath_regexp")), _regex(params.get("community_regexp"))
+    rov = {int(v) for v in _split(params.get("rov_status_filter")) or ()} or None
+    aspa = {int(v) for v in _split(params.get("aspa_status_filter")) or ()} or None
+
+    def match(prefix: str, aspath: Optional[str], community: Optional[str], aspa_status: Optional[int],
+              rov_status: Optional[int], kind: Optional[str] = None) -> bool:
+        if types is not None and kind is not None and kind[0].upper() not in types:
+            return False
+        if rov is not None and rov_status not in rov:
+            return False
+        if aspa is not None and aspa_status not in aspa:
+            return False
+        if paths is not None and aspath not in paths:
+            return False
+        if aspath_regexp is not None and (aspath is None or not aspath_regexp.search(aspath)):
+            return False
+        if community_regexp is not None and (community is None or not community_regexp.search(community)):
+            return False
+        network = ipaddress.ip_network(prefix, strict=False)
+        if afi is not None and network.version != afi:
+            return False
+        if exact is not None and network not in exact:
+            return False
+        return not terms or any(_prefix_matches(op, network, term) for op, term in terms)
+
+    return match
+
+
+class Fixtures:
+    """
+    Data served by a :class:`LocalServer`, in the `data` form of the API
+    responses:
+
+    - `vantage_points`: `{"bgp": [item], "bmp": [item]}`;
+    - `rib`: `{proto: {vp_id: {prefix: route}}}`, the RIB at any date;
+    - `updates`: `{proto: {vp_id: [update]}}`, rows sorted by timestamp;
+    - `topology`, `messages`, `monitoring`: served as they are. Without them,
+      topologies are built from the AS paths of the RIB and message counts
+      from the updates.
+    """
+
+    def __init__(
+        self,
+        vantage_points: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        rib: Optional[Dict[str, Dict[str, Dict[str, list]]]] = None,
+        updates: Optional[Dict[str, Dict[str, List[list]]]] = None,
+        topology: Optional[Dict[str, Any]] = None,
+        messages: Optional[List[Any]] = None,
+        monitoring: Optional[Dict[str, Any]] = None,
+    ):
+        self.vantage_points = vantage_points or {"bgp": [], "bmp": []}
+        self.rib = rib or {"bgp": {}, "bmp": {}}
+        self.updates = updates or {"bgp": {}, "bmp": {}}
+        self.topology = topology
+        self.messages = messages
+        self.monitoring = monitoring if monitoring is not None else {}
+
+    @classmethod
+    def synthetic(
+        cls,
+        bgp_vps: int = 8,
+        bmp_vps: int = 2,
+        prefixes: int = 5000,
+        updates_per_vp: int = 2000,
+        start: Optional[str] = None,
+        duration: float = 3 * 86400,
+        seed: int = 0,
+    ) -> "Fixtures":
+        """
+        Generate random but reproducible fixtures: every VP sees most of
+        `prefixes` prefixes (90% IPv4, 10% IPv6) through AS paths of 2 to 6
+        ASNs, and `updates_per_vp` updates over `duration` seconds from
+        `start` (default: two days before the current UTC midnight, so that
+        scripts asking for "yesterday" find data).
+        """
+        rng = random.Random(seed)
+        if start is None:
+            midnight = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            begin = (midnight - timedelta(days=2)).timestamp()
+        else:
+            begin = _time(start)
+
+        v4 = prefixes - prefixes // 10
+        all_prefixes = [f"{1 + i // 65536}.{(i // 256) % 256}.{i % 256}.0/24" for i in range(v4)]
+        # Written as the API does (PostgreSQL inet): compressed, e.g. 2001:db8::/48.
+        all_prefixes += [str(ipaddress.ip_network(f"2001:db8:{i:x}::/48")) for i in range(prefixes - v4)]
+        transit = [rng.randint(1, 65000) for _ in range(200)]
+        origins = {prefix: rng.randint(1, 400000) for prefix in all_prefixes}
+
+        vps: Dict[str, List[Dict[str, Any]]] = {"bgp": [], "bmp": []}
+        rib: Dict[str, Dict[str, Dict[str, list]]] = {"bgp": {}, "bmp": {}}
+        updates: Dict[str, Dict[str, List[list]]] = {"bgp": {}, "bmp": {}}
+        for proto, count in (("bgp", bgp_vps), ("bmp", bmp_vps)):
+            for vp_id in range(1, count + 1):
+                asn = rng.choice(transit)
+                item = {
+                    "id": vp_id, "ip": f"192.0.2.{vp_id}" if proto == "bgp" else f"198.51.100.{vp_id}",
+                    "asn": asn, "source": rng.choice(["ris", "rv", "pch"]) if proto == "bgp" else "bmp",
+                    "country": rng.choice(["FR", "US", "DE", "JP", "BR"]), "org_name": f"Org {asn}",
+                    "status": "up",
+                }
+                feeds = [-1]
+                if proto == "bmp":
+                    feeds = [1, 2]
+                    item["bmp_info"] = {"parent_asn": 64496, "parent_ip": "203.0.113.1", "feed_types": feeds}
+
+                routes = {}
+                for prefix in all_prefixes:
+                    if rng.random() < 0.05:
+                        continue
+                    middle = rng.sample(transit, rng.randint(0, 4))
+                    aspath = " ".join(map(str, [asn] + middle + [origins[prefix]]))
+                    community = " ".join(f"{asn}:{rng.randint(1, 999)}" for _ in range(rng.randint(0, 3)))
+                    routes[prefix] = [aspath, community, rng.randint(0, 2), rng.randint(0, 2), rng.choice(feeds)]
+                rib[proto][str(vp_id)] = routes
+
+                known = list(routes)
+                rows = []
+                for ts in sorted(begin + rng.random() * duration for _ in range(updates_per_vp)):
+                    prefix = rng.choice(known)
+                    if rng.random() < 0.1:
+                        rows.append([round(ts, 3), "W", prefix, None, None, None, None, routes[prefix][4]])
+                    else:
+                        aspath, community, aspa, rov, feed = routes[prefix]
+                        rows.append([round(ts, 3), "A", prefix, aspath, community, aspa, rov, feed])
+                updates[proto][str(vp_id)] = rows
+
+                item["rib_size_v4"] = sum(1 for prefix in routes if ":" not in prefix)
+                item["rib_size_v6"] = len(routes) - item["rib_size_v4"]
+                vps[proto].append(item)
+        return cls(vantage_points=vps, rib=rib, updates=updates)
+
+    @classmethod
+    def load(cls, path: str) -> "Fixtures":
+        """Load fixtures saved with :meth:`save` (gzip-compressed if `path` ends with `.gz`)."""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str) -> None:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt") as f:
+            json.dump({"vantage_points": self.vantage_points, "rib": self.rib, "updates": self.updates,
+                       "topology": self.topology, "messages": self.messages, "monitoring": self.monitoring}, f)
+
+    # ---------- Queries ----------
+    def _selected(self, data: Dict[str, Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """Entries of the VPs of `vp_bgp_ids`/`vp_bmp_ids` (all VPs if neither is given)."""
+        wanted = {"bgp": _ids(params, "vp_bgp_ids"), "bmp": _ids(params, "vp_bmp_ids")}
+        everything = wanted["bgp"] is None and wanted["bmp"] is None
+        return {
+            proto: {vp_id: value for vp_id, value in (data.get(proto) or {}).items()
+                    if everything or (wanted[proto] is not None and vp_id in wanted[proto])}
+            for proto in ("bgp", "bmp")
+        }
+
+    @staticmethod
+    def _project(route: list, params: Dict[str, Any], offset: int) -> list:
+        """Blank the fields the query did not ask for (`offset` is the index of the AS path)."""
+        route = list(route)
+        for index, name, default in ((0, "return_aspath", True), (1, "return_community", True),
+                                     (2, "return_aspa_status", False), (3, "return_rov_status", False)):
+            if not _flag(params, name, default):
+                route[offset + index] = None
+        return route
+
+    def query_rib(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        feeds = _split(params.get("bmp_feed_type"))
+        routes = self._selected(self.rib, params)
+        if feeds:
+            routes = {proto: {vp_id: {p: r for p, r in vp_routes.items() if str(r[4]) in feeds or proto == "bgp"}
+                              for vp_id, vp_routes in vps.items()}
+                      for proto, vps in routes.items()}
+        match = _route_filter(params)
+        data = {proto: {vp_id: {p: r for p, r in vp_routes.items() if match(p, r[0], r[1], r[2], r[3])}
+                        for vp_id, vp_routes in vps.items()}
+                for proto, vps in routes.items()}
+        if _flag(params, "return_count"):
+            return {proto: {vp_id: len(vp_routes) for vp_id, vp_routes in vps.items()} for proto, vps in data.items()}
+        return {proto: {vp_id: {p: self._project(r, params, 0) for p, r in vp_routes.items()}
+                        for vp_id, vp_routes in vps.items()}
+                for proto, vps in data.items()}
+
+    def _updates_between(self, params: Dict[str, Any], start: str, end: str) -> Dict[str, Dict[str, List[list]]]:
+        begin, stop = _time(params[start]), _time(params[end])
+        return {proto: {vp_id: [row for row in rows if begin <= row[0] < stop] for vp_id, rows in vps.items()}
+                for proto, vps in self._selected(self.updates, params).items()}
+
+    @staticmethod
+    def _filter_updates(rows: Dict[str, Dict[str, List[list]]], params: Dict[str, Any]) -> Dict[str, Dict[str, List[list]]]:
+        match = _route_filter(params)
+        return {proto: {vp_id: [row for row in vp_rows if match(row[2], row[3], row[4], row[5], row[6], row[1])]
+                        for vp_id, vp_rows in vps.items()}
+                for proto, vps in rows.items()}
+
+    def query_updates(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        rows = self._updates_between(params, "start_date", "end_date")
+        if not _flag(params, "chronological_order", True):
+            rows = {proto: {vp_id: vp_rows[::-1] for vp_id, vp_rows in vps.items()} for proto, vps in rows.items()}
+        limit = params.get("max_updates_to_return")
+        data = self._filter_updates(rows, params)
+        if limit is not None:
+            data = {proto: {vp_id: vp_rows[:int(limit)] for vp_id, vp_rows in vps.items()}
+                    for proto, vps in data.items()}
+        if _flag(params, "return_count"):
+            counts: Dict[str, Dict[str, Dict[str, int]]] = {}
+            for proto, vps in data.items():
+                for vp_id, vp_rows in vps.items():
+                    per_kind = counts.setdefault(proto, {}).setdefault(vp_id, {})
+                    for row in vp_rows:
+                        per_kind[row[1]] = per_kind.get(row[1], 0) + 1
+            return counts
+        return {proto: {vp_id: [self._project(row, params, 3) for row in vp_rows] for vp_id, vp_rows in vps.items()}
+                for proto, vps in data.items()}
+
+    def query_topology(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.topology is not None:
+            return self.topology
+        ignored = {int(asn) for asn in _split(params.get("as_to_ignore")) or []}
+        private = _flag(params, "ignore_private_asns")
+        directed = _flag(params, "directed")
+
+        paths: Set[Tuple[int, ...]] = set()
+        if _flag(params, "with_rib", True):
+            for vps in self._selected(self.rib, params).values():
+                for vp_routes in vps.values():
+                    paths.update(tuple(_asns(route[0])) for route in vp_routes.values())
+        if _flag(params, "with_updates") and params.get("date_end") is not None:
+            window = self._updates_between(params, "date", "date_end")
+            for vps in window.values():
+                for vp_rows in vps.values():
+                    paths.update(tuple(_asns(row[3])) for row in vp_rows if row[1] == "A")
+
+        links: Set[Tuple[int, int]] = set()
+        kept_paths = []
+        for path in sorted(paths):
+            path = [asn for asn in path if asn not in ignored
+                    and not (private and any(low <= asn <= high for low, high in _PRIVATE_ASNS))]
+            kept_paths.append(path)
+            for as1, as2 in zip(path, path[1:]):
+                links.add((as1, as2) if directed or as1 <= as2 else (as2, as1))
+        data: Dict[str, Any] = {"links": sorted(map(list, links))}
+        if _flag(params, "with_aspath"):
+            data["aspaths"] = kept_paths
+        return data
+
+    def query_vantage_points(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        by_id = {"bgp": _ids(params, "vp_bgp_ids"), "bmp": _ids(params, "vp_bmp_ids")}
+        restricted = by_id["bgp"] is not None or by_id["bmp"] is not None
+        protocols = _ids(params, "peering_protocol")
+
+        checks = []
+        for name, field in _VP_FIELDS.items():
+            values = _ids(params, name)
+            if values is not None:
+                checks.append(lambda item, field=field, values=values: str(field(item)) in values)
+        for name in ("rib_size_v4", "rib_size_v6"):
+            check = _rib_size(params, name)
+            if check is not None:
+                checks.append(check)
+        if params.get("data_afi") is not None:
+            afi = str(params["data_afi"])
+            if afi not in ("4", "6"):
+                raise ValueError(f"data_afi must be 4 or 6, got {afi!r}")
+            # VPs with routes of that address family.
+            checks.append(lambda item: (item.get("rib_size_v" + afi) or 0) > 0)
+
+        data: Dict[str, List[Dict[str, Any]]] = {}
+        for proto, items in self.vantage_points.items():
+            if protocols is not None and proto not in protocols:
+                data[proto] = []
+                continue
+            data[proto] = [
+                item for item in items
+                if (not restricted or (by_id[proto] is not None and str(item["id"]) in by_id[proto]))
+                and all(check(item) for check in checks)
+            ]
+        return data
+
+    def query_messages(self, params: Dict[str, Any]) -> List[Any]:
+        if self.messages is not None:
+            return self.messages
+        interval = float(params.get("interval_time") or 60)
+        begin, stop = _time(params["start_date"]), _time(params["end_date"])
+        buckets = max(1, int((stop - begin + interval - 1) // interval))
+        rows = self._filter_updates(self._updates_between(params, "start_date", "end_date"), params)
+        data = []
+        for proto, vps in rows.items():
+            for vp_id, vp_rows in vps.items():
+                counts = [[0, 0] + ([0] * 6 if proto == "bmp" else []) for _ in range(buckets)]
+                for row in vp_rows:
+                    counts[min(int((row[0] - begin) // interval), buckets - 1)][row[1] == "W"] += 1
+                data.append([int(vp_id), proto, counts])
+        return data
+
+    def query(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Answer a query on `endpoint` (e.g. `"/rib"`) with the `data` of the response."""
+        if endpoint == "/monitoring":
+            return self.monitoring
+        return getattr(self, "query_" + endpoint.strip("/"))(params)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_HTTPServer"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        self.server.owner._handle(self, "GET", url.path, dict(parse_qsl(url.query, keep_blank_values=True)))
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError:
+            self.server.owner._reply(self, 400, {"detail": "Invalid JSON body"})
+            return
+        self.server.owner._handle(self, "POST", urlparse(self.path).path, params)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    owner: "LocalServer"
+
+
+class LocalServer:
+    """
+    Local stand-in for the bgproutes.io API, serving `/v1/rib`, `/v1/updates`,
+    `/v1/topology`, `/v1/vantage_points`, `/v1/messages` and `/v1/monitoring`
+    from :class:`Fixtures`, so that scripts and benchmarks run offline and
+    reproducibly. Queries are answered with the API's filters (evaluated
+    independently of the client's :class:`RouteFilter`) and response envelopes.
+
+    With `recordings`, every exact query seen before is answered from that
+    directory. With `upstream` (e.g. `"https://api.bgproutes.io"`), queries
+    without a recording are forwarded there, with the caller's API key, and
+    their response is recorded: run once against the API to record, then
+    without `upstream` to replay.
+
+    Faults are injected in a reproducible way (random draws from `seed`):
+
+    :param fixtures: Data to serve (:meth:`Fixtures.synthetic` by default).
+    :param host: Interface to listen on.
+    :param port: Port to listen on (0 picks a free one, see :attr:`url`).
+    :param latency: Delay in seconds before each response.
+    :param jitter: Extra delay drawn uniformly in `[0, jitter]` seconds.
+    :param bandwidth: Bytes per second at which response bodies are written (unlimited if None).
+    :param error_rate: Probability of answering 500.
+    :param rate_limit_rate: Probability of answering 429 with a `retry in N seconds` detail.
+    :param max_concurrent: Queries beyond this number in flight are answered
+        429, like the API's limit on concurrent queries (no limit if None).
+    :param retry_after: Delay in seconds announced by 429 answers.
+    :param api_key: If set, requests with another `x-api-key` are answered 403.
+    :param seed: Seed of the fault injection.
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[Fixtures] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        bandwidth: Optional[float] = None,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        max_concurrent: Optional[int] = None,
+        retry_after: float = 1.0,
+        api_key: Optional[str] = None,
+        recordings: Optional[str] = None,
+        upstream: Optional[str] = None,
+        seed: int = 0,
+    ):
+        self.fixtures = fixtures if fixtures is not None else Fixtures.synthetic(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrent = max_concurrent
+        self.retry_after = retry_after
+        self.api_key = api_key
+        self.recordings = recordings
+        self.upstream = upstream
+        if recordings is not None:
+            os.makedirs(recordings, exist_ok=True)
+
+        self.stats: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.owner = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to give to the client (`base_url=server.url`)."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ---------- Life cycle ----------
+    def start(self) -> "LocalServer":
+        """Serve in a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread = None
+
+    def __enter__(self) -> "LocalServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ---------- Requests ----------
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def _draw(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _handle(self, handler: _Handler, method: str, path: str, params: Dict[str, Any]) -> None:
+        started = time.perf_counter()
+        self._count("requests")
+        prefix = "/" + API_VERSION
+        endpoint = path[len(prefix):] if path.startswith(prefix + "/") else path
+        if endpoint not in ENDPOINTS:
+            self._reply(handler, 404, {"detail": f"Unknown endpoint {path}"})
+            return
+        if self.api_key is not None and handler.headers.get("x-api-key") != self.api_key:
+            self._reply(handler, 403, {"detail": "Invalid API key"})
+            return
+
+        with self._lock:
+            self._in_flight += 1
+            busy = self.max_concurrent is not None and self._in_flight > self.max_concurrent
+        try:
+            if busy:
+                self._reply(handler, 429, {"detail": f"Concurrent queries blocked, retry in {self.retry_after} seconds"})
+                return
+            delay = self.latency + (self._draw() * self.jitter if self.jitter else 0.0)
+            if delay:
+                time.sleep(delay)
+            if self.rate_limit_rate and self._draw() < self.rate_limit_rate:
+                self._reply(handler, 429, {"detail": f"Rate limit exceeded, retry in {self.retry_after} seconds"})
+                return
+            if self.error_rate and self._draw() < self.error_rate:
+                self._reply(handler, 500, {"detail": "Injected server error"})
+                return
+
+            params = {k: v for k, v in params.items() if v is not None}
+            status, content = self._answer(handler, method, path, endpoint, params)
+            if status != 200 or "seconds" in content:
+                self._reply(handler, status, content)
+                return
+            # Envelope of the API, with the size of `data` as `bytes`.
+            data = json.dumps(content["data"]).encode()
+            head = '{"seconds": %.6f, "bytes": %d, "data": ' % (time.perf_counter() - started, len(data))
+            self._send(handler, 200, head.encode() + data + b"}")
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _answer(self, handler: _Handler, method: str, path: str, endpoint: str,
+                params: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        key = None
+        if self.recordings is not None:
+            # Same key for the GET and POST forms of a query.
+            key = DiskCache.key("", endpoint, {k: str(v) for k, v in params.items()})
+            recorded = os.path.join(self.recordings, key + ".json")
+            if os.path.exists(recorded):
+                self._count("replayed")
+                with open(recorded, "rb") as f:
+                    return 200, json.loads(f.read())
+        if self.upstream is not None:
+            return self._forward(handler, method, path, params, key)
+        try:
+            return 200, {"data": self.fixtures.query(endpoint, params)}
+        except (KeyError, ValueError) as e:
+            return 400, {"detail": str(e)}
+
+    def _forward(self, handler: _Handler, method: str, path: str, params: Dict[str, Any],
+                 key: Optional[str]) -> Tuple[int, Dict[str, Any]]:
+        import requests
+
+        self._count("forwarded")
+        headers = {"x-api-key": handler.headers.get("x-api-key") or ""}
+        url = self.upstream.rstrip("/") + path
+        if method == "GET":
+            response = requests.get(url, params=params, headers=headers)
+        else:
+            response = requests.post(url, json=params, headers=headers)
+        try:
+            content = response.json()
+        except ValueError:
+            return 502, {"detail": "Invalid upstream response"}
+        if response.status_code == 200 and key is not None:
+            path_tmp = os.path.join(self.recordings, key + ".tmp")
+            with open(path_tmp, "w") as f:
+                json.dump(content, f)
+            os.replace(path_tmp, os.path.join(self.recordings, key + ".json"))
+        return response.status_code, content
+
+    def _reply(self, handler: _Handler, status: int, content: Dict[str, Any]) -> None:
+        self._send(handler, status, json.dumps(content).encode())
+
+    def _send(self, handler: _Handler, status: int, body: bytes) -> None:
+        self._count(str(status))
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        if self.bandwidth is None:
+            handler.wfile.write(body)
+            return
+        for i in range(0, len(body), _CHUNK):
+            chunk = body[i:i + _CHUNK]
+            handler.wfile.write(chunk)
+            handler.wfile.flush()
+            time.sleep(len(chunk) / self.bandwidth)
@@ -0,0 +1,272 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import decoder
+
+CACHE_MODES = ("use", "bypass", "refresh")
+
+# Endpoints whose cached responses can answer narrower queries (see utils/filters.py).
+SUPERSET_PATHS = ("/rib", "/updates")
+
+# Suffixes of the entry files and of the superset index files.
+_ENTRY = ".json.z"
+_INDEX = ".idx"
+
+# Parameters holding the time span of a query.
+_DATE_PARAMS = ("date", "date_end", "start_date", "end_date", "timestamp")
+
+
+def _as_utc(value: Any) -> Optional[datetime]:
+    """Parse an API date (ISO 8601, YYYY-MM-DD or epoch) as the UTC instant at which it ends."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        try:
+            return datetime.fromtimestamp(float(value), tz=timezone.utc)
+        except ValueError:
+            return None
+    if len(str(value)) == 10:
+        # A day covers everything up to the next midnight.
+        parsed += timedelta(days=1)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class DiskCache:
+    """
+    Persistent, compressed on-disk cache of API responses.
+
+    Entries are keyed by a hash of the base URL, endpoint and normalised query
+    parameters. A query whose dates all lie more than `settle` seconds in the
+    past is historical and kept until evicted. Any other query ("now", recent
+    dates, or no date at all) expires after `ttl` seconds. When the cache grows
+    beyond `max_bytes`, the least recently used entries are removed, and the
+    superset indexes (`.idx` files, counted in the size) are rewritten
+    without them.
+
+    :param directory: Cache directory, defaults to `~/.cache/pybgproutesapi`.
+    :param max_bytes: Maximum total size of the cache files.
+    :param ttl: Lifetime in seconds of entries for queries touching recent data.
+    :param settle: Age in seconds after which data is considered immutable.
+    :param level: zlib compression level.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = 2 * 1024 ** 3,
+        ttl: float = 300,
+        settle: float = 6 * 3600,
+        level: int = 6,
+    ):
+        if directory is None:
+            directory = os.path.join(os.path.expanduser("~"), ".cache", "pybgproutesapi")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.settle = settle
+        self.level = level
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Keys recorded in each superset index read so far, so that remember() appends without re-reading.
+        self._families: Dict[str, set] = {}
+        self._size = sum(size for _, size, _ in self._files(_ENTRY)) + sum(size for _, size, _ in self._files(_INDEX))
+
+    # ---------- Keys and lifetimes ----------
+    @staticmethod
+    def key(base_url: str, path: str, params: Dict[str, Any]) -> str:
+        """Canonical hash of a query; `None` parameters are ignored."""
+        clean = {k: v for k, v in params.items() if v is not None}
+        canonical = json.dumps([base_url.rstrip('/'), path, clean], sort_keys=True, default=str,
+                               separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def expires(self, params: Dict[str, Any], now: Optional[float] = None) -> Optional[float]:
+        """Return the expiry timestamp of a query, or None if its data is immutable."""
+        now = time.time() if now is None else now
+        dates = [_as_utc(params.get(name)) for name in _DATE_PARAMS if params.get(name) is not None]
+        if dates and all(d is not None and d.timestamp() < now - self.settle for d in dates):
+            return None
+        return now + self.ttl
+
+    # ---------- Storage ----------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + _ENTRY)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached content for `key`, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                expired = header["expires"] is not None and header["expires"] < time.time()
+                content = None if expired else decoder.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, zlib.error):
+            expired = True
+
+        if expired:
+            self._remove(path)
+            return None
+
+        # Mark as recently used for the LRU eviction.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return content
+
+    def set(self, key: str, content: Any, expires: Optional[float]) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = json.dumps({"expires": expires}).encode() + b"\n"
+        data = header + zlib.compress(json.dumps(content, separators=(",", ":")).encode(), self.level)
+
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            self._size += len(data) - previous
+            over = self._size > self.max_bytes
+
+        if over:
+            self.evict()
+
+    # ---------- Supersets ----------
+    def _family_path(self, family: str) -> str:
+        return os.path.join(self.directory, family[:2], family + _INDEX)
+
+    def remember(self, family: str, key: str, filters: Dict[str, Any]) -> None:
+        """
+        Record that entry `key` answers the query `family` (the key of the
+        query without its filters) restricted by `filters`.
+        """
+        path = self._family_path(family)
+        line = (json.dumps({"key": key, "filters": filters}, sort_keys=True, default=str) + "\n").encode()
+        with self._lock:
+            known = self._families.get(family)
+            if known is None:
+                known = self._families[family] = {record["key"] for record in self._records(path)}
+            if key in known:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "ab") as f:
+                f.write(line)
+            known.add(key)
+            self._size += len(line)
+            over = self._size > self.max_bytes
+
+        if over:
+            self.evict()
+
+    @staticmethod
+    def _records(path: str) -> List[Dict[str, Any]]:
+        """Records of a superset index; unreadable lines are skipped."""
+        records = []
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        records.append({"key": record["key"], "filters": record["filters"]})
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+        return records
+
+    def supersets(self, family: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return the `(key, filters)` of the entries recorded for `family`, most filtered first."""
+        found = {r["key"]: r["filters"] for r in self._records(self._family_path(family))
+                 if os.path.exists(self._path(r["key"]))}
+        return sorted(found.items(), key=lambda r: -len(r[1]))
+
+    def _prune(self) -> None:
+        """Rewrite the superset indexes without the records of removed entries."""
+        for path, _, _ in list(self._files(_INDEX)):
+            with self._lock:
+                seen = set()
+                lines = []
+                for record in self._records(path):
+                    if record["key"] not in seen and os.path.exists(self._path(record["key"])):
+                        seen.add(record["key"])
+                        lines.append(json.dumps(record, sort_keys=True, default=str) + "\n")
+                try:
+                    previous = os.path.getsize(path)
+                    if lines:
+                        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+                        with os.fdopen(fd, "w") as f:
+                            f.writelines(lines)
+                        os.replace(tmp, path)
+                        self._size += os.path.getsize(path) - previous
+                    else:
+                        os.remove(path)
+                        self._size -= previous
+                except OSError:
+                    continue
+        with self._lock:
+            self._families.clear()
+
+    def _remove(self, path: str) -> None:
+        with self._lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+            except OSError:
+                return
+            self._size -= size
+
+    def _files(self, suffix: str):
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(suffix):
+                    path = os.path.join(root, name)
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, st.st_size, st.st_mtime
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until the cache is below 90% of
+        `max_bytes`, then drop their records from the superset indexes.
+        """
+        entries = sorted(self._files(_ENTRY), key=lambda e: e[2])
+        indexes = sum(size for _, size, _ in self._files(_INDEX))
+        with self._lock:
+            self._size = sum(size for _, size, _ in entries) + indexes
+        target = self.max_bytes * 0.9
+        for path, _, _ in entries:
+            if self._size <= target:
+                break
+            self._remove(path)
+        self._prune()
+
+    def clear(self) -> None:
+        """Remove all entries and superset indexes."""
+        for path, _, _ in list(self._files(_ENTRY)) + list(self._files(_INDEX)):
+            self._remove(path)
+        with self._lock:
+            self._families.clear()
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cache files."""
+        return self._size
@@ -0,0 +1,197 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from .vp import VPBGP, VPBMP
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
+# vantage_points() filters answered from the catalog indexes: argument -> VP attribute.
+_INDEXED = {
+    "vp_ips": "ip",
+    "vp_asns": "asn",
+    "peering_protocol": "peering_protocol",
+    "bmp_parent_ips": "bmp_parent_ip",
+    "bmp_parent_asns": "bmp_parent_asn",
+    "sources": "source",
+    "countries": "country",
+    "org_countries": "org_country",
+    "ixp_ids": "ixp_id",
+    "ixp_rs_ips": "ixp_rs_ip",
+}
+_INT_FIELDS = {"asn", "bmp_parent_asn", "ixp_id"}
+_RANGES = ("rib_size_v4", "rib_size_v6")
+
+
+def _values(val: Union[List[Any], str, Any]) -> List[Any]:
+    """Accept a list or a comma-separated string, like the `vantage_points()` arguments."""
+    if isinstance(val, str):
+        return [v.strip() for v in val.split(",") if v.strip()]
+    if isinstance(val, (list, tuple, set)):
+        return list(val)
+    return [val]
+
+
+class _Snapshot:
+    """VP list of one date with its lookup indexes."""
+
+    def __init__(self, vps: List[Union[VPBGP, VPBMP]]):
+        self.vps = vps
+        self.fetched_at = time.monotonic()
+
+        self.index: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in _INDEXED.values()}
+        self.ids: Dict[Tuple[str, int], int] = {}
+        for pos, vp in enumerate(vps):
+            self.ids[(vp.peering_protocol, vp.unique_id)] = pos
+            for field, index in self.index.items():
+                value = getattr(vp, field, None)
+                if value is not None:
+                    index.setdefault(value, set()).add(pos)
+
+        # Sorted (size, position) pairs, for range queries by bisection.
+        self.ranges: Dict[str, Tuple[List[int], List[int]]] = {}
+        for field in _RANGES:
+            pairs = sorted((getattr(vp, field), pos) for pos, vp in enumerate(vps)
+                           if isinstance(getattr(vp, field), (int, float)))
+            self.ranges[field] = ([size for size, _ in pairs], [pos for _, pos in pairs])
+
+    def lookup(self, field: str, values: Iterable[Any]) -> Set[int]:
+        index = self.index[field]
+        found: Set[int] = set()
+        for value in values:
+            if field in _INT_FIELDS:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    continue
+            found |= index.get(value, set())
+        return found
+
+    def range(self, field: str, op: str, bound: float) -> Set[int]:
+        sizes, positions = self.ranges[field]
+        bound = float(bound)
+        if op == ">":
+            return set(positions[bisect_right(sizes, bound):])
+        if op == ">=":
+            return set(positions[bisect_left(sizes, bound):])
+        if op == "<":
+            return set(positions[:bisect_left(sizes, bound)])
+        if op == "<=":
+            return set(positions[:bisect_right(sizes, bound)])
+        if op in ("=", "=="):
+            return set(positions[bisect_left(sizes, bound):bisect_right(sizes, bound)])
+        raise ValueError(f"Unsupported rib size operator: {op!r}")
+
+
+class VPCatalog:
+    """
+    In-memory catalog of the vantage points, answering `vantage_points()`
+    queries locally.
+
+    The full VP list of a date is fetched once and kept for `ttl` seconds.
+    Lists are indexed by IP, ASN, source, country, organisation country,
+    peering protocol, BMP parent IP/ASN, IXP and RIB sizes, so that filter
+    combinations cost a few set intersections instead of a round-trip.
+    Queries the catalog cannot answer (status, AFI, histories, metadata or
+    date ranges) are forwarded to the API.
+
+    :param ttl: Lifetime in seconds of a fetched VP list.
+    :param client: Client used for the queries, defaults to the shared client.
+    :param base_url: API origin, see :func:`pybgproutesapi.vantage_points`.
+    :param api_key: API key, see :func:`pybgproutesapi.vantage_points`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        client: Optional["BGPRoutesClient"] = None,
+        base_url: str = None,
+        api_key: str = None,
+    ):
+        self.ttl = ttl
+        self.client = client
+        self.base_url = base_url
+        self.api_key = api_key
+
+        self._snapshots: Dict[Optional[str], _Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, date: Optional[str]) -> _Snapshot:
+        from ..endpoints.vantage_points import vantage_points
+        vps = vantage_points(date=date, base_url=self.base_url, api_key=self.api_key, client=self.client)
+        return _Snapshot(vps)
+
+    def snapshot(self, date: Optional[str] = None) -> _Snapshot:
+        """Return the indexed VP list of `date`, fetching it if missing or older than `ttl`."""
+        with self._lock:
+            snap = self._snapshots.get(date)
+            if snap is None or time.monotonic() - snap.fetched_at > self.ttl:
+                snap = self._snapshots[date] = self._fetch(date)
+            return snap
+
+    def invalidate(self, date: Optional[str] = None) -> None:
+        """Drop the cached VP list of `date`."""
+        with self._lock:
+            self._snapshots.pop(date, None)
+
+    def clear(self) -> None:
+        """Drop every cached VP list."""
+        with self._lock:
+            self._snapshots.clear()
+
+    def get(self, vp_id: int, peering_protocol: str = "bgp", date: Optional[str] = None) -> Optional[Union[VPBGP, VPBMP]]:
+        """Return the VP with the given ID and protocol, or None."""
+        snap = self.snapshot(date)
+        pos = snap.ids.get((peering_protocol, int(vp_id)))
+        return None if pos is None else snap.vps[pos]
+
+    def vantage_points(
+        self,
+        vp_bgp_ids: Optional[Union[List[str], str]] = None,
+        vp_bmp_ids: Optional[Union[List[str], str]] = None,
+        date: Optional[str] = None,
+        rib_size_v4: Optional[tuple] = None,
+        rib_size_v6: Optional[tuple] = None,
+        **filters: Any,
+    ) -> List[Union[VPBGP, VPBMP]]:
+        """
+        Same arguments and result as :func:`pybgproutesapi.vantage_points`.
+
+        Different filters are combined with AND, values within one filter
+        with OR. VPs are returned in the order of the API response.
+        """
+        local = set(_INDEXED) | {"date"}
+        forward = {k: v for k, v in filters.items() if k not in local and v not in (None, False)}
+        if forward:
+            from ..endpoints.vantage_points import vantage_points
+            return vantage_points(
+                vp_bgp_ids=vp_bgp_ids, vp_bmp_ids=vp_bmp_ids, date=date, rib_size_v4=rib_size_v4,
+                rib_size_v6=rib_size_v6, base_url=self.base_url, api_key=self.api_key, client=self.client,
+                **filters,
+            )
+
+        snap = self.snapshot(date)
+        selected: Optional[Set[int]] = None
+
+        def narrow(positions: Set[int]) -> None:
+            nonlocal selected
+            selected = positions if selected is None else selected & positions
+
+        if vp_bgp_ids is not None or vp_bmp_ids is not None:
+            keys = [("bgp", int(i)) for i in _values(vp_bgp_ids or [])]
+            keys += [("bmp", int(i)) for i in _values(vp_bmp_ids or [])]
+            narrow({snap.ids[k] for k in keys if k in snap.ids})
+
+        for arg, field in _INDEXED.items():
+            if filters.get(arg) is not None:
+                narrow(snap.lookup(field, _values(filters[arg])))
+
+        for field, bound in zip(_RANGES, (rib_size_v4, rib_size_v6)):
+            if bound:
+                narrow(snap.range(field, bound[0], bound[1]))
+
+        if selected is None:
+            return list(snap.vps)
+        return [snap.vps[pos] for pos in sorted(selected)]
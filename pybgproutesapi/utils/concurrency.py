@@ -0,0 +1,107 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .errors import RateLimitError
+
+
+class AdaptiveConcurrency:
+    """
+    Client-side AIMD governor for the number of requests in flight.
+
+    The limit grows additively while requests succeed (by `increase` once a
+    full window of `limit` requests has succeeded) and is multiplied by
+    `decrease` when the API answers 429 (rate limit exceeded or concurrent
+    queries blocked). Only one decrease is applied per window, so a burst of
+    429s caused by the same limit halves it once. After a 429, new requests
+    wait for the retry delay found in the error detail (or `backoff` seconds)
+    before being sent, and the rejected request is sent again, up to
+    `max_retries` times.
+
+    :param initial: Initial concurrency limit.
+    :param min_limit: Lowest limit the governor can decrease to.
+    :param max_limit: Highest limit the governor can increase to.
+    :param increase: Additive increase per window of successful requests.
+    :param decrease: Multiplicative decrease factor applied on 429.
+    :param backoff: Pause in seconds after a 429 without a retry hint.
+    :param max_retries: Maximum number of times a rate-limited request is sent again.
+    """
+
+    def __init__(
+        self,
+        initial: int = 1,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        backoff: float = 1.0,
+        max_retries: int = 5,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.backoff = backoff
+        self.max_retries = max_retries
+
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._in_flight = 0
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of requests allowed in flight."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> int:
+        """Block until a request may be sent; return the window it was admitted in."""
+        with self._cond:
+            while True:
+                wait = self._paused_until - time.monotonic()
+                if wait <= 0 and self._in_flight < int(self._limit):
+                    self._in_flight += 1
+                    return self._epoch
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, epoch: int, success: bool = True, rate_limited: bool = False,
+                retry_after: Optional[float] = None) -> None:
+        """
+        Return the slot taken by `acquire()` and adapt the limit: increase it
+        on success, decrease it when rate-limited, keep it on other failures.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if rate_limited:
+                pause = self.backoff if retry_after is None else retry_after
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+                if epoch == self._epoch:
+                    self._limit = max(float(self.min_limit), self._limit * self.decrease)
+                    self._epoch += 1
+            elif success and self._limit < self.max_limit:
+                self._limit = min(float(self.max_limit), self._limit + self.increase / self._limit)
+            self._cond.notify_all()
+
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """Run `fn` within the limit, sending it again when it is rate-limited."""
+        attempt = 0
+        while True:
+            epoch = self.acquire()
+            try:
+                result = fn()
+            except RateLimitError as e:
+                self.release(epoch, success=False, rate_limited=True, retry_after=e.retry_after)
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                continue
+            except BaseException:
+                self.release(epoch, success=False)
+                raise
+            self.release(epoch)
+            return result
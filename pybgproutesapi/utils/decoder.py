@@ -0,0 +1,81 @@
+import json
+from typing import Any, Callable, Dict, Optional
+
+Decoder = Callable[[bytes], Any]
+
+
+def _orjson() -> Decoder:
+    import orjson
+    return orjson.loads
+
+
+def _ujson() -> Decoder:
+    import ujson
+    return ujson.loads
+
+
+def _simdjson() -> Decoder:
+    import simdjson
+    parser = simdjson.Parser
+
+    def loads(body: bytes) -> Any:
+        # A parser is not thread-safe: use one per call.
+        return parser().parse(body, recursive=True)
+    return loads
+
+
+def _stdlib() -> Decoder:
+    # json.loads accepts bytes and detects their UTF encoding itself.
+    return json.loads
+
+
+# Decoders of JSON bytes by order of preference.
+BACKENDS: Dict[str, Callable[[], Decoder]] = {
+    "orjson": _orjson,
+    "simdjson": _simdjson,
+    "ujson": _ujson,
+    "json": _stdlib,
+}
+
+
+def available_backends() -> Dict[str, Decoder]:
+    """Return the installed JSON backends, fastest first."""
+    found = {}
+    for name, load in BACKENDS.items():
+        try:
+            found[name] = load()
+        except ImportError:
+            continue
+    return found
+
+
+def get_decoder(name: Optional[str] = None) -> Decoder:
+    """
+    Return a function decoding JSON from bytes.
+
+    :param name: One of `BACKENDS`. By default, the fastest installed backend
+        is used, falling back to the standard library `json`.
+    """
+    if name is None:
+        for load in BACKENDS.values():
+            try:
+                return load()
+            except ImportError:
+                continue
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r}, expected one of {tuple(BACKENDS)}")
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        raise ImportError(f"JSON backend {name!r} is not installed: pip install {name}")
+
+
+_default: Optional[Decoder] = None
+
+
+def loads(body: bytes) -> Any:
+    """Decode JSON bytes with the fastest installed backend, chosen on first use rather than at import."""
+    global _default
+    if _default is None:
+        _default = get_decoder()
+    return _default(body)
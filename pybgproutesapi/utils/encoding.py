@@ -0,0 +1,64 @@
+import gzip
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from urllib3.util.request import ACCEPT_ENCODING as _URLLIB3_ENCODINGS
+
+# Content encodings by order of preference. Only those urllib3 can decode
+# with the installed packages (brotli, zstd) are advertised.
+_PREFERRED = ("zstd", "br", "gzip", "deflate")
+ACCEPT_ENCODING = ", ".join(e for e in _PREFERRED if e in _URLLIB3_ENCODINGS.split(","))
+
+# POST bodies at least this large are sent gzip-compressed.
+COMPRESS_MIN_BYTES = 64 * 1024
+
+# Status codes a server may answer when it does not accept compressed bodies.
+COMPRESSION_REJECTED = (400, 411, 413, 415, 422)
+
+RESPONSE_FORMATS = ("json", "msgpack", "cbor")
+
+
+def gzip_body(body: bytes, level: int = 6) -> bytes:
+    return gzip.compress(body, compresslevel=level)
+
+
+def _msgpack_decoder() -> Optional[Callable[[bytes], Any]]:
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return lambda body: msgpack.unpackb(body, raw=False, strict_map_key=False)
+
+
+def _cbor_decoder() -> Optional[Callable[[bytes], Any]]:
+    try:
+        import cbor2
+    except ImportError:
+        return None
+    return cbor2.loads
+
+
+_BINARY = {
+    "msgpack": (("application/msgpack", "application/x-msgpack", "application/vnd.msgpack"), _msgpack_decoder),
+    "cbor": (("application/cbor",), _cbor_decoder),
+}
+
+
+def binary_format(name: str) -> Optional[Tuple[Tuple[str, ...], Callable[[bytes], Any]]]:
+    """
+    Return `(media_types, decoder)` for a binary response format, or None
+    for `"json"` or when the package needed to decode it is not installed.
+    """
+    if name not in RESPONSE_FORMATS:
+        raise ValueError(f"response_format must be one of {RESPONSE_FORMATS}, got {name!r}")
+    if name == "json":
+        return None
+    media_types, load = _BINARY[name]
+    decoder = load()
+    return (media_types, decoder) if decoder is not None else None
+
+
+def accept_header(fmt: Optional[Tuple[Tuple[str, ...], Callable[[bytes], Any]]]) -> Dict[str, str]:
+    """`Accept` header preferring the binary format `fmt`, with JSON as fallback."""
+    if fmt is None:
+        return {}
+    return {"Accept": f"{fmt[0][0]}, application/json;q=0.9"}
@@ -1,3 +1,7 @@
+import re
+
+import requests
+
 class BGPAPIError(Exception):
     """Base class for all BGP API-related errors."""
     pass
@@ -8,7 +12,11 @@ class InvalidAPIKeyError(BGPAPIError):
 
 class RateLimitError(BGPAPIError):
     """Raised when rate limit is exceeded or concurrent queries are blocked."""
-    pass
+
+    def __init__(self, message, detail=None):
+        super().__init__(message)
+        self.detail = detail
+        self.retry_after = parse_retry_after(detail)
 
 class BadRequestError(BGPAPIError):
     """Raised when the API receives malformed input."""
@@ -22,14 +30,20 @@ class ServerError(BGPAPIError):
     """Raised when the server returns a 5xx error."""
     pass
 
+class InvalidJSONResponse(requests.HTTPError):
+    """Raised when the API answers with a body that is not valid JSON."""
+    pass
+
 def handle_error_response(response, content):
+    raise_for_status(response.status_code, content)
+
+def raise_for_status(status, content):
     detail = content.get("detail") if isinstance(content, dict) else None
-    status = response.status_code
 
     if status == 403:
         raise InvalidAPIKeyError(f"Invalid API key: {detail}")
     elif status == 429:
-        raise RateLimitError(f"Rate limit exceeded: {detail}")
+        raise RateLimitError(f"Rate limit exceeded: {detail}", detail)
     elif status == 400:
         raise BadRequestError(f"Invalid request: {detail}")
     elif status == 404:
@@ -37,4 +51,21 @@ def handle_error_response(response, content):
     elif 500 <= status < 600:
         raise ServerError(f"Server error ({status}): {detail}")
     else:
-        raise BGPAPIError(f"Unexpected error ({status}): {detail}")
\ No newline at end of file
+        raise BGPAPIError(f"Unexpected error ({status}): {detail}")
+
+_RETRY_AFTER_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|milliseconds?|s|secs?|seconds?|m|mins?|minutes?)\b", re.IGNORECASE)
+
+def parse_retry_after(detail):
+    """Extract a retry delay in seconds from an API error detail, e.g. "retry in 30 seconds"."""
+    if not isinstance(detail, str):
+        return None
+    match = _RETRY_AFTER_RE.search(detail)
+    if match is None:
+        return None
+    value, unit = match.groups()
+    unit = unit.lower()
+    if unit.startswith("ms") or unit.startswith("milli"):
+        return float(value) / 1000
+    if unit.startswith("m"):
+        return float(value) * 60
+    return float(value)
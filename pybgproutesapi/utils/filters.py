@@ -0,0 +1,244 @@
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .prefix import PREFIX_OPERATORS, _BITS, _key
+
+# Query parameters that only remove routes from a response, and can thus be
+# evaluated locally on a response fetched without them.
+FILTER_PARAMS = (
+    "data_afi",
+    "type_filter",
+    "prefix_filter",
+    "prefix_exact_match",
+    "aspath_exact_match",
+    "aspath_regexp",
+    "community_regexp",
+    "rov_status_filter",
+    "aspa_status_filter",
+)
+
+# Field that must be present in the response to evaluate each filter locally.
+_REQUIRES = {
+    "aspath_exact_match": "return_aspath",
+    "aspath_regexp": "return_aspath",
+    "community_regexp": "return_community",
+    "rov_status_filter": "return_rov_status",
+    "aspa_status_filter": "return_aspa_status",
+}
+
+# PostgreSQL regular expression escapes without a Python equivalent of the same spelling.
+_PG_ESCAPES = (
+    (r"\y", r"\b"),
+    (r"\m", r"\b(?=\w)"),
+    (r"\M", r"\b(?<=\w)"),
+)
+
+
+@lru_cache(maxsize=256)
+def _pg_regex(pattern: str) -> "re.Pattern":
+    """Compile a PostgreSQL (`~` operator) regular expression with Python's `re`."""
+    for pg, py in _PG_ESCAPES:
+        pattern = pattern.replace(pg, py)
+    return re.compile(pattern)
+
+
+def _split(value: Optional[Union[List[Any], str]]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    return [str(v) for v in value]
+
+
+def _prefix_terms(prefix_filter: Optional[Union[List[Tuple[str, str]], str]]) -> Optional[List[Tuple[str, Tuple[int, int, int]]]]:
+    if prefix_filter is None:
+        return None
+    if isinstance(prefix_filter, str):
+        prefix_filter = [term.split(":", 1) for term in _split(prefix_filter)]
+    terms = []
+    for op, prefix in prefix_filter:
+        if op not in PREFIX_OPERATORS:
+            raise ValueError(f"Unsupported prefix operator {op!r}, expected one of {PREFIX_OPERATORS}")
+        terms.append((op, _key(prefix)))
+    return terms
+
+
+def _contains(outer: Tuple[int, int, int], inner: Tuple[int, int, int]) -> bool:
+    """True if prefix `outer` contains (or equals) prefix `inner`."""
+    afi, network, length = outer
+    if afi != inner[0] or length > inner[2]:
+        return False
+    host = _BITS[afi] - length
+    return inner[1] >> host == network >> host
+
+
+class RouteFilter:
+    """
+    Local evaluation of the route filters of `rib()` and `updates()`.
+
+    Arguments have the same names and syntax as those of the endpoints (lists
+    or comma-separated strings) and the same semantics as on the server:
+    different filters must all match, and the values of one filter are
+    alternatives. `prefix_filter` uses PostgreSQL inet operators and the
+    regular expressions are searched anywhere in the AS path or community
+    string, as with PostgreSQL's `~`.
+
+    Filters on a field need that field in the response: filtering on
+    `rov_status_filter` needs a response fetched with `return_rov_status=True`.
+    """
+
+    def __init__(
+        self,
+        data_afi: Optional[int] = None,
+        type_filter: Optional[str] = None,
+        prefix_filter: Optional[Union[List[Tuple[str, str]], str]] = None,
+        prefix_exact_match: Optional[Union[List[str], str]] = None,
+        aspath_exact_match: Optional[Union[List[str], str]] = None,
+        aspath_regexp: Optional[str] = None,
+        community_regexp: Optional[str] = None,
+        rov_status_filter: Optional[Union[List[int], str]] = None,
+        aspa_status_filter: Optional[Union[List[int], str]] = None,
+    ):
+        self.data_afi = int(data_afi) if data_afi is not None else None
+        types = _split(type_filter)
+        self.types = {t[0].upper() for t in types} if types else None
+        self.prefix_terms = _prefix_terms(prefix_filter)
+        exact = _split(prefix_exact_match)
+        self.prefixes = {_key(p) for p in exact} if exact else None
+        paths = _split(aspath_exact_match)
+        self.paths = set(paths) if paths else None
+        self.aspath_regexp = _pg_regex(aspath_regexp) if aspath_regexp else None
+        self.community_regexp = _pg_regex(community_regexp) if community_regexp else None
+        rov = _split(rov_status_filter)
+        self.rov = {int(v) for v in rov} if rov else None
+        aspa = _split(aspa_status_filter)
+        self.aspa = {int(v) for v in aspa} if aspa else None
+
+        # Results of the regular expressions, per distinct string.
+        self._path_matches: Dict[Optional[str], bool] = {}
+        self._community_matches: Dict[Optional[str], bool] = {}
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "RouteFilter":
+        """Build the filter of a query from its request parameters."""
+        return cls(**{name: params.get(name) for name in FILTER_PARAMS})
+
+    # ---------- Single route ----------
+    def _prefix_ok(self, prefix: str) -> bool:
+        if self.data_afi is None and self.prefix_terms is None and self.prefixes is None:
+            return True
+        key = _key(prefix)
+        if self.data_afi is not None and key[0] != self.data_afi:
+            return False
+        if self.prefixes is not None and key not in self.prefixes:
+            return False
+        if self.prefix_terms is not None:
+            for op, term in self.prefix_terms:
+                if op == "=" and key == term:
+                    return True
+                if op in ("<<", "<<=") and _contains(term, key) and (op == "<<=" or key != term):
+                    return True
+                if op in (">>", ">>=") and _contains(key, term) and (op == ">>=" or key != term):
+                    return True
+            return False
+        return True
+
+    def _path_ok(self, aspath: Optional[str]) -> bool:
+        if self.paths is not None and aspath not in self.paths:
+            return False
+        if self.aspath_regexp is not None:
+            found = self._path_matches.get(aspath)
+            if found is None:
+                found = self._path_matches[aspath] = aspath is not None and self.aspath_regexp.search(aspath) is not None
+            return found
+        return True
+
+    def _community_ok(self, community: Optional[str]) -> bool:
+        if self.community_regexp is None:
+            return True
+        found = self._community_matches.get(community)
+        if found is None:
+            found = self._community_matches[community] = (
+                community is not None and self.community_regexp.search(community) is not None
+            )
+        return found
+
+    def match(self, prefix: str, aspath: Optional[str] = None, community: Optional[str] = None,
+              aspa: Optional[int] = None, rov: Optional[int] = None, kind: Optional[str] = None) -> bool:
+        """True if a route (or an update of type `kind`) passes every filter."""
+        if self.types is not None and kind is not None and kind[:1].upper() not in self.types:
+            return False
+        if self.rov is not None and rov not in self.rov:
+            return False
+        if self.aspa is not None and aspa not in self.aspa:
+            return False
+        return self._path_ok(aspath) and self._community_ok(community) and self._prefix_ok(prefix)
+
+    # ---------- Responses ----------
+    def filter_rib(self, data: Dict[str, Dict[str, Dict[str, List[Any]]]]) -> Dict[str, Any]:
+        """Filter the `data` of a `rib()` response, `{proto: {vp_id: {prefix: route}}}`."""
+        match = self.match
+        return {
+            proto: {
+                vp_id: {prefix: route for prefix, route in routes.items()
+                        if match(prefix, route[0], route[1], route[2], route[3])}
+                for vp_id, routes in (vps or {}).items()
+            }
+            for proto, vps in data.items()
+        }
+
+    def filter_updates(self, data: Dict[str, Dict[str, List[List[Any]]]],
+                       max_updates_to_return: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Filter the `data` of an `updates()` response, `{proto: {vp_id: [update]}}`,
+        keeping at most `max_updates_to_return` updates per VP.
+        """
+        match = self.match
+        result = {}
+        for proto, vps in data.items():
+            result[proto] = {}
+            for vp_id, rows in (vps or {}).items():
+                kept = [row for row in rows if match(row[2], row[3], row[4], row[5], row[6], row[1])]
+                result[proto][vp_id] = kept[:max_updates_to_return] if max_updates_to_return is not None else kept
+        return result
+
+
+def split_params(params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split query parameters into `(base, filters)`: the filters only remove routes from the base query's response."""
+    base = {k: v for k, v in params.items() if k not in FILTER_PARAMS and k != "max_updates_to_return"}
+    filters = {k: params[k] for k in FILTER_PARAMS if params.get(k) is not None}
+    if params.get("max_updates_to_return") is not None:
+        filters["max_updates_to_return"] = params["max_updates_to_return"]
+    return base, filters
+
+
+def narrows(filters: Dict[str, Any], superset: Dict[str, Any], base: Dict[str, Any]) -> bool:
+    """
+    True if the query `base` + `filters` can be answered locally from the
+    response to `base` + `superset`: every filter of `superset` is also in
+    `filters`, with the same value, and the fields needed by the remaining
+    filters were returned.
+    """
+    if superset.get("max_updates_to_return") is not None:
+        # A truncated response is not a superset of anything else.
+        return superset == filters
+    for name, value in superset.items():
+        if filters.get(name) != value:
+            return False
+    for name in filters:
+        if name in superset:
+            continue
+        needed = _REQUIRES.get(name)
+        if needed is not None and base.get(needed) in (None, False, "false", "False"):
+            return False
+    return True
+
+
+def apply_filters(path: str, data: Any, filters: Dict[str, Any], superset: Dict[str, Any]) -> Any:
+    """Apply to `data`, the response to a query with the filters `superset`, the remaining `filters`."""
+    remaining = {k: v for k, v in filters.items() if k not in superset and k != "max_updates_to_return"}
+    route_filter = RouteFilter(**remaining)
+    if path.rstrip("/").endswith("/updates"):
+        return route_filter.filter_updates(data, filters.get("max_updates_to_return"))
+    return route_filter.filter_rib(data)
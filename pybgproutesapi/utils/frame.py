@@ -0,0 +1,257 @@
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .intern import InternPool, aspath_pool, community_pool
+from .pathmatch import path_matcher
+from .table import MISSING, _value
+
+# Codes of the `kind` column.
+ANNOUNCE = 0
+WITHDRAW = 1
+_KINDS = {"A": ANNOUNCE, "W": WITHDRAW}
+_KIND_NAMES = {ANNOUNCE: "A", WITHDRAW: "W"}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("UpdatesFrame requires numpy: pip install numpy")
+    return numpy
+
+
+def _timestamp(value: Union[str, float, datetime]) -> float:
+    """Accept an epoch, a datetime or an ISO 8601 string (UTC unless specified)."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class UpdatesFrame:
+    """
+    Columnar form of an `/updates` response, backed by NumPy arrays.
+
+    Each update is one row of the arrays:
+
+    - `time`: float64 timestamp;
+    - `kind`: uint8, `ANNOUNCE` (0) or `WITHDRAW` (1);
+    - `vp`: index into `vps`, the list of `(proto, vp_id)` pairs;
+    - `prefix`: id into the `prefixes` list, where each distinct prefix is
+      stored once;
+    - `path`, `community`: ids into the `paths` and `communities`
+      :class:`InternPool`;
+    - `aspa`, `rov`, `feed`: int8 status codes (`MISSING` when absent).
+
+    Build it with :meth:`from_response` or ``updates(..., as_frame=True)``.
+    """
+
+    _COLUMNS = (("time", "d", "float64"), ("kind", "B", "uint8"), ("vp", "I", "uint32"),
+                ("prefix", "I", "uint32"), ("path", "I", "uint32"), ("community", "I", "uint32"),
+                ("aspa", "b", "int8"), ("rov", "b", "int8"), ("feed", "b", "int8"))
+
+    def __init__(self, columns: Dict[str, Any], vps: List[Tuple[str, str]], prefixes: List[str],
+                 paths: InternPool, communities: InternPool):
+        np = _numpy()
+        self._np = np
+        for name, _, dtype in self._COLUMNS:
+            setattr(self, name, np.asarray(columns[name], dtype=dtype))
+        self.vps = vps
+        self.prefixes = prefixes
+        self.paths = paths
+        self.communities = communities
+
+    # ---------- Construction ----------
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, list]], paths: Optional[InternPool] = None,
+                  communities: Optional[InternPool] = None) -> "UpdatesFrame":
+        """
+        Build a frame from `(proto, vp_id, update_row)` rows, e.g. a streamed
+        `updates()` response. AS paths and communities are added to the given
+        pools (new ones by default), e.g. the pools of a client.
+        """
+        np = _numpy()
+        # Rows are first appended to compact stdlib arrays, then converted once.
+        cols = {name: array(typecode) for name, typecode, _ in cls._COLUMNS}
+        vps: List[Tuple[str, str]] = []
+        vp_ids: Dict[Tuple[str, str], int] = {}
+        prefixes: List[str] = []
+        prefix_ids: Dict[str, int] = {}
+        paths = paths if paths is not None else aspath_pool()
+        communities = communities if communities is not None else community_pool()
+        intern_path, intern_community = paths.intern, communities.intern
+
+        time_col, kind_col, vp_col = cols["time"], cols["kind"], cols["vp"]
+        prefix_col, path_col, comm_col = cols["prefix"], cols["path"], cols["community"]
+        aspa_col, rov_col, feed_col = cols["aspa"], cols["rov"], cols["feed"]
+
+        last_key, vp = None, 0
+        for proto, vp_id, update in rows:
+            # Rows of one VP are contiguous in a response.
+            if (proto, vp_id) != last_key:
+                last_key = (proto, vp_id)
+                vp = vp_ids.get(last_key)
+                if vp is None:
+                    vp = vp_ids[last_key] = len(vps)
+                    vps.append(last_key)
+
+            if len(update) < 8:
+                update = update + [None] * (8 - len(update))
+            timestamp, kind, prefix, aspath, community, aspa, rov, feed = update[:8]
+
+            i = prefix_ids.get(prefix)
+            if i is None:
+                i = prefix_ids[prefix] = len(prefixes)
+                prefixes.append(prefix)
+            prefix_col.append(i)
+            path_col.append(intern_path(aspath))
+            comm_col.append(intern_community(community))
+
+            time_col.append(timestamp)
+            kind_col.append(_KINDS[kind])
+            vp_col.append(vp)
+            aspa_col.append(MISSING if aspa is None else aspa)
+            rov_col.append(MISSING if rov is None else rov)
+            feed_col.append(MISSING if feed is None else feed)
+
+        columns = {name: np.frombuffer(cols[name], dtype=dtype) if len(cols[name]) else []
+                   for name, _, dtype in cls._COLUMNS}
+        return cls(columns, vps, prefixes, paths, communities)
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Dict[str, List[list]]], paths: Optional[InternPool] = None,
+                      communities: Optional[InternPool] = None) -> "UpdatesFrame":
+        """Build a frame from the `{proto: {vp_id: [update, ...]}}` form returned by `updates()`."""
+        return cls.from_rows(
+            ((proto, vp_id, update)
+             for proto, vps in data.items() if vps
+             for vp_id, updates in vps.items()
+             for update in updates),
+            paths, communities,
+        )
+
+    # ---------- Access ----------
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def row(self, i: int) -> Tuple[str, str, list]:
+        """Return row `i` as `(proto, vp_id, update_row)`."""
+        proto, vp_id = self.vps[self.vp[i]]
+        return proto, vp_id, [
+            float(self.time[i]), _KIND_NAMES[int(self.kind[i])], self.prefixes[self.prefix[i]],
+            self.paths[self.path[i]], self.communities[self.community[i]],
+            _value(int(self.aspa[i])), _value(int(self.rov[i])), _value(int(self.feed[i])),
+        ]
+
+    def aspath(self, i: int) -> Tuple[Any, ...]:
+        """AS path of row `i` as a tuple of ASNs, parsed once per distinct path."""
+        return self.paths.parsed(int(self.path[i]))
+
+    def __iter__(self) -> Iterator[Tuple[str, str, list]]:
+        return (self.row(i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns (the interned strings are not counted)."""
+        return sum(getattr(self, name).nbytes for name, _, _ in self._COLUMNS)
+
+    @property
+    def announcements(self):
+        """Boolean mask of the announcements."""
+        return self.kind == ANNOUNCE
+
+    @property
+    def withdrawals(self):
+        """Boolean mask of the withdrawals."""
+        return self.kind == WITHDRAW
+
+    # ---------- Selection ----------
+    def __getitem__(self, index) -> "UpdatesFrame":
+        """Select rows with a boolean mask, an index array or a slice (sharing the string lists)."""
+        columns = {name: getattr(self, name)[index] for name, _, _ in self._COLUMNS}
+        return UpdatesFrame(columns, self.vps, self.prefixes, self.paths, self.communities)
+
+    def sort(self) -> "UpdatesFrame":
+        """Return the rows in chronological order (stable for equal timestamps)."""
+        return self[self._np.argsort(self.time, kind="stable")]
+
+    def between(self, start: Union[str, float, datetime], end: Union[str, float, datetime]) -> "UpdatesFrame":
+        """Return the updates with `start <= time < end`."""
+        return self[(self.time >= _timestamp(start)) & (self.time < _timestamp(end))]
+
+    def vp_mask(self, vps: Iterable[Tuple[str, str]]):
+        """Boolean mask of the rows of the given `(proto, vp_id)` pairs."""
+        wanted = {(proto, str(vp_id)) for proto, vp_id in vps}
+        return self._np.isin(self.vp, [i for i, key in enumerate(self.vps) if key in wanted])
+
+    def prefix_mask(self, prefixes: Iterable[str]):
+        """Boolean mask of the rows of the given prefixes."""
+        wanted = set(prefixes)
+        return self._np.isin(self.prefix, [i for i, p in enumerate(self.prefixes) if p in wanted])
+
+    def path_mask(self, aspath_regexp: str):
+        """
+        Boolean mask of the rows whose AS path matches `aspath_regexp` (same
+        syntax as the API argument). The pattern is evaluated once per
+        distinct path and the result is cached per pattern.
+        """
+        return path_matcher(self.paths).mask(aspath_regexp, self.path)
+
+    def _groups(self, codes) -> Iterator[Tuple[int, Any]]:
+        order = self._np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        starts = self._np.flatnonzero(self._np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        for start, end in zip(starts, self._np.r_[starts[1:], len(order)]):
+            yield int(sorted_codes[start]), order[start:end]
+
+    def group_by_vp(self) -> Dict[Tuple[str, str], "UpdatesFrame"]:
+        """Split the frame into one frame per `(proto, vp_id)`."""
+        return {self.vps[code]: self[rows] for code, rows in self._groups(self.vp)}
+
+    def group_by_prefix(self) -> Dict[str, "UpdatesFrame"]:
+        """Split the frame into one frame per prefix."""
+        return {self.prefixes[code]: self[rows] for code, rows in self._groups(self.prefix)}
+
+    # ---------- Rates ----------
+    def rate(self, interval: float = 60.0, by: Optional[str] = None,
+             start: Union[str, float, datetime, None] = None, end: Union[str, float, datetime, None] = None):
+        """
+        Return `(bin_starts, rates)`: the number of updates per second in
+        consecutive bins of `interval` seconds between `start` and `end`
+        (default: first and last update).
+
+        With `by="vp"` or `by="prefix"`, `rates` is a 2-D array with one row
+        per entry of `vps` or `prefixes`, otherwise a 1-D array.
+        """
+        np = self._np
+        if start is None:
+            start = float(self.time.min()) if len(self) else 0.0
+        if end is None:
+            end = float(self.time.max()) + interval if len(self) else start
+        start, end = _timestamp(start), _timestamp(end)
+
+        nbins = max(1, int(np.ceil((end - start) / interval)))
+        bin_starts = start + interval * np.arange(nbins)
+        keep = (self.time >= start) & (self.time < end)
+        bins = ((self.time[keep] - start) // interval).astype(np.int64)
+
+        if by is None:
+            return bin_starts, np.bincount(bins, minlength=nbins) / interval
+        if by not in ("vp", "prefix"):
+            raise ValueError(f"by must be None, 'vp' or 'prefix', got {by!r}")
+        groups = getattr(self, by)[keep].astype(np.int64)
+        ngroups = len(self.vps) if by == "vp" else len(self.prefixes)
+        counts = np.bincount(groups * nbins + bins, minlength=ngroups * nbins)
+        return bin_starts, counts.reshape(ngroups, nbins) / interval
+
+    # ---------- Conversion ----------
+    def to_dict(self) -> Dict[str, Dict[str, List[list]]]:
+        """Convert back to the `{proto: {vp_id: [update, ...]}}` form of `updates()`."""
+        data: Dict[str, Dict[str, List[list]]] = {"bgp": {}, "bmp": {}}
+        for proto, vp_id, update in self:
+            data.setdefault(proto, {}).setdefault(vp_id, []).append(update)
+        return data
@@ -0,0 +1,309 @@
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .frame import _numpy
+
+_SHIFT = 32
+_LOW = (1 << _SHIFT) - 1
+
+
+class TopologyGraph:
+    """
+    AS graph in compressed sparse row (CSR) form, built from the `links` of
+    `topology()` responses.
+
+    Links are kept as one sorted array of unique 64-bit codes `(as1 << 32) |
+    as2` (with `as1 <= as2` when undirected), so that adding batches
+    deduplicates them and set operations between graphs are binary searches
+    in sorted arrays. ASNs are remapped to dense indices `0..n-1` (`asns` holds the
+    ASN of each index) and adjacency is stored as CSR arrays: the neighbours
+    of index `i` are `indices[indptr[i]:indptr[i + 1]]`. A directed graph has
+    an outgoing and an incoming CSR.
+
+    Links can be added at any time; the arrays are rebuilt on the next query.
+
+    :param links: Optional `(as1, as2)` pairs to start with.
+    :param directed: Whether `(as1, as2)` and `(as2, as1)` are different links.
+    """
+
+    def __init__(self, links: Optional[Iterable[Tuple[int, int]]] = None, directed: bool = False):
+        self._np = _numpy()
+        self.directed = directed
+        self._codes = self._np.empty(0, dtype=self._np.uint64)
+        self._pending: List[Any] = []
+        self._csr: Dict[str, Tuple[Any, Any]] = {}
+        self._asns = None
+        if links is not None:
+            self.add_links(links)
+
+    @classmethod
+    def from_topology(cls, responses: Union[Dict[str, Any], Iterable[Dict[str, Any]]],
+                      directed: bool = False) -> "TopologyGraph":
+        """Build a graph from one or several `topology()` responses (or their `data`)."""
+        graph = cls(directed=directed)
+        if isinstance(responses, dict):
+            responses = [responses]
+        for response in responses:
+            graph.add_topology(response)
+        return graph
+
+    @classmethod
+    def _from_codes(cls, codes: Any, directed: bool) -> "TopologyGraph":
+        graph = cls(directed=directed)
+        graph._codes = codes
+        return graph
+
+    # ---------- Ingestion ----------
+    def add_links(self, links: Iterable[Tuple[int, int]]) -> None:
+        """Add `(as1, as2)` links (a list of pairs or an `(n, 2)` array); duplicates are ignored."""
+        np = self._np
+        if not isinstance(links, (list, tuple, np.ndarray)):
+            links = list(links)
+        pairs = np.asarray(links, dtype=np.uint64)
+        if pairs.size == 0:
+            return
+        pairs = pairs.reshape(-1, 2)
+        src, dst = pairs[:, 0], pairs[:, 1]
+        if not self.directed:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+        self._pending.append((src << np.uint64(_SHIFT)) | dst)
+
+    def add_topology(self, response: Dict[str, Any]) -> None:
+        """Add the links of a `topology()` response (or its `data`)."""
+        data = response.get("data", response)
+        self.add_links(data.get("links") or [])
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        np = self._np
+        self._codes = np.unique(np.concatenate([self._codes] + self._pending))
+        self._pending = []
+        self._csr = {}
+        self._asns = None
+
+    @property
+    def codes(self) -> Any:
+        """Sorted unique link codes `(as1 << 32) | as2`."""
+        self._flush()
+        return self._codes
+
+    # ---------- Structure ----------
+    def links(self) -> Any:
+        """Return the links as an `(n, 2)` array of ASNs."""
+        np = self._np
+        codes = self.codes
+        return np.stack([codes >> np.uint64(_SHIFT), codes & np.uint64(_LOW)], axis=1).astype(np.int64)
+
+    @property
+    def asns(self) -> Any:
+        """Sorted array of the ASNs of the graph; position = dense index."""
+        self._flush()
+        if self._asns is None:
+            np = self._np
+            codes = self._codes
+            self._asns = np.unique(np.concatenate([codes >> np.uint64(_SHIFT), codes & np.uint64(_LOW)]))
+        return self._asns
+
+    def index(self, asn: int) -> int:
+        """Dense index of `asn`, or -1 if it is not in the graph."""
+        asns = self.asns
+        i = int(self._np.searchsorted(asns, asn))
+        return i if i < len(asns) and asns[i] == asn else -1
+
+    def _build(self, direction: str) -> Tuple[Any, Any]:
+        """CSR `(indptr, indices)` of `direction`: "out", "in" or "both"."""
+        self._flush()
+        csr = self._csr.get(direction)
+        if csr is not None:
+            return csr
+        np = self._np
+        asns, codes = self.asns, self._codes
+        src = np.searchsorted(asns, codes >> np.uint64(_SHIFT))
+        dst = np.searchsorted(asns, codes & np.uint64(_LOW))
+        if direction == "in":
+            src, dst = dst, src
+        elif direction == "both":
+            # Self-loops are stored once, so that degrees count distinct neighbours.
+            loop = src == dst
+            src, dst = np.concatenate([src, dst[~loop]]), np.concatenate([dst, src[~loop]])
+        if direction == "out":
+            # Codes are sorted by (as1, as2): rows are already in CSR order.
+            indices = dst
+        else:
+            indices = dst[np.argsort(src, kind="stable")]
+        indptr = np.zeros(len(asns) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=len(asns)), out=indptr[1:])
+        csr = self._csr[direction] = (indptr, indices)
+        return csr
+
+    def _direction(self, mode: str) -> str:
+        if not self.directed or mode == "all":
+            return "both"
+        if mode not in ("out", "in"):
+            raise ValueError(f"mode must be 'out', 'in' or 'all', got {mode!r}")
+        return mode
+
+    # ---------- Queries ----------
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def num_asns(self) -> int:
+        return len(self.asns)
+
+    def __contains__(self, link: Tuple[int, int]) -> bool:
+        as1, as2 = link
+        if not self.directed and as1 > as2:
+            as1, as2 = as2, as1
+        code = (as1 << _SHIFT) | as2
+        codes = self.codes
+        # As a Python int, a code above 2**53 would be compared as a float.
+        i = int(self._np.searchsorted(codes, self._np.uint64(code)))
+        return i < len(codes) and int(codes[i]) == code
+
+    def neighbors(self, asn: int, mode: str = "all") -> Any:
+        """
+        Return the ASNs adjacent to `asn`. For a directed graph, `mode` is
+        `"out"` (successors), `"in"` (predecessors) or `"all"`.
+        """
+        i = self.index(asn)
+        if i < 0:
+            return self._np.empty(0, dtype=self.asns.dtype)
+        indptr, indices = self._build(self._direction(mode))
+        return self._np.unique(self.asns[indices[indptr[i]:indptr[i + 1]]])
+
+    def degree(self, asn: Optional[int] = None, mode: str = "all") -> Any:
+        """
+        Number of distinct neighbours of `asn` or, without `asn`, an array of
+        the degrees of all ASNs (aligned with `asns`).
+        """
+        if asn is not None:
+            return len(self.neighbors(asn, mode))
+        np = self._np
+        if self.directed and mode == "all":
+            # A pair linked in both directions counts once.
+            return np.diff(self._undirected()._build("both")[0])
+        return np.diff(self._build(self._direction(mode))[0])
+
+    def _undirected(self) -> "TopologyGraph":
+        return TopologyGraph(self.links(), directed=False) if self.directed else self
+
+    def k_hop(self, asn: int, k: int, mode: str = "all") -> Dict[int, Any]:
+        """
+        Breadth-first search from `asn`: return `{distance: ASNs}` for the
+        ASNs at 1 to `k` hops (`mode` as in :meth:`neighbors`).
+        """
+        np = self._np
+        start = self.index(asn)
+        if start < 0:
+            return {}
+        indptr, indices = self._build(self._direction(mode))
+        seen = np.zeros(len(self.asns), dtype=bool)
+        seen[start] = True
+        frontier = np.array([start])
+        rings = {}
+        for distance in range(1, k + 1):
+            starts, ends = indptr[frontier], indptr[frontier + 1]
+            lengths = ends - starts
+            if not lengths.sum():
+                break
+            # Concatenate the neighbour slices of the whole frontier at once.
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            reached = np.unique(indices[offsets])
+            frontier = reached[~seen[reached]]
+            if not len(frontier):
+                break
+            seen[frontier] = True
+            rings[distance] = self.asns[frontier]
+        return rings
+
+    def connected_components(self) -> Tuple[Any, Any]:
+        """
+        Return `(asns, labels)`: the component label of each ASN (weakly
+        connected components for a directed graph). Labels are the dense
+        index of the smallest ASN of the component.
+        """
+        np = self._np
+        asns, codes = self.asns, self.codes
+        src = np.searchsorted(asns, codes >> np.uint64(_SHIFT))
+        dst = np.searchsorted(asns, codes & np.uint64(_LOW))
+        labels = np.arange(len(asns))
+        while True:
+            # Hook each link's larger label onto the smaller one, then jump pointers.
+            low = np.minimum(labels[src], labels[dst])
+            previous = labels.copy()
+            np.minimum.at(labels, labels[src], low)
+            np.minimum.at(labels, labels[dst], low)
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels, previous):
+                return asns, labels
+
+    def components(self) -> List[Any]:
+        """Return the connected components as arrays of ASNs, largest first."""
+        np = self._np
+        asns, labels = self.connected_components()
+        if not len(asns):
+            return []
+        order = np.argsort(labels, kind="stable")
+        groups = np.split(asns[order], np.flatnonzero(np.diff(labels[order])) + 1)
+        return sorted(groups, key=len, reverse=True)
+
+    # ---------- Set operations ----------
+    def _check(self, other: "TopologyGraph") -> None:
+        if not isinstance(other, TopologyGraph):
+            raise TypeError(f"expected a TopologyGraph, got {type(other).__name__}")
+        if other.directed != self.directed:
+            raise ValueError("cannot combine a directed and an undirected graph")
+
+    def _found(self, codes: Any, other: Any) -> Any:
+        """Boolean mask of the `codes` present in the sorted array `other`."""
+        if not len(other):
+            return self._np.zeros(len(codes), dtype=bool)
+        i = self._np.searchsorted(other, codes)
+        i[i == len(other)] = 0
+        return other[i] == codes
+
+    def union(self, other: "TopologyGraph") -> "TopologyGraph":
+        self._check(other)
+        np = self._np
+        extra = other.codes[~self._found(other.codes, self.codes)]
+        return self._from_codes(np.sort(np.concatenate([self.codes, extra]), kind="stable"), self.directed)
+
+    def intersection(self, other: "TopologyGraph") -> "TopologyGraph":
+        self._check(other)
+        return self._from_codes(self.codes[self._found(self.codes, other.codes)], self.directed)
+
+    def difference(self, other: "TopologyGraph") -> "TopologyGraph":
+        self._check(other)
+        return self._from_codes(self.codes[~self._found(self.codes, other.codes)], self.directed)
+
+    def symmetric_difference(self, other: "TopologyGraph") -> "TopologyGraph":
+        self._check(other)
+        np = self._np
+        mine = self.codes[~self._found(self.codes, other.codes)]
+        theirs = other.codes[~self._found(other.codes, self.codes)]
+        return self._from_codes(np.sort(np.concatenate([mine, theirs]), kind="stable"), self.directed)
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
+    __xor__ = symmetric_difference
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TopologyGraph):
+            return NotImplemented
+        return self.directed == other.directed and self._np.array_equal(self.codes, other.codes)
+
+    __hash__ = None
+
+    def to_set(self) -> Set[Tuple[int, int]]:
+        """Return the links as a set of `(as1, as2)` tuples."""
+        return set(map(tuple, self.links().tolist()))
+
+    def __repr__(self) -> str:
+        kind = "directed" if self.directed else "undirected"
+        return f"TopologyGraph({kind}, {self.num_asns} ASNs, {len(self)} links)"
@@ -1,3 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
 # --- helpers ---------------------------------------------------------------
 def chunked(seq, n):
     """Yield successive n-sized chunks from seq."""
@@ -15,4 +21,31 @@ def merge_responses(dest, src):
         # a simple update is sufficient because vp_ids are disjoint across batches
         dest[proto].update(src[proto])
     return dest
+
+def fan_out(fn, items, max_workers=4):
+    """
+    Call fn(item) for every item on a thread pool and yield (item, result)
+    pairs in completion order. Pending calls are cancelled if the consumer
+    stops iterating early.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(fn, item): item for item in items}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def split_time_window(start_date, end_date, n):
+    """
+    Split the ISO 8601 window [start_date, end_date) into at most n contiguous
+    sub-windows of (almost) equal length, returned as (start, end) string pairs.
+    """
+    start = datetime.fromisoformat(start_date)
+    end = datetime.fromisoformat(end_date)
+    seconds = int((end - start).total_seconds())
+    n = max(1, min(n, seconds))
+    bounds = [start + (end - start) * i / n for i in range(n + 1)]
+    bounds = [b.replace(microsecond=0) for b in bounds[:-1]] + [end]
+    return [(a.strftime(DATE_FORMAT), b.strftime(DATE_FORMAT)) for a, b in zip(bounds, bounds[1:])]
 # ---------------------------------------------------------------------------
\ No newline at end of file
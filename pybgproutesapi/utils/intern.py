@@ -0,0 +1,101 @@
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+def parse_aspath(aspath: Optional[str]) -> Tuple[Any, ...]:
+    """
+    Split an AS path such as `"3356 1299 {64500,64501}"` into a tuple of
+    ASNs. An AS set is returned as a frozenset of ASNs at its position.
+    """
+    if not aspath:
+        return ()
+    hops = []
+    for token in aspath.split():
+        if token.isdigit():
+            hops.append(int(token))
+        elif token.startswith("{"):
+            hops.append(frozenset(int(asn) for asn in token.strip("{}").split(",") if asn.strip().isdigit()))
+    return tuple(hops)
+
+
+def parse_communities(communities: Optional[str]) -> Tuple[Tuple[Any, ...], ...]:
+    """
+    Split a community string such as `"3356:1 3356:2 64500:1:2"` into a tuple
+    of int tuples (standard and large communities). Non-numeric parts are kept
+    as strings.
+    """
+    if not communities:
+        return ()
+    return tuple(
+        tuple(int(part) if part.isdigit() else part for part in community.split(":"))
+        for community in communities.split()
+    )
+
+
+class InternPool:
+    """
+    Pool storing each distinct string once, with a compact integer id and its
+    parsed form.
+
+    Ids are stable for the lifetime of the pool, so tables built from
+    different calls that share a pool can compare ids directly. The parsed
+    form is computed once per distinct string, on first access.
+
+    :param parser: Function turning a string into its parsed form.
+    """
+
+    def __init__(self, parser: Callable[[Optional[str]], Any]):
+        self.parser = parser
+        self._ids: Dict[Optional[str], int] = {}
+        self._strings: List[Optional[str]] = []
+        self._parsed: List[Any] = []
+        self._lock = threading.Lock()
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the id of `value`, adding it to the pool if needed."""
+        i = self._ids.get(value)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(value)
+                if i is None:
+                    i = self._ids[value] = len(self._strings)
+                    self._strings.append(value)
+                    self._parsed.append(None)
+        return i
+
+    def canonical(self, value: Optional[str]) -> Optional[str]:
+        """Return the pooled string equal to `value`, so that equal strings share one object."""
+        return self._strings[self.intern(value)]
+
+    def parsed(self, i: int) -> Any:
+        """Return the parsed form of the string with id `i`."""
+        parsed = self._parsed[i]
+        if parsed is None:
+            parsed = self._parsed[i] = self.parser(self._strings[i])
+        return parsed
+
+    def parse(self, value: Optional[str]) -> Any:
+        """Return the parsed form of `value`, parsing it only the first time it is seen."""
+        return self.parsed(self.intern(value))
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self._strings[i]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return iter(self._strings)
+
+    def __contains__(self, value: Optional[str]) -> bool:
+        return value in self._ids
+
+
+def aspath_pool() -> InternPool:
+    """Return a new pool of AS paths, parsed with :func:`parse_aspath`."""
+    return InternPool(parse_aspath)
+
+
+def community_pool() -> InternPool:
+    """Return a new pool of community strings, parsed with :func:`parse_communities`."""
+    return InternPool(parse_communities)
@@ -0,0 +1,186 @@
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from itertools import compress, islice, repeat
+from typing import Any, Iterable, List, Optional
+
+from .filters import _pg_regex
+from .intern import InternPool
+
+
+def _sre_modules():
+    """
+    Return the private modules of the `re` parser, or `(None, None)` if they
+    cannot be imported: the literal pre-filter is then skipped and patterns
+    are evaluated with the regular expression alone.
+    """
+    try:
+        from re import _constants, _parser
+        return _constants, _parser
+    except Exception:
+        pass
+    try:  # Python < 3.11
+        import sre_constants
+        import sre_parse
+        return sre_constants, sre_parse
+    except Exception:
+        return None, None
+
+
+_sre, _sre_parse = _sre_modules()
+
+# Shortest literal worth a substring pre-filter.
+_MIN_LITERAL = 3
+
+
+def _required(parsed) -> Optional[List[str]]:
+    """
+    Return literals such that any string matching the parsed pattern
+    contains at least one of them, or None if no such literals were found.
+    """
+    best: Optional[List[str]] = None
+
+    def consider(candidate: Optional[List[str]]) -> None:
+        nonlocal best
+        if not candidate or min(map(len, candidate)) < _MIN_LITERAL:
+            return
+        # Fewer alternatives, then longer literals, make a more selective filter.
+        if best is None or (len(candidate), -min(map(len, candidate))) < (len(best), -min(map(len, best))):
+            best = candidate
+
+    run: List[str] = []
+    for op, av in parsed:
+        if op is _sre.LITERAL:
+            run.append(chr(av))
+            continue
+        consider(["".join(run)])
+        run = []
+        if op is _sre.SUBPATTERN:
+            consider(_required(av[-1]))
+        elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT) and av[0] >= 1:
+            consider(_required(av[2]))
+        elif op is _sre.BRANCH:
+            alternatives = [_required(branch) for branch in av[1]]
+            if all(alternatives):
+                consider([literal for alternative in alternatives for literal in alternative])
+    consider(["".join(run)])
+    return best
+
+
+def _literals(regex: "re.Pattern") -> Optional[List[str]]:
+    if _sre_parse is None or regex.flags & re.IGNORECASE:
+        return None
+    try:
+        return _required(_sre_parse.parse(regex.pattern, regex.flags))
+    except Exception:
+        return None
+
+
+class PathMatcher:
+    """
+    Evaluate AS path regular expressions on the distinct paths of an
+    :class:`InternPool` and broadcast the results to routes by path id.
+
+    For each pattern, the matcher keeps a bitmap with one byte per path id
+    (1 if the path matches). It is computed once, and then only for paths
+    added to the pool since. Literals the pattern requires (such as the
+    ASNs of `"(^| )3356 (|.* )174($| )"`) are first searched as substrings,
+    so that the regular expression only runs on candidate paths. The bitmaps of the `max_patterns` most recently
+    used patterns are kept (LRU). Testing a pattern on the rows of a
+    `RibTable` or `UpdatesFrame` then costs one lookup per row.
+
+    Patterns use the syntax of the API's `aspath_regexp` (PostgreSQL regular
+    expressions, searched anywhere in the path string).
+
+    :param pool: Pool of AS path strings, e.g. `client.paths`.
+    :param max_patterns: Number of patterns whose bitmaps are kept.
+    """
+
+    def __init__(self, pool: InternPool, max_patterns: int = 64):
+        self.pool = pool
+        self.max_patterns = max_patterns
+        self._bitmaps: "OrderedDict[str, bytearray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def bitmap(self, pattern: str) -> bytearray:
+        """Return one byte per path id of the pool: 1 if the path matches `pattern`, else 0."""
+        with self._lock:
+            bitmap = self._bitmaps.get(pattern)
+            if bitmap is None:
+                bitmap = self._bitmaps[pattern] = bytearray()
+            self._bitmaps.move_to_end(pattern)
+            while len(self._bitmaps) > self.max_patterns:
+                self._bitmaps.popitem(last=False)
+
+            size = len(self.pool)
+            if len(bitmap) < size:
+                bitmap.extend(_match(_pg_regex(pattern), self.pool, len(bitmap), size))
+        return bitmap
+
+    def ids(self, pattern: str) -> List[int]:
+        """Return the ids of the paths matching `pattern`."""
+        return [i for i, hit in enumerate(self.bitmap(pattern)) if hit]
+
+    def matches(self, pattern: str, path_id: int) -> bool:
+        return bool(self.bitmap(pattern)[path_id])
+
+    def mask(self, pattern: str, path_ids: Iterable[int]) -> Any:
+        """
+        Return, for each id of `path_ids` (a column of path ids), whether the
+        path matches: a NumPy boolean array if NumPy is installed, else a
+        `bytes` of 0/1 values.
+        """
+        bitmap = self.bitmap(pattern)
+        try:
+            import numpy as np
+        except ImportError:
+            return bytes(map(bitmap.__getitem__, path_ids))
+        return np.frombuffer(bytes(bitmap), dtype=np.bool_)[np.asarray(path_ids)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bitmaps.clear()
+
+
+def _match(regex: "re.Pattern", pool: InternPool, start: int, end: int) -> bytearray:
+    """Bitmap of the paths `start` to `end` of `pool` matching `regex`."""
+    paths = list(islice(pool, start, end))
+    # The pool holds at most one None (routes without a path): it never matches.
+    try:
+        missing = paths.index(None)
+        paths[missing] = ""
+    except ValueError:
+        missing = None
+
+    literals = _literals(regex)
+    if literals is None:
+        found = bytearray(map(bool, map(regex.search, paths)))
+    else:
+        # Only the paths containing one of the literals the pattern requires
+        # can match: find them with C-level substring tests first.
+        candidates = set()
+        for literal in literals:
+            candidates.update(compress(range(len(paths)), map(str.__contains__, paths, repeat(literal))))
+        found = bytearray(len(paths))
+        for i in candidates:
+            if regex.search(paths[i]) is not None:
+                found[i] = 1
+
+    if missing is not None:
+        found[missing] = 0
+    return found
+
+
+# One matcher per pool, shared by the tables and frames built on it.
+_MATCHERS: "weakref.WeakKeyDictionary[InternPool, PathMatcher]" = weakref.WeakKeyDictionary()
+_MATCHERS_LOCK = threading.Lock()
+
+
+def path_matcher(pool: InternPool) -> PathMatcher:
+    """Return the :class:`PathMatcher` of `pool`, creating it on first use."""
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(pool)
+        if matcher is None:
+            matcher = _MATCHERS[pool] = PathMatcher(pool)
+        return matcher
@@ -0,0 +1,201 @@
+import socket
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_FAMILIES = {4: socket.AF_INET, 6: socket.AF_INET6}
+_BITS = {4: 32, 6: 128}
+
+# prefix_filter operators of the API (PostgreSQL inet semantics).
+PREFIX_OPERATORS = ("<<", "<<=", ">>", ">>=", "=")
+
+
+def parse_prefix(prefix: str) -> Tuple[int, int, int]:
+    """Return `(afi, network, length)` for a prefix such as `"203.0.113.0/24"` (or an address)."""
+    addr, _, length = prefix.partition("/")
+    afi = 6 if ":" in addr else 4
+    network = int.from_bytes(socket.inet_pton(_FAMILIES[afi], addr), "big")
+    return afi, network, int(length) if length else _BITS[afi]
+
+
+def format_prefix(afi: int, network: int, length: int) -> str:
+    """Inverse of :func:`parse_prefix`."""
+    size = 4 if afi == 4 else 16
+    return f"{socket.inet_ntop(_FAMILIES[afi], network.to_bytes(size, 'big'))}/{length}"
+
+
+def _key(prefix: str) -> Tuple[int, int, int]:
+    """Parse `prefix` with its host bits cleared."""
+    afi, network, length = parse_prefix(prefix)
+    host = _BITS[afi] - length
+    return afi, network >> host << host, length
+
+
+class PrefixIndex:
+    """
+    Index of prefixes answering longest-prefix match and covering/covered
+    queries locally.
+
+    Distinct prefixes are kept in one hash table keyed by `(afi, network,
+    length)`. A longest-prefix match probes only the lengths present in the
+    index (a few dozens at most), from the longest down. More specific
+    prefixes are found by bisection in the prefixes sorted by `(network,
+    length)`, in which the subnets of a prefix form one contiguous run.
+
+    Queries return `(prefix, values)` pairs. When the index is built from a
+    `rib()` response, values are the `(proto, vp_id, route)` of every VP
+    holding the prefix, looked up in the response at query time so that the
+    build only touches distinct prefixes. When it is built from a `RibTable`,
+    values are row numbers.
+    """
+
+    def __init__(self):
+        self._values: Dict[Tuple[int, int, int], Any] = {}
+        self._lengths: Dict[int, List[int]] = {4: [], 6: []}
+        self._sorted: Dict[int, Optional[List[Tuple[int, int]]]] = {4: None, 6: None}
+        self._sources: Optional[List[Tuple[str, str, Dict[str, Any]]]] = None
+
+    # ---------- Construction ----------
+    def add(self, prefix: str, value: Any) -> None:
+        """Add `value` to the values of `prefix` (only for indexes not built from a `rib()` response)."""
+        if self._sources is not None:
+            raise TypeError("values of an index built from a rib() response are read from the response")
+        key = _key(prefix)
+        values = self._values.get(key)
+        if values is None:
+            values = self._values[key] = []
+            afi, _, length = key
+            if length not in self._lengths[afi]:
+                self._lengths[afi] = sorted(self._lengths[afi] + [length], reverse=True)
+            self._sorted[afi] = None
+        values.append(value)
+
+    @classmethod
+    def from_rib(cls, rib: Any) -> "PrefixIndex":
+        """Build an index from a `rib()` response (`{proto: {vp_id: {prefix: route}}}`) or a `RibTable`."""
+        index = cls()
+        values = index._values
+
+        if hasattr(rib, "net_lo"):
+            afis, his, los, lengths = rib.afi, rib.net_hi, rib.net_lo, rib.length
+            for i in range(len(rib)):
+                key = (afis[i], (his[i] << 64) | los[i], lengths[i])
+                rows = values.get(key)
+                if rows is None:
+                    values[key] = [i]
+                else:
+                    rows.append(i)
+        else:
+            index._sources = [(proto, vp_id, routes) for proto, vps in rib.items()
+                              for vp_id, routes in (vps or {}).items()]
+            # The union of the key views runs in C; only distinct prefixes are parsed.
+            for prefix in set().union(*(routes.keys() for _, _, routes in index._sources)):
+                values[_key(prefix)] = prefix
+
+        for afi in (4, 6):
+            index._lengths[afi] = sorted({k[2] for k in values if k[0] == afi}, reverse=True)
+        return index
+
+    def _entry(self, key: Tuple[int, int, int]) -> Tuple[str, List[Any]]:
+        if self._sources is None:
+            return format_prefix(*key), self._values[key]
+        prefix = self._values[key]
+        return prefix, [(proto, vp_id, routes[prefix]) for proto, vp_id, routes in self._sources
+                        if prefix in routes]
+
+    # ---------- Access ----------
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, prefix: str) -> bool:
+        return _key(prefix) in self._values
+
+    def __getitem__(self, prefix: str) -> List[Any]:
+        return self._entry(_key(prefix))[1]
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._entry(key)[0] for key in self._values)
+
+    def items(self) -> Iterator[Tuple[str, List[Any]]]:
+        return (self._entry(key) for key in self._values)
+
+    # ---------- Queries ----------
+    def _covering_keys(self, afi: int, network: int, length: int) -> Iterator[Tuple[int, int, int]]:
+        """Keys of the indexed prefixes containing `network/length`, longest first."""
+        bits = _BITS[afi]
+        values = self._values
+        for candidate in self._lengths[afi]:
+            if candidate > length:
+                continue
+            host = bits - candidate
+            key = (afi, network >> host << host, candidate)
+            if key in values:
+                yield key
+
+    def _longest_key(self, address: str) -> Optional[Tuple[int, int, int]]:
+        afi, network, length = parse_prefix(address)
+        return next(self._covering_keys(afi, network, length), None)
+
+    def longest_prefix(self, address: str) -> Optional[str]:
+        """Return the most specific prefix containing `address` (or a prefix), without its values."""
+        key = self._longest_key(address)
+        if key is None:
+            return None
+        return self._values[key] if self._sources is not None else format_prefix(*key)
+
+    def longest_match(self, address: str) -> Optional[Tuple[str, List[Any]]]:
+        """Return `(prefix, values)` for the most specific prefix containing `address` (or a prefix), or None."""
+        key = self._longest_key(address)
+        return self._entry(key) if key is not None else None
+
+    def longest_match_many(self, addresses: Iterable[str]) -> List[Optional[Tuple[str, List[Any]]]]:
+        """:meth:`longest_match` for many addresses, the values of each matched prefix being gathered once."""
+        entries: Dict[Optional[Tuple[int, int, int]], Optional[Tuple[str, List[Any]]]] = {None: None}
+        results = []
+        for address in addresses:
+            key = self._longest_key(address)
+            if key not in entries:
+                entries[key] = self._entry(key)
+            results.append(entries[key])
+        return results
+
+    def covering(self, prefix: str, strict: bool = False) -> List[Tuple[str, List[Any]]]:
+        """
+        Return the prefixes containing `prefix` (itself included unless
+        `strict`), from the least to the most specific.
+        """
+        afi, network, length = _key(prefix)
+        keys = [k for k in self._covering_keys(afi, network, length) if not (strict and k[2] == length)]
+        return [self._entry(k) for k in reversed(keys)]
+
+    def covered(self, prefix: str, strict: bool = False) -> List[Tuple[str, List[Any]]]:
+        """Return the prefixes inside `prefix` (itself included unless `strict`), in address order."""
+        afi, network, length = _key(prefix)
+        ordered = self._sorted[afi]
+        if ordered is None:
+            ordered = self._sorted[afi] = sorted((k[1], k[2]) for k in self._values if k[0] == afi)
+
+        end_network = network + (1 << (_BITS[afi] - length))
+        results = []
+        for i in range(bisect_left(ordered, (network, 0)), bisect_left(ordered, (end_network, 0))):
+            net, plen = ordered[i]
+            if plen > length or (plen == length and not strict):
+                results.append(self._entry((afi, net, plen)))
+        return results
+
+    def select(self, op: str, prefix: str) -> List[Tuple[str, List[Any]]]:
+        """
+        Apply a `prefix_filter` operator: `<<` (strictly more specific), `<<=`,
+        `>>` (strictly less specific), `>>=` or `=`.
+        """
+        if op == "<<":
+            return self.covered(prefix, strict=True)
+        if op == "<<=":
+            return self.covered(prefix)
+        if op == ">>":
+            return self.covering(prefix, strict=True)
+        if op == ">>=":
+            return self.covering(prefix)
+        if op == "=":
+            key = _key(prefix)
+            return [self._entry(key)] if key in self._values else []
+        raise ValueError(f"Unsupported prefix operator {op!r}, expected one of {PREFIX_OPERATORS}")
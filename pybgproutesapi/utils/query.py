@@ -1,8 +1,12 @@
+import asyncio
 import os
 import requests
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Callable, Iterable, Iterator, Tuple
 from ..constants import BASE_URL, API_VERSION
+from . import decoder
+from .helpers import fan_out
+from .shard import query_size, shard_params
 from .errors import (
     BGPAPIError,
     InvalidAPIKeyError,
@@ -10,7 +14,9 @@ from .errors import (
     BadRequestError,
     NotFoundError,
     ServerError,
-    handle_error_response
+    InvalidJSONResponse,
+    handle_error_response,
+    raise_for_status,
 )
 
 
@@ -23,26 +29,25 @@ def _csv(val: Optional[Union[List[Any], str]]) -> Optional[str]:
     return ",".join(map(str, val))
 
 
-def get(path: str, params: Dict[str, Any], details: bool = True, base_url :str=None, api_key :str=None) -> Any:
+def _api_key(api_key: Optional[str]) -> str:
     if api_key is None:
         api_key = os.getenv("BGP_API_KEY")
 
     if not api_key:
         raise EnvironmentError("Missing environment variable: BGP_API_KEY")
 
-    headers = {"x-api-key": api_key}
-    clean_params = {k: v for k, v in params.items() if v is not None}
+    return api_key
 
+
+def _url(path: str, base_url: Optional[str] = None) -> str:
     url = BASE_URL if base_url is None else base_url
-    response = requests.get(url + '/' + API_VERSION + path, headers=headers, params=clean_params, timeout=300)
+    return url.rstrip('/') + '/' + API_VERSION + path
 
-    try:
-        content = response.json()
-    except Exception:
-        raise requests.HTTPError(f"Invalid JSON response: {response.text}")
 
-    if not response.ok:
-        handle_error_response(response, content)
+def _unwrap(status: int, content: Any, details: bool) -> Any:
+    """Raise on API errors and return either the full envelope or its `data` field."""
+    if status >= 400:
+        raise_for_status(status, content)
 
     if "data" not in content:
         raise BGPAPIError("Missing 'data' field in API response.")
@@ -50,31 +55,116 @@ def get(path: str, params: Dict[str, Any], details: bool = True, base_url :str=N
     return content if details else content["data"]
 
 
-def post(path: str, json_payload: Dict[str, Any], details: bool = True, base_url :str=None, api_key :str=None) -> Any:
-    if api_key is None:
-        api_key = os.getenv("BGP_API_KEY")
-        
-    if not api_key:
-        raise EnvironmentError("Missing environment variable: BGP_API_KEY")
+def _decode(response: requests.Response, details: bool,
+            binary: Optional[Tuple[Tuple[str, ...], Callable[[bytes], Any]]] = None,
+            loads: Optional[Callable[[bytes], Any]] = None) -> Any:
+    """
+    Decode a response, using the `(media_types, decoder)` binary format if the
+    server chose it, else the JSON decoder `loads` (fastest installed by default).
+    """
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+    if binary is not None and content_type in binary[0]:
+        try:
+            content = binary[1](response.content)
+        except Exception:
+            raise InvalidJSONResponse(f"Invalid {content_type} response")
+        return _unwrap(response.status_code, content, details)
 
-    headers = {
-        "x-api-key": api_key,
-        "Content-Type": "application/json"
-    }
+    try:
+        # Decode the raw bytes directly, without building an intermediate str.
+        content = (loads or decoder.loads)(response.content)
+    except Exception:
+        raise InvalidJSONResponse(f"Invalid JSON response: {response.text}")
 
-    url = BASE_URL if base_url is None else base_url
-    response = requests.post(url + '/' + API_VERSION + path, headers=headers, json=json_payload, timeout=300)
+    return _unwrap(response.status_code, content, details)
+
+
+STREAM_CHUNK_SIZE = 1 << 16
 
+
+def _stream(response: requests.Response, rows: Callable[[Iterable[bytes]], Iterator[Any]]) -> Iterator[Any]:
+    """Feed the body of a streamed response to `rows`, closing the response once exhausted."""
     try:
-        content = response.json()
-    except Exception:
-        raise requests.HTTPError(f"Invalid JSON response: {response.text}")
+        yield from rows(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+    finally:
+        response.close()
 
-    if not response.ok:
-        handle_error_response(response, content)
 
-    if "data" not in content:
-        raise BGPAPIError("Missing 'data' field in API response.")
+def _resolve_client(client=None):
+    if client is None:
+        from ..client import default_client
+        client = default_client()
+    return client
 
-    return content if details else content["data"]
-    
\ No newline at end of file
+
+def get(path: str, params: Dict[str, Any], details: bool = True, base_url :str=None, api_key :str=None,
+        client=None, parse: Optional[Callable[[Any], Any]] = None, stream: Optional[Callable] = None,
+        cache_mode: str = "use") -> Any:
+    return _resolve_client(client).get(path, params, details, base_url=base_url, api_key=api_key, parse=parse,
+                                       stream=stream, cache_mode=cache_mode)
+
+
+def post(path: str, json_payload: Dict[str, Any], details: bool = True, base_url :str=None, api_key :str=None,
+         client=None, parse: Optional[Callable[[Any], Any]] = None, stream: Optional[Callable] = None,
+         cache_mode: str = "use") -> Any:
+    return _resolve_client(client).post(path, json_payload, details, base_url=base_url, api_key=api_key, parse=parse,
+                                        stream=stream, cache_mode=cache_mode)
+
+
+def _method(client, path: str, params: Dict[str, Any], base_url: Optional[str]) -> str:
+    """GET, unless the URL with its query string would be longer than the client's `max_url_bytes`."""
+    url = _url(path, base_url if base_url is not None else client.base_url)
+    return "POST" if len(url) + 1 + query_size(params) > client.max_url_bytes else "GET"
+
+
+def _combine(responses: List[Dict[str, Any]], params: Dict[str, Any], details: bool,
+             merge: Callable[[List[Any], Dict[str, Any]], Any], parse: Optional[Callable[[Any], Any]]) -> Any:
+    """Merge the envelopes of sub-requests into the result of the original query."""
+    envelope = {
+        "seconds": sum(response.get("seconds") or 0 for response in responses),
+        "bytes": sum(response.get("bytes") or 0 for response in responses),
+        "data": merge([response["data"] for response in responses], params),
+    }
+    result = envelope if details else envelope["data"]
+    return parse(result) if parse is not None else result
+
+
+def send(path: str, params: Dict[str, Any], details: bool = True, splits: Tuple[Tuple[str, ...], ...] = (),
+         merge: Optional[Callable[[List[Any], Dict[str, Any]], Any]] = None, base_url: str = None,
+         api_key: str = None, client=None, parse: Optional[Callable[[Any], Any]] = None,
+         stream: Optional[Callable] = None, cache_mode: str = "use") -> Any:
+    """
+    Send a query as GET, or as POST if its URL would exceed the client's
+    `max_url_bytes`.
+
+    If `merge` is given and the encoded parameters exceed the client's
+    `split_target_bytes`, the CSV values of the `splits` parameter groups are
+    partitioned into sub-requests of at most that size. They are sent
+    concurrently (each one as GET or POST by its own size) and their `data`
+    is combined with `merge(parts, params)`. Streamed queries are never split.
+    """
+    client = _resolve_client(client)
+    options = {"base_url": base_url, "api_key": api_key, "cache_mode": cache_mode}
+
+    shards = [params]
+    if merge is not None and stream is None:
+        shards = shard_params(params, splits, client.split_target_bytes)
+    if len(shards) == 1:
+        return client.request(_method(client, path, params, base_url), path, params, details, parse=parse,
+                              stream=stream, **options)
+
+    if asyncio.iscoroutinefunction(client.request):
+        async def _gather():
+            responses = await asyncio.gather(*(
+                client.request(_method(client, path, shard, base_url), path, shard, True, **options)
+                for shard in shards
+            ))
+            return _combine(list(responses), params, details, merge, parse)
+        return _gather()
+
+    def _query(index: int) -> Dict[str, Any]:
+        shard = shards[index]
+        return client.request(_method(client, path, shard, base_url), path, shard, True, **options)
+
+    responses: Dict[int, Dict[str, Any]] = dict(fan_out(_query, range(len(shards)), max_workers=client.split_workers))
+    return _combine([responses[i] for i in range(len(shards))], params, details, merge, parse)
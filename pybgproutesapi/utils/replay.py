@@ -0,0 +1,237 @@
+from bisect import bisect_left
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from .frame import _timestamp
+
+if TYPE_CHECKING:
+    from ..client import BGPRoutesClient
+
+VPKey = Tuple[str, str]
+Time = Union[str, float, datetime]
+
+
+class _VPLog:
+    """Routes of one VP per feed type, its updates, and how to undo the applied ones."""
+
+    __slots__ = ("feeds", "times", "rows", "undo", "pos")
+
+    def __init__(self):
+        self.feeds: Dict[int, Dict[str, list]] = {}
+        self.times: List[float] = []
+        self.rows: List[list] = []
+        # Route replaced by each applied update (None if there was none).
+        self.undo: List[Optional[list]] = []
+        self.pos = 0
+
+    def apply_until(self, end: float) -> None:
+        """Apply the updates with a timestamp before `end`."""
+        stop = bisect_left(self.times, end, lo=self.pos)
+        feeds, undo = self.feeds, self.undo
+        for i in range(self.pos, stop):
+            _, kind, prefix, aspath, community, aspa, rov, feed = self.rows[i][:8]
+            routes = feeds.get(feed)
+            if routes is None:
+                routes = feeds[feed] = {}
+            if kind == "W":
+                undo[i] = routes.pop(prefix, None)
+            else:
+                undo[i] = routes.get(prefix)
+                routes[prefix] = [aspath, community, aspa, rov, feed]
+        self.pos = stop
+
+    def revert_until(self, end: float) -> None:
+        """Undo the applied updates with a timestamp at or after `end`."""
+        stop = bisect_left(self.times, end, hi=self.pos)
+        feeds, undo = self.feeds, self.undo
+        for i in range(self.pos - 1, stop - 1, -1):
+            row = self.rows[i]
+            routes, previous = feeds[row[7]], undo[i]
+            if previous is None:
+                routes.pop(row[2], None)
+            else:
+                routes[row[2]] = previous
+        self.pos = stop
+
+    def extend(self, times: List[float], rows: List[list]) -> None:
+        """Add updates sorted by time, none of them before the applied ones."""
+        if self.times and times[0] < self.times[-1]:
+            # Interleaved with known updates: merge, known ones first for equal timestamps.
+            merged = sorted(zip(self.times + times, range(len(self.times) + len(times)), self.rows + rows))
+            self.times = [t for t, _, _ in merged]
+            self.rows = [row for _, _, row in merged]
+        else:
+            self.times.extend(times)
+            self.rows.extend(rows)
+        self.undo.extend([None] * len(times))
+
+
+class RibReplayer:
+    """
+    Rebuild the RIB of VPs at any time from one `rib()` snapshot and the
+    `updates()` that follow it.
+
+    The state starts as the snapshot at `time`. Moving to a later time
+    applies the updates in between (announcements replace the route of their
+    prefix and feed type, withdrawals remove it). BMP routes are kept per feed
+    type, so a VP exporting several feeds is replayed correctly.
+
+    Each applied update remembers the route it replaced, so moving back in
+    time undoes the updates in between. Reaching any time thus costs the
+    updates between the current time and the target, never a full-table
+    copy, and a checkpoint is only a timestamp to come back to.
+
+    :param rib: `data` of a `rib()` response, `{proto: {vp_id: {prefix: route}}}`.
+    :param time: Date of the snapshot (ISO 8601 string, epoch or datetime).
+    :param updates: Optional `data` of an `updates()` response starting at `time`.
+    """
+
+    def __init__(
+        self,
+        rib: Dict[str, Dict[str, Dict[str, list]]],
+        time: Time,
+        updates: Optional[Dict[str, Dict[str, List[list]]]] = None,
+    ):
+        self.start = _timestamp(time)
+        self.time = self.start
+        self.checkpoints: List[float] = []
+        self._vps: Dict[VPKey, _VPLog] = {}
+
+        for proto, vps in rib.items():
+            for vp_id, routes in (vps or {}).items():
+                log = self._log((proto, str(vp_id)))
+                for prefix, route in routes.items():
+                    feed = route[4] if len(route) > 4 else -1
+                    routes_of_feed = log.feeds.get(feed)
+                    if routes_of_feed is None:
+                        routes_of_feed = log.feeds[feed] = {}
+                    routes_of_feed[prefix] = route
+
+        if updates is not None:
+            self.add_updates(updates)
+
+    @classmethod
+    def from_api(
+        cls,
+        vps: List[Any],
+        start_date: str,
+        end_date: str,
+        client: Optional["BGPRoutesClient"] = None,
+        **kwargs,
+    ) -> "RibReplayer":
+        """
+        Fetch `rib(vps, start_date)` and `updates(vps, start_date, end_date)`
+        and return their replayer. Other keyword arguments (filters,
+        `return_*` options) are passed to both calls.
+        """
+        from ..endpoints.rib import rib
+        from ..endpoints.updates import updates
+
+        snapshot = rib(vps, start_date, client=client, **kwargs)
+        changes = updates(vps, start_date, end_date, chronological_order=True, client=client, **kwargs)
+        return cls(snapshot, start_date, changes)
+
+    def _log(self, key: VPKey) -> _VPLog:
+        log = self._vps.get(key)
+        if log is None:
+            log = self._vps[key] = _VPLog()
+        return log
+
+    # ---------- Updates ----------
+    def add_updates(self, updates: Dict[str, Dict[str, List[list]]]) -> None:
+        """
+        Add the `data` of an `updates()` response. Updates must not be older
+        than the snapshot; they can be added in any order and in several calls
+        (e.g. one per time window).
+        """
+        batches = []
+        for proto, vps in updates.items():
+            for vp_id, rows in (vps or {}).items():
+                if not rows:
+                    continue
+                times = [row[0] for row in rows]
+                if times != sorted(times):
+                    order = sorted(range(len(rows)), key=times.__getitem__)
+                    rows = [rows[i] for i in order]
+                    times = [times[i] for i in order]
+                if times[0] < self.start:
+                    raise ValueError(f"updates of {proto} VP {vp_id} start before the snapshot")
+                batches.append(((proto, str(vp_id)), times, rows))
+        if not batches:
+            return
+
+        # Updates must be inserted after the applied ones: step back before the earliest new one.
+        current = self.time
+        earliest = min(times[0] for _, times, _ in batches)
+        if earliest < current:
+            self.seek(earliest)
+        for key, times, rows in batches:
+            self._log(key).extend(times, rows)
+        self.seek(current)
+
+    @property
+    def end(self) -> float:
+        """Timestamp of the last known update (the snapshot time if there is none)."""
+        return max([log.times[-1] for log in self._vps.values() if log.times], default=self.start)
+
+    # ---------- Time travel ----------
+    def seek(self, time: Time) -> None:
+        """Move the state to `time`: exactly the updates strictly before `time` are applied."""
+        target = _timestamp(time)
+        if target < self.start:
+            raise ValueError("cannot replay before the snapshot")
+        for log in self._vps.values():
+            if target < self.time:
+                log.revert_until(target)
+            else:
+                log.apply_until(target)
+        self.time = target
+
+    def checkpoint(self) -> float:
+        """Remember the current time, to come back to it with :meth:`restore`."""
+        self.checkpoints.append(self.time)
+        return self.time
+
+    def restore(self, index: int = -1) -> None:
+        """Move back (or forward) to a checkpoint, by default the last one."""
+        self.seek(self.checkpoints[index])
+
+    # ---------- Results ----------
+    def rib(self, time: Optional[Time] = None, feed: Optional[int] = None) -> Dict[str, Dict[str, Dict[str, list]]]:
+        """
+        Return the RIB at `time` (default: the current time) in the form of
+        `rib()`. Per-VP dicts are copies, the route lists are shared. For BMP
+        VPs exporting several feed types, routes of all feeds are merged
+        unless `feed` selects one.
+        """
+        if time is not None:
+            self.seek(time)
+        data: Dict[str, Dict[str, Dict[str, list]]] = {"bgp": {}, "bmp": {}}
+        for (proto, vp_id), log in self._vps.items():
+            if feed is not None:
+                routes = dict(log.feeds.get(feed, {}))
+            elif len(log.feeds) == 1:
+                routes = dict(next(iter(log.feeds.values())))
+            else:
+                routes = {}
+                for feed_routes in log.feeds.values():
+                    routes.update(feed_routes)
+            data.setdefault(proto, {})[vp_id] = routes
+        return data
+
+    def ribs(self, times: Iterable[Time], feed: Optional[int] = None) -> Iterator[Tuple[float, Dict[str, Any]]]:
+        """Yield `(timestamp, rib)` for each of `times`, replaying only the updates in between."""
+        for time in sorted(_timestamp(t) for t in times):
+            yield time, self.rib(time, feed=feed)
+
+    def route(self, proto: str, vp_id: Union[int, str], prefix: str, feed: Optional[int] = None) -> Optional[list]:
+        """Return the current route of `prefix` at one VP, or None."""
+        log = self._vps.get((proto, str(vp_id)))
+        if log is None:
+            return None
+        for feed_type, routes in log.feeds.items():
+            if feed is None or feed == feed_type:
+                route = routes.get(prefix)
+                if route is not None:
+                    return route
+        return None
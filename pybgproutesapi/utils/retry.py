@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Sequence
+
+import requests
+
+from .errors import InvalidJSONResponse, ServerError
+
+
+class RetryPolicy:
+    """
+    Retry transient failures with exponential backoff and jitter, and
+    optionally hedge slow GET requests.
+
+    Server errors (5xx), invalid JSON bodies, timeouts and connection errors
+    are retried. Requests whose method is not in `idempotent_methods` are
+    only retried on connection errors, where the request never reached the
+    server. Every POST of this API is a read-only query, so POST is
+    idempotent by default. Rate limiting (429) is left to
+    :class:`AdaptiveConcurrency`.
+
+    With `hedge=True`, a GET that has not answered after the `hedge_quantile`
+    latency of its endpoint (measured over the last requests) is sent a second
+    time, and the first reply wins. The other request is cancelled if it is
+    still queued; one already sent runs to completion and its reply is
+    dropped. When both fail, the error of the second one to fail is raised,
+    chained to the first one (`__cause__`). Both run in a pool of
+    `hedge_workers` threads, shut down by :meth:`close` (called by the
+    client's `close()`).
+
+    :param max_retries: Default number of retries per request.
+    :param backoff: Base delay in seconds, doubled at every retry.
+    :param max_backoff: Upper bound of the delay between two attempts.
+    :param jitter: If true, sleep a random duration in [0, delay] ("full jitter").
+    :param budgets: Per-endpoint number of retries, e.g. `{"/updates": 1}`.
+    :param idempotent_methods: HTTP methods that are safe to send again.
+    :param hedge: Enable hedged GET requests.
+    :param hedge_quantile: Latency quantile after which a GET is hedged.
+    :param hedge_delay: Fixed hedging delay in seconds instead of the measured quantile.
+    :param hedge_min_samples: Number of latency samples needed before hedging.
+    :param hedge_workers: Maximum number of threads running hedged requests.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        jitter: bool = True,
+        budgets: Optional[Dict[str, int]] = None,
+        idempotent_methods: Sequence[str] = ("GET", "POST"),
+        hedge: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_delay: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        hedge_workers: int = 8,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.budgets = {k if k.startswith('/') else '/' + k: v for k, v in (budgets or {}).items()}
+        self.idempotent_methods = {m.upper() for m in idempotent_methods}
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_workers = hedge_workers
+
+        self._latencies: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    # ---------- Retries ----------
+    def retries_for(self, path: str) -> int:
+        return self.budgets.get(path, self.max_retries)
+
+    def delay(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (starting at 0)."""
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    def is_retryable(self, method: str, exc: BaseException) -> bool:
+        if isinstance(exc, requests.ConnectionError):
+            return True
+        if method.upper() not in self.idempotent_methods:
+            return False
+        return isinstance(exc, (ServerError, InvalidJSONResponse, requests.Timeout))
+
+    def call(self, method: str, path: str, fn: Callable[[], Any], hedge: bool = True) -> Any:
+        """Run `fn` (one attempt of a `method` request to `path`), retrying it on transient failures."""
+        hedge = hedge and self.hedge and method.upper() == "GET"
+        attempt = 0
+        while True:
+            try:
+                if hedge:
+                    return self._hedged(path, fn)
+                return self._timed(path, fn)
+            except Exception as e:
+                if attempt >= self.retries_for(path) or not self.is_retryable(method, e):
+                    raise
+            time.sleep(self.delay(attempt))
+            attempt += 1
+
+    # ---------- Hedging ----------
+    def _timed(self, path: str, fn: Callable[[], Any]) -> Any:
+        start = time.monotonic()
+        result = fn()
+        elapsed = time.monotonic() - start
+        with self._lock:
+            self._latencies.setdefault(path, deque(maxlen=200)).append(elapsed)
+        return result
+
+    def latency_quantile(self, path: str) -> Optional[float]:
+        """Return the `hedge_quantile` latency of `path`, or None without enough samples."""
+        with self._lock:
+            samples = sorted(self._latencies.get(path, ()))
+        if len(samples) < self.hedge_min_samples:
+            return None
+        return samples[int(self.hedge_quantile * (len(samples) - 1))]
+
+    def _hedged(self, path: str, fn: Callable[[], Any]) -> Any:
+        delay = self.hedge_delay if self.hedge_delay is not None else self.latency_quantile(path)
+        if delay is None:
+            return self._timed(path, fn)
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.hedge_workers,
+                                                    thread_name_prefix="bgproutes-hedge")
+            executor = self._executor
+        answered = threading.Event()
+
+        def attempt():
+            # A hedge still queued when the other request answers is not sent.
+            if answered.is_set():
+                raise CancelledError()
+            result = self._timed(path, fn)
+            answered.set()
+            return result
+
+        futures = [executor.submit(attempt)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            futures.append(executor.submit(attempt))
+
+        errors = []
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+                errors.append(future.exception())
+        if len(errors) > 1:
+            raise errors[1] from errors[0]
+        raise errors[0]
+
+    def close(self) -> None:
+        """Shut down the hedging threads, without waiting for the requests in flight."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,183 @@
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote_plus, urlencode
+
+# GET requests whose URL would be longer than this are sent as POST: servers
+# and proxies commonly cap the request line at 4 to 8 KiB.
+MAX_URL_BYTES = 4000
+
+# A request whose encoded parameters are larger than this is split into
+# sub-requests of about this size, sent concurrently.
+SPLIT_TARGET_BYTES = 64 * 1024
+
+# Maximum number of sub-requests a query is split into.
+MAX_SHARDS = 256
+
+# Groups of parameters that can be split. The values of the parameters of
+# one group are partitioned together, so that each value is in exactly one
+# sub-request (e.g. a VP is either in the BGP or in the BMP list).
+VP_GROUP = ("vp_bgp_ids", "vp_bmp_ids")
+RIB_SPLITS = (VP_GROUP, ("prefix_exact_match",), ("aspath_exact_match",))
+UPDATES_SPLITS = RIB_SPLITS
+TOPOLOGY_SPLITS = (VP_GROUP,)
+# A BMP row holds two AS paths (pre and post policy), so only prefixes are disjoint between sub-requests.
+BMP_RIB_SPLITS = (("prefix_exact_match",),)
+
+# Encoded size of the "," between CSV values.
+_COMMA = len(quote_plus(","))
+
+
+def query_size(params: Dict[str, Any]) -> int:
+    """Length of the query string `params` is encoded to in a GET URL (None values are not sent)."""
+    return len(urlencode({k: v for k, v in params.items() if v is not None}))
+
+
+def _values(params: Dict[str, Any], names: Sequence[str]) -> List[Tuple[str, str]]:
+    return [(name, value) for name in names if params.get(name) is not None
+            for value in str(params[name]).split(",") if value != ""]
+
+
+def _partition(params: Dict[str, Any], names: Sequence[str], budget: int) -> List[Dict[str, Any]]:
+    """Split the values of `names` into sub-requests whose values take at most `budget` encoded bytes."""
+    chunks: List[List[Tuple[str, str]]] = [[]]
+    size = 0
+    for name, value in _values(params, names):
+        cost = len(quote_plus(value)) + _COMMA
+        if chunks[-1] and size + cost > budget:
+            chunks.append([])
+            size = 0
+        chunks[-1].append((name, value))
+        size += cost
+
+    shards = []
+    for chunk in chunks:
+        shard = dict(params)
+        for name in names:
+            values = [value for n, value in chunk if n == name]
+            shard[name] = ",".join(values) if values else None
+        shards.append(shard)
+    return shards
+
+
+def _group_overhead(names: Sequence[str]) -> int:
+    """Upper bound of the encoded bytes a group adds to a query besides its values ("name=" and "&" per name)."""
+    return sum(len(quote_plus(name)) + 2 for name in names)
+
+
+def shard_params(params: Dict[str, Any], splits: Sequence[Sequence[str]],
+                 target: Optional[int] = SPLIT_TARGET_BYTES,
+                 max_shards: int = MAX_SHARDS) -> List[Dict[str, Any]]:
+    """
+    Split `params` into sub-requests of at most `target` encoded bytes by
+    partitioning the CSV values of the parameter groups of `splits`. Every
+    combination of the partitions of different groups is queried once.
+
+    The groups share the bytes left by the other parameters: the group with
+    the largest parts is split further until the parts of all groups fit
+    together, so small groups (e.g. a few VPs) stay whole. Return `[params]`
+    if no split is needed.
+
+    :raises ValueError: If the parameters cannot fit in `target` bytes or
+        would need more than `max_shards` sub-requests.
+    """
+    if target is None or query_size(params) <= target:
+        return [params]
+
+    groups = [tuple(names) for names in splits if _values(params, names)]
+    split_names = {name for names in groups for name in names}
+    available = target - query_size({k: v for k, v in params.items() if k not in split_names})
+
+    costs = {names: [len(quote_plus(value)) + _COMMA for _, value in _values(params, names)] for names in groups}
+    totals = {names: sum(costs[names]) for names in groups}
+    largest = {names: max(costs[names]) for names in groups}
+    overheads = {names: _group_overhead(names) for names in groups}
+
+    def _budget(names: Tuple[str, ...], parts: int) -> int:
+        # Next-fit packing fills each part above budget - largest value, so at most `parts` parts are used.
+        return -(-totals[names] // parts) + largest[names]
+
+    parts = {names: 1 for names in groups}
+    while sum(_budget(names, parts[names]) + overheads[names] for names in groups) > available:
+        splittable = [names for names in groups if parts[names] < len(costs[names])]
+        if not splittable:
+            raise ValueError(f"query parameters cannot be split into sub-requests of {target} bytes")
+        names = max(splittable, key=lambda names: totals[names] / parts[names])
+        parts[names] += 1
+        count = 1
+        for n in parts.values():
+            count *= n
+        if count > max_shards:
+            raise ValueError(f"query would be split into more than {max_shards} sub-requests of {target} bytes; "
+                             f"raise split_target_bytes or send fewer values")
+
+    shards = [params]
+    for names in groups:
+        if parts[names] == 1:
+            continue
+        budget = _budget(names, parts[names])
+        shards = [part for shard in shards for part in _partition(shard, names, budget)]
+    return shards
+
+
+# ---------- Merging sub-responses ----------
+def _merge_vps(parts: List[Dict[str, Any]], combine: Callable[[Any, Any], Any]) -> Dict[str, Any]:
+    merged: Dict[str, Dict[Any, Any]] = {"bgp": {}, "bmp": {}}
+    for part in parts:
+        for proto, vps in part.items():
+            merged_proto = merged.setdefault(proto, {})
+            for vp_id, value in (vps or {}).items():
+                merged_proto[vp_id] = value if vp_id not in merged_proto else combine(merged_proto[vp_id], value)
+    return merged
+
+
+def _combine_rib(a: Any, b: Any) -> Any:
+    if isinstance(a, dict):
+        # Routes of disjoint prefix or AS path sets.
+        return {**a, **b}
+    return a + b
+
+
+def merge_rib(parts: List[Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge the `data` of `rib()` sub-responses: routes are united and counts summed, per VP."""
+    return _merge_vps(parts, _combine_rib)
+
+
+def merge_updates(parts: List[Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Merge the `data` of `updates()` sub-responses. Per VP, rows are merged in
+    `chronological_order` and truncated to `max_updates_to_return`, and
+    counts are summed per update type.
+    """
+    reverse = params.get("chronological_order") in (False, "false", "False")
+    limit = params.get("max_updates_to_return")
+
+    def combine(a: Any, b: Any) -> Any:
+        if isinstance(a, dict):
+            return {kind: a.get(kind, 0) + b.get(kind, 0) for kind in {**a, **b}}
+        rows = list(heapq.merge(a, b, key=lambda row: row[0], reverse=reverse))
+        return rows[:int(limit)] if limit is not None else rows
+
+    return _merge_vps(parts, combine)
+
+
+def merge_topology(parts: List[Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Merge the `data` of `topology()` sub-responses: links and AS paths are united, in order of appearance."""
+    merged: Dict[str, Any] = {}
+    seen: Dict[str, set] = {}
+    for part in parts:
+        for key, values in part.items():
+            if not isinstance(values, list):
+                merged.setdefault(key, values)
+                continue
+            kept, known = merged.setdefault(key, []), seen.setdefault(key, set())
+            for value in values:
+                marker = tuple(value) if isinstance(value, list) else value
+                if marker not in known:
+                    known.add(marker)
+                    kept.append(value)
+    return merged
+
+
+def merge_rows(parts: List[List[Any]], params: Dict[str, Any]) -> List[Any]:
+    """Merge sub-responses made of rows (e.g. `bmp_rib_with_status()`) by concatenation."""
+    return [row for part in parts for row in part]
@@ -0,0 +1,154 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Tuple
+
+from .errors import BGPAPIError
+
+_WS = " \t\n\r"
+_NUMBER_TAIL = "0123456789.eE+-"
+
+
+class JSONStream:
+    """
+    Minimal pull parser over a JSON document delivered as byte chunks.
+
+    The caller walks containers with `object_keys()`/`array_items()` and
+    decodes leaves with `value()`. Only the current leaf and the unread tail
+    of the last chunk are held in memory, so the memory footprint does not
+    depend on the size of the document.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, returning False at end of input."""
+        if self._eof:
+            return False
+        # Drop what has already been consumed.
+        self._buf = self._buf[self._pos:]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buf += text
+                return True
+        self._buf += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _error(self, msg: str):
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of input)."""
+        while True:
+            buf, pos = self._buf, self._pos
+            n = len(buf)
+            while pos < n and buf[pos] in _WS:
+                pos += 1
+            self._pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and return the complete JSON value at the cursor."""
+        self.peek()
+        while True:
+            try:
+                val, end = self._raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number cut by a chunk boundary ("1." or "12") decodes as a shorter
+            # number: make sure it is followed by a delimiter before accepting it.
+            if (type(val) in (int, float)
+                    and (end == len(self._buf) or self._buf[end] in _NUMBER_TAIL)
+                    and self._fill()):
+                continue
+            self._pos = end
+            return val
+
+    def object_keys(self) -> Iterator[str]:
+        """Iterate over the keys of the object at the cursor.
+
+        After each key, the cursor is on the corresponding value, which the
+        caller must consume before resuming the iteration.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self._expect(":")
+            yield key
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter")
+
+    def array_items(self) -> Iterator[None]:
+        """Iterate over the elements of the array at the cursor (same contract as `object_keys`)."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise self._error("Expecting ',' delimiter")
+
+
+def _iter_vps(stream: JSONStream) -> Iterator[Tuple[str, str]]:
+    """Walk the `{"data": {proto: {vp_id: ...}}}` envelope, stopping on each VP's entries."""
+    found = False
+    for key in stream.object_keys():
+        if key != "data":
+            stream.value()
+            continue
+        found = True
+        for proto in stream.object_keys():
+            if stream.peek() == "n":
+                stream.value()
+                continue
+            for vp_id in stream.object_keys():
+                yield proto, vp_id
+
+    if not found:
+        raise BGPAPIError("Missing 'data' field in API response.")
+
+
+def iter_updates_rows(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str, list]]:
+    """Incrementally decode an `/updates` response into `(proto, vp_id, update_row)` tuples."""
+    stream = JSONStream(chunks)
+    for proto, vp_id in _iter_vps(stream):
+        for _ in stream.array_items():
+            yield proto, vp_id, stream.value()
+
+
+def iter_rib_rows(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str, str, list]]:
+    """Incrementally decode a `/rib` response into `(proto, vp_id, prefix, route)` tuples."""
+    stream = JSONStream(chunks)
+    for proto, vp_id in _iter_vps(stream):
+        for prefix in stream.object_keys():
+            yield proto, vp_id, prefix, stream.value()
@@ -0,0 +1,217 @@
+from array import array
+from itertools import compress
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .intern import InternPool, aspath_pool, community_pool
+from .pathmatch import path_matcher
+from .prefix import format_prefix, parse_prefix
+
+# Code stored in the int8 status columns when the API returned no value.
+MISSING = -128
+
+_MASK64 = (1 << 64) - 1
+
+
+def _code(value: Any) -> int:
+    return MISSING if value is None else int(value)
+
+
+def _value(code: int) -> Optional[int]:
+    return None if code == MISSING else code
+
+
+class RibTable:
+    """
+    Columnar form of a `/rib` response.
+
+    Each route is one row of parallel typed arrays instead of a dict entry
+    holding a list of strings:
+
+    - `vp`: index into `vps`, the list of `(proto, vp_id)` pairs;
+    - `afi`, `net_hi`, `net_lo`, `length`: prefix as address family,
+      network integer (split in two 64-bit halves) and prefix length;
+    - `path`, `community`: ids into the `paths` and `communities`
+      :class:`InternPool`, where each distinct AS path and community string
+      is stored once (and parsed once, see :meth:`aspath`);
+    - `aspa`, `rov`, `feed`: int8 status codes (`MISSING` when absent).
+
+    Build it with :meth:`from_response` or ``rib(..., as_table=True)``.
+    """
+
+    _COLUMNS = (("vp", "I"), ("afi", "B"), ("net_hi", "Q"), ("net_lo", "Q"), ("length", "B"),
+                ("path", "I"), ("community", "I"), ("aspa", "b"), ("rov", "b"), ("feed", "b"))
+
+    def __init__(self, vps: Optional[List[Tuple[str, str]]] = None, paths: Optional[InternPool] = None,
+                 communities: Optional[InternPool] = None):
+        self.vps: List[Tuple[str, str]] = vps if vps is not None else []
+        self.paths = paths if paths is not None else aspath_pool()
+        self.communities = communities if communities is not None else community_pool()
+        for name, typecode in self._COLUMNS:
+            setattr(self, name, array(typecode))
+
+    # ---------- Construction ----------
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, str, list]], paths: Optional[InternPool] = None,
+                  communities: Optional[InternPool] = None) -> "RibTable":
+        """
+        Build a table from `(proto, vp_id, prefix, route)` rows, e.g. a streamed
+        `rib()` response. AS paths and communities are added to the given
+        pools (new ones by default), e.g. the pools of a client.
+        """
+        table = cls(paths=paths, communities=communities)
+        vp_ids: Dict[Tuple[str, str], int] = {}
+        prefixes: Dict[str, Tuple[int, int, int]] = {}
+
+        vp_col, afi_col, hi_col, lo_col, len_col = table.vp, table.afi, table.net_hi, table.net_lo, table.length
+        path_col, comm_col, aspa_col, rov_col, feed_col = (table.path, table.community, table.aspa,
+                                                           table.rov, table.feed)
+        intern_path, intern_community = table.paths.intern, table.communities.intern
+
+        for proto, vp_id, prefix, route in rows:
+            key = (proto, vp_id)
+            vp = vp_ids.get(key)
+            if vp is None:
+                vp = vp_ids[key] = len(table.vps)
+                table.vps.append(key)
+
+            parsed = prefixes.get(prefix)
+            if parsed is None:
+                parsed = prefixes[prefix] = parse_prefix(prefix)
+            afi, network, length = parsed
+
+            if not isinstance(route, list):
+                route = [route]
+            route = route + [None] * (5 - len(route))
+            aspath, community, aspa, rov, feed = route[:5]
+
+            vp_col.append(vp)
+            afi_col.append(afi)
+            hi_col.append(network >> 64)
+            lo_col.append(network & _MASK64)
+            len_col.append(length)
+            path_col.append(intern_path(aspath))
+            comm_col.append(intern_community(community))
+            aspa_col.append(_code(aspa))
+            rov_col.append(_code(rov))
+            feed_col.append(_code(feed))
+
+        return table
+
+    @classmethod
+    def from_response(cls, data: Dict[str, Dict[str, Dict[str, list]]], paths: Optional[InternPool] = None,
+                      communities: Optional[InternPool] = None) -> "RibTable":
+        """Build a table from the `{proto: {vp_id: {prefix: route}}}` form returned by `rib()`."""
+        return cls.from_rows(
+            ((proto, vp_id, prefix, route)
+             for proto, vps in data.items() if vps
+             for vp_id, entries in vps.items()
+             for prefix, route in entries.items()),
+            paths, communities,
+        )
+
+    # ---------- Access ----------
+    def __len__(self) -> int:
+        return len(self.vp)
+
+    def prefix(self, i: int) -> str:
+        return format_prefix(self.afi[i], (self.net_hi[i] << 64) | self.net_lo[i], self.length[i])
+
+    def route(self, i: int) -> list:
+        return [self.paths[self.path[i]], self.communities[self.community[i]],
+                _value(self.aspa[i]), _value(self.rov[i]), _value(self.feed[i])]
+
+    def aspath(self, i: int) -> Tuple[Any, ...]:
+        """AS path of row `i` as a tuple of ASNs, parsed once per distinct path."""
+        return self.paths.parsed(self.path[i])
+
+    def row(self, i: int) -> Tuple[str, str, str, list]:
+        """Return row `i` as `(proto, vp_id, prefix, route)`."""
+        proto, vp_id = self.vps[self.vp[i]]
+        return proto, vp_id, self.prefix(i), self.route(i)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, str, list]]:
+        return (self.row(i) for i in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns (the interned strings are not counted)."""
+        return sum(getattr(self, name).itemsize * len(getattr(self, name)) for name, _ in self._COLUMNS)
+
+    # ---------- Selection ----------
+    def take(self, indices: Iterable[int]) -> "RibTable":
+        """Return a new table holding the given rows (sharing the VP and string lists)."""
+        table = RibTable(self.vps, self.paths, self.communities)
+        indices = list(indices)
+        for name, _ in self._COLUMNS:
+            src, dst = getattr(self, name), getattr(table, name)
+            dst.extend(src[i] for i in indices)
+        return table
+
+    def mask(
+        self,
+        vps: Optional[Iterable[Tuple[str, str]]] = None,
+        afi: Optional[int] = None,
+        path: Optional[Callable[[Optional[str]], bool]] = None,
+        community: Optional[Callable[[Optional[str]], bool]] = None,
+        aspa: Optional[Sequence[int]] = None,
+        rov: Optional[Sequence[int]] = None,
+        feed: Optional[Sequence[int]] = None,
+        aspath_regexp: Optional[str] = None,
+    ) -> List[bool]:
+        """
+        Return one boolean per row telling whether it matches every given
+        condition. `path` and `community` are predicates, evaluated once per
+        distinct string; `vps` is a collection of `(proto, vp_id)` pairs;
+        status conditions are collections of accepted codes. `aspath_regexp`
+        has the syntax of the API argument (see :meth:`path_mask`).
+        """
+        if aspath_regexp is not None:
+            keep = [bool(hit) for hit in self.path_mask(aspath_regexp)]
+        else:
+            keep = [True] * len(self)
+
+        def narrow(column: array, accepted) -> None:
+            for i, code in enumerate(column):
+                if keep[i] and code not in accepted:
+                    keep[i] = False
+
+        if vps is not None:
+            wanted = {(proto, str(vp_id)) for proto, vp_id in vps}
+            narrow(self.vp, {i for i, key in enumerate(self.vps) if key in wanted})
+        if afi is not None:
+            narrow(self.afi, {afi})
+        if path is not None:
+            narrow(self.path, {i for i, p in enumerate(self.paths) if path(p)})
+        if community is not None:
+            narrow(self.community, {i for i, c in enumerate(self.communities) if community(c)})
+        for column, accepted in ((self.aspa, aspa), (self.rov, rov), (self.feed, feed)):
+            if accepted is not None:
+                narrow(column, {_code(code) for code in accepted})
+        return keep
+
+    def path_mask(self, aspath_regexp: str) -> Any:
+        """
+        Return, for each row, whether its AS path matches `aspath_regexp`.
+        The pattern is evaluated once per distinct path of `paths` and the
+        result is cached per pattern (see :class:`PathMatcher`).
+        """
+        return path_matcher(self.paths).mask(aspath_regexp, self.path)
+
+    def where(self, **conditions: Any) -> "RibTable":
+        """Return the rows matching the conditions of :meth:`mask`."""
+        return self.take(compress(range(len(self)), self.mask(**conditions)))
+
+    def group_by_vp(self) -> Dict[Tuple[str, str], "RibTable"]:
+        """Split the table into one table per `(proto, vp_id)`."""
+        groups: Dict[int, List[int]] = {}
+        for i, vp in enumerate(self.vp):
+            groups.setdefault(vp, []).append(i)
+        return {self.vps[vp]: self.take(indices) for vp, indices in groups.items()}
+
+    # ---------- Conversion ----------
+    def to_dict(self) -> Dict[str, Dict[str, Dict[str, list]]]:
+        """Convert back to the `{proto: {vp_id: {prefix: route}}}` form of `rib()`."""
+        data: Dict[str, Dict[str, Dict[str, list]]] = {"bgp": {}, "bmp": {}}
+        for proto, vp_id, prefix, route in self:
+            data.setdefault(proto, {}).setdefault(vp_id, {})[prefix] = route
+        return data
@@ -1,29 +1,138 @@
 from __future__ import annotations
-from dataclasses import dataclass
 from typing import Optional, List, Any, Dict
 
-@dataclass
+_UNSET = object()
+
+
+class _Lazy:
+    """
+    Attribute read from the raw API item on first access.
+
+    History and metadata fields can be much larger than the rest of a VP,
+    and most scripts never look at them: only these fields of the API item
+    are kept, in a small dict, until used. Each one is then moved to the
+    object, and the dict is dropped once empty.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+
+    def __set_name__(self, owner, name):
+        self.slot = "_" + name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.slot)
+        if value is _UNSET:
+            item = obj._item
+            value = item.pop(self.key, None) if item is not None else None
+            if not item:
+                obj._item = None
+            setattr(obj, self.slot, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, value)
+
+
 class VP:
-    unique_id: int
-    ip: str
-    asn: int
-    source: Optional[str] = None
-    rib_size_v4: Optional[int] = None
-    rib_size_v6: Optional[int] = None
-    country: Optional[str] = None
-    org_name: Optional[str] = None
-    org_country: Optional[str] = None
-    ixp_id: Optional[int] = None
-    ixp_rs_ip: Optional[str] = None
-    peering_protocol: Optional[str] = None
-    status: Optional[Any] = None
-    status_since: Optional[Any] = None
-    status_history: Optional[Any] = None
-    uptime_intervals: Optional[Any] = None
-    rib_history: Optional[Any] = None
-    rib_status: Optional[Any] = None
-    metadata: Optional[Any] = None
-    
+    __slots__ = (
+        "unique_id", "ip", "asn", "source", "rib_size_v4", "rib_size_v6", "country", "org_name",
+        "org_country", "ixp_id", "ixp_rs_ip", "peering_protocol", "status", "status_since",
+        "_status_history", "_uptime_intervals", "_rib_history", "_rib_status", "_metadata", "_item",
+    )
+
+    # Constructor arguments, in positional order.
+    _FIELDS = (
+        "unique_id", "ip", "asn", "source", "rib_size_v4", "rib_size_v6", "country", "org_name",
+        "org_country", "ixp_id", "ixp_rs_ip", "peering_protocol", "status", "status_since",
+        "status_history", "uptime_intervals", "rib_history", "rib_status", "metadata",
+    )
+
+    # Keys of the API item read on first access.
+    _LAZY_KEYS = ("status_history", "uptime_intervals", "rib_history", "rib_status", "metadata")
+
+    status_history = _Lazy("status_history")
+    uptime_intervals = _Lazy("uptime_intervals")
+    rib_history = _Lazy("rib_history")
+    rib_status = _Lazy("rib_status")
+    metadata = _Lazy("metadata")
+
+    def __init__(
+        self,
+        unique_id: int,
+        ip: str,
+        asn: int,
+        source: Optional[str] = None,
+        rib_size_v4: Optional[int] = None,
+        rib_size_v6: Optional[int] = None,
+        country: Optional[str] = None,
+        org_name: Optional[str] = None,
+        org_country: Optional[str] = None,
+        ixp_id: Optional[int] = None,
+        ixp_rs_ip: Optional[str] = None,
+        peering_protocol: Optional[str] = None,
+        status: Optional[Any] = None,
+        status_since: Optional[Any] = None,
+        status_history: Optional[Any] = None,
+        uptime_intervals: Optional[Any] = None,
+        rib_history: Optional[Any] = None,
+        rib_status: Optional[Any] = None,
+        metadata: Optional[Any] = None,
+    ):
+        self.unique_id = unique_id
+        self.ip = ip
+        self.asn = asn
+        self.source = source
+        self.rib_size_v4 = rib_size_v4
+        self.rib_size_v6 = rib_size_v6
+        self.country = country
+        self.org_name = org_name
+        self.org_country = org_country
+        self.ixp_id = ixp_id
+        self.ixp_rs_ip = ixp_rs_ip
+        self.peering_protocol = peering_protocol
+        self.status = status
+        self.status_since = status_since
+        self._status_history = status_history
+        self._uptime_intervals = uptime_intervals
+        self._rib_history = rib_history
+        self._rib_status = rib_status
+        self._metadata = metadata
+        self._item = None
+
+    def _from_item(self, it: Dict[str, Any]) -> None:
+        """Fill the common fields from one `/vantage_points` item in a single pass."""
+        get = it.get
+        self.unique_id = int(it["id"])
+        self.ip = str(get("ip"))
+        self.asn = int(get("asn"))
+        self.source = get("source")
+        self.rib_size_v4 = get("rib_size_v4")
+        self.rib_size_v6 = get("rib_size_v6")
+        self.country = get("country")
+        self.org_name = get("org_name")
+        self.org_country = get("org_country")
+        self.ixp_id = get("ixp_id")
+        self.ixp_rs_ip = get("ixp_rs_ip")
+        self.status = get("status")
+        self.status_since = get("status_since")
+        lazy = {key: it[key] for key in self._LAZY_KEYS if it.get(key) is not None}
+        unset = _UNSET if lazy else None
+        self._status_history = self._uptime_intervals = self._rib_history = unset
+        self._rib_status = self._metadata = unset
+        self._item = lazy or None
+
+    # ---------- Pickling (slots and lazy fields) ----------
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self._FIELDS}
+
+    def __setstate__(self, state):
+        self._item = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def __eq__(self, other):
         if not isinstance(other, VP):
             return False
@@ -59,42 +168,95 @@ class VP:
         return self.__str__()
 
 
-@dataclass(eq=False)
 class VPBGP(VP):
-    status: str = None
-    status_since: str = None
-    status_history: List[Any] = None
-    uptime_intervals: List[Any] = None
+    __slots__ = ()
 
-    def __post_init__(self):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.peering_protocol = "bgp"
 
+    @classmethod
+    def from_item(cls, it: Dict[str, Any]) -> "VPBGP":
+        """Build a VP from one `bgp` item of a `/vantage_points` response."""
+        vp = cls.__new__(cls)
+        vp._from_item(it)
+        vp.peering_protocol = "bgp"
+        return vp
+
     def _get_comparison_key(self):
         return (self.ip,)
 
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
 
-@dataclass(eq=False)
 class VPBMP(VP):
-    peer_id: Optional[int] = None
-    bmp_parent_org_name: str = None
-    bmp_parent_asn: int = None
-    bmp_parent_asn_country: int = None
-    bmp_parent_ip: str = None
-    bmp_parent_ip_country: str = None
-    bmp_feed_types: List[int] = None
-    status: Dict[str] = None
-    status_since: Dict[str] = None
-    status_history: Dict[Any] = None
-    uptime_intervals: Dict[Any] = None
-    rib_size_v4_per_feed: Dict[Any] = None
-    rib_size_v6_per_feed: Dict[Any] = None
-
-    # This is just an informational variable used within the code for optimizations but not given to the user.
-    bmp_feed_types_all: List[int] = None
-
-    def __post_init__(self):
+    __slots__ = (
+        "peer_id", "bmp_parent_org_name", "bmp_parent_asn", "bmp_parent_asn_country", "bmp_parent_ip",
+        "bmp_parent_ip_country", "bmp_feed_types", "rib_size_v4_per_feed", "rib_size_v6_per_feed",
+        # This is just an informational variable used within the code for optimizations but not given to the user.
+        "bmp_feed_types_all",
+    )
+
+    _FIELDS = VP._FIELDS + __slots__
+
+    def __init__(
+        self,
+        *args,
+        peer_id: Optional[int] = None,
+        bmp_parent_org_name: str = None,
+        bmp_parent_asn: int = None,
+        bmp_parent_asn_country: int = None,
+        bmp_parent_ip: str = None,
+        bmp_parent_ip_country: str = None,
+        bmp_feed_types: List[int] = None,
+        rib_size_v4_per_feed: Dict[Any] = None,
+        rib_size_v6_per_feed: Dict[Any] = None,
+        bmp_feed_types_all: List[int] = None,
+        **kwargs,
+    ):
+        # Positional arguments beyond the common fields follow the order of __slots__.
+        extra = args[len(VP._FIELDS):]
+        super().__init__(*args[:len(VP._FIELDS)], **kwargs)
+        self.peer_id = peer_id
+        self.bmp_parent_org_name = bmp_parent_org_name
+        self.bmp_parent_asn = bmp_parent_asn
+        self.bmp_parent_asn_country = bmp_parent_asn_country
+        self.bmp_parent_ip = bmp_parent_ip
+        self.bmp_parent_ip_country = bmp_parent_ip_country
+        self.bmp_feed_types = bmp_feed_types
+        self.rib_size_v4_per_feed = rib_size_v4_per_feed
+        self.rib_size_v6_per_feed = rib_size_v6_per_feed
+        self.bmp_feed_types_all = bmp_feed_types_all
+        for name, value in zip(VPBMP.__slots__, extra):
+            setattr(self, name, value)
         self.peering_protocol = "bmp"
 
+    @classmethod
+    def from_item(cls, it: Dict[str, Any]) -> "VPBMP":
+        """Build a VP from one `bmp` item of a `/vantage_points` response."""
+        vp = cls.__new__(cls)
+        vp._from_item(it)
+        vp.peering_protocol = "bmp"
+
+        # BMP-specific info can be nested or flat depending on your API
+        bmp_info = it.get("bmp_info") or {}
+        get = bmp_info.get
+        vp.peer_id = it.get("peer_id", {})
+        vp.ixp_rs_ip = vp.ixp_rs_ip or get("ixp_rs_ip")
+        vp.bmp_parent_org_name = get("parent_org_name")
+        vp.bmp_parent_asn = get("parent_asn")
+        vp.bmp_parent_asn_country = get("parent_asn_country")
+        vp.bmp_parent_ip = get("parent_ip")
+        vp.bmp_parent_ip_country = get("parent_ip_country")
+        feed_types = get("feed_types")
+        vp.bmp_feed_types = [int(x) for x in feed_types] if feed_types else []
+        vp.rib_size_v4_per_feed = get("rib_size_v4_per_feed")
+        vp.rib_size_v6_per_feed = get("rib_size_v6_per_feed")
+        vp.bmp_feed_types_all = None
+        return vp
+
     def _get_comparison_key(self):
         return (self.ip, self.asn, self.bmp_parent_ip, self.bmp_parent_asn, tuple(sorted(self.bmp_feed_types or [])))
 
@@ -10,6 +10,14 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "numpy": ["numpy>=1.20"],
+        "compression": ["urllib3[brotli,zstd]>=2"],
+        "msgpack": ["msgpack>=1.0"],
+        "cbor": ["cbor2>=5"],
+        "orjson": ["orjson>=3"],
+    },
     python_requires=">=3.7",
     classifiers=[
         "Programming Language :: Python :: 3",
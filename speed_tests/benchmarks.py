@@ -0,0 +1,463 @@
+"""
+Benchmarks of the client-side hot paths on synthetic responses (no API access needed).
+
+Each benchmark runs on responses of increasing size (number of routes or
+updates), and records its best and median time over `--repeat` runs and its
+peak Python memory (tracemalloc, in a separate run). Results are stored as
+JSON, and `compare` flags the benchmarks that got slower or bigger than a
+baseline.
+
+No baseline is shipped: timings depend on the machine. Generate one on the
+main branch first, then compare a change with it:
+
+    python speed_tests/benchmarks.py run --save speed_tests/baselines/main.json
+    python speed_tests/benchmarks.py run --compare speed_tests/baselines/main.json
+    python speed_tests/benchmarks.py run --sizes 1k,10k --only rib_table,decode
+    python speed_tests/benchmarks.py compare before.json after.json --threshold 0.2
+
+Default sizes are 1k, 10k, 100k and 1M routes; add `10m` to `--sizes` on a
+machine with about 8 GB of free memory. Timings are only comparable on the
+same machine and Python version, which are recorded in the results.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from pybgproutesapi.endpoints.vantage_points import parse_vps
+from pybgproutesapi.utils.decoder import available_backends, get_decoder
+from pybgproutesapi.utils.filters import RouteFilter
+from pybgproutesapi.utils.helpers import chunked, fan_out, merge_responses
+from pybgproutesapi.utils.intern import aspath_pool, community_pool
+from pybgproutesapi.utils.prefix import PrefixIndex
+from pybgproutesapi.utils.prints import format_rib_response, format_updates_response
+from pybgproutesapi.utils.shard import merge_rib, merge_updates
+from pybgproutesapi.utils.stream import iter_rib_rows, iter_updates_rows
+from pybgproutesapi.utils.table import RibTable
+
+try:
+    import numpy  # noqa: F401
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+DEFAULT_SIZES = "1k,10k,100k,1m"
+
+# Routes per VP of the synthetic responses: larger sizes have more VPs.
+ROUTES_PER_VP = 100_000
+
+# A time regression below this many seconds is treated as noise.
+MIN_SECONDS = 0.005
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower()
+    factor = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * factor)
+
+
+def size_label(size: int) -> str:
+    if size >= 1_000_000 and size % 1_000_000 == 0:
+        return f"{size // 1_000_000}m"
+    if size >= 1_000 and size % 1_000 == 0:
+        return f"{size // 1_000}k"
+    return str(size)
+
+
+# ---------- Synthetic responses ----------
+class Synthetic:
+    """Responses of `size` routes (or updates, VPs, links), built on first use and shared by the benchmarks."""
+
+    def __init__(self, size: int, seed: int = 0):
+        self.size = size
+        self.rng = random.Random(seed)
+        self.vps = max(1, -(-size // ROUTES_PER_VP))
+        per_vp = -(-size // self.vps)
+        asns = [self.rng.randint(1, 400000) for _ in range(20000)] + [3356, 1299, 174, 2914, 6939]
+        self.paths = [" ".join(map(str, self.rng.choices(asns, k=self.rng.randint(2, 7)))) for _ in range(50000)]
+        self.communities = ["", "3356:2 3356:22 3356:100", "174:21000", "1299:30000 1299:35000", "2914:410"]
+        self.prefixes = [f"{1 + i // 65536}.{(i // 256) % 256}.{i % 256}.0/24" for i in range(per_vp)]
+        self._cache: Dict[str, Any] = {}
+
+    def _cached(self, name: str, build: Callable[[], Any]) -> Any:
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    def _vp_sizes(self) -> List[int]:
+        sizes = [len(self.prefixes)] * self.vps
+        sizes[-1] = self.size - len(self.prefixes) * (self.vps - 1)
+        return sizes
+
+    @property
+    def rib(self) -> Dict[str, Dict[str, Dict[str, list]]]:
+        def build():
+            rng, paths, communities = self.rng, self.paths, self.communities
+            return {"bgp": {str(vp): {prefix: [rng.choice(paths), rng.choice(communities), rng.randint(0, 2),
+                                               rng.randint(0, 2), -1]
+                                      for prefix in self.prefixes[:count]}
+                            for vp, count in enumerate(self._vp_sizes(), 1)},
+                    "bmp": {}}
+        return self._cached("rib", build)
+
+    @property
+    def updates(self) -> Dict[str, Dict[str, List[list]]]:
+        def build():
+            rng, paths, prefixes = self.rng, self.paths, self.prefixes
+            data = {}
+            for vp, count in enumerate(self._vp_sizes(), 1):
+                rows = []
+                for i in range(count):
+                    if rng.random() < 0.1:
+                        rows.append([1.7e9 + i * 0.37, "W", rng.choice(prefixes), None, None, None, None, -1])
+                    else:
+                        rows.append([1.7e9 + i * 0.37, "A", rng.choice(prefixes), rng.choice(paths),
+                                     rng.choice(self.communities), rng.randint(0, 2), rng.randint(0, 2), -1])
+                data[str(vp)] = rows
+            return {"bgp": data, "bmp": {}}
+        return self._cached("updates", build)
+
+    @property
+    def rib_body(self) -> bytes:
+        return self._cached("rib_body", lambda: json.dumps({"seconds": 1.0, "bytes": 0, "data": self.rib}).encode())
+
+    @property
+    def updates_body(self) -> bytes:
+        return self._cached("updates_body",
+                            lambda: json.dumps({"seconds": 1.0, "bytes": 0, "data": self.updates}).encode())
+
+    @property
+    def vp_items(self) -> Dict[str, List[Dict[str, Any]]]:
+        def build():
+            rng = self.rng
+            item = lambda i: {"id": i, "ip": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+                              "asn": rng.randint(1, 400000), "source": rng.choice(["ris", "rv", "pch"]),
+                              "country": rng.choice(["FR", "US", "DE"]), "rib_size_v4": rng.randint(0, 1000000),
+                              "status_history": [[1.7e9, "up"]], "metadata": {"note": "x" * 40}}
+            bmp = self.size // 10
+            return {"bgp": [item(i) for i in range(self.size - bmp)],
+                    "bmp": [{**item(i), "bmp_info": {"parent_asn": 64496, "parent_ip": "203.0.113.1",
+                                                     "feed_types": [1, 2]}} for i in range(bmp)]}
+        return self._cached("vp_items", build)
+
+    @property
+    def topology(self) -> Dict[str, Any]:
+        def build():
+            rng = self.rng
+            top = max(10, self.size // 20)
+            return {"links": [[rng.randint(1, top), rng.randint(1, top * 10)] for _ in range(self.size)]}
+        return self._cached("topology", build)
+
+    @property
+    def table(self) -> RibTable:
+        return self._cached("table", lambda: RibTable.from_response(self.rib, paths=aspath_pool(),
+                                                                     communities=community_pool()))
+
+
+def _chunks(body: bytes, size: int = 1 << 16) -> List[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def _split_vps(data: Dict[str, Dict[str, Any]]) -> List[Dict[str, Dict[str, Any]]]:
+    """One response per VP, as returned by batched queries."""
+    return [{proto: {vp_id: value}} for proto, vps in data.items() for vp_id, value in vps.items()]
+
+
+def _split_routes(data: Dict[str, Dict[str, Any]], parts: int) -> List[Dict[str, Dict[str, Any]]]:
+    """`parts` responses with disjoint prefixes per VP, as returned by a split exact-match list."""
+    result = []
+    for part in range(parts):
+        result.append({proto: {vp_id: (dict(list(routes.items())[part::parts]) if isinstance(routes, dict)
+                                       else routes[part::parts])
+                               for vp_id, routes in vps.items()}
+                       for proto, vps in data.items()})
+    return result
+
+
+# ---------- Benchmarks ----------
+# name -> (maximum size, numpy needed, setup(data) returning the timed callable)
+BENCHMARKS: Dict[str, Any] = {}
+
+
+def benchmark(name: str, max_size: Optional[int] = None, numpy: bool = False):
+    def register(setup):
+        BENCHMARKS[name] = (max_size, numpy, setup)
+        return setup
+    return register
+
+
+def _decode(loads):
+    def setup(data):
+        body = data.rib_body
+        return lambda: loads(body)
+    return setup
+
+
+for _backend, _loads in available_backends().items():
+    benchmark(f"decode_rib[{_backend}]")(_decode(_loads))
+
+
+
+@benchmark("decode_updates")
+def _decode_updates(data):
+    loads, body = get_decoder(), data.updates_body
+    return lambda: loads(body)
+
+
+@benchmark("stream_rib_rows", max_size=1_000_000)
+def _stream_rib(data):
+    chunks = _chunks(data.rib_body)
+    return lambda: sum(1 for _ in iter_rib_rows(chunks))
+
+
+@benchmark("stream_updates_rows", max_size=1_000_000)
+def _stream_updates(data):
+    chunks = _chunks(data.updates_body)
+    return lambda: sum(1 for _ in iter_updates_rows(chunks))
+
+
+@benchmark("parse_vps", max_size=100_000)
+def _parse_vps(data):
+    items = data.vp_items
+    return lambda: parse_vps(items)
+
+
+@benchmark("merge_responses")
+def _merge_responses(data):
+    parts = _split_vps(data.rib)
+
+    def run():
+        merged = {"bgp": {}, "bmp": {}}
+        for part in parts:
+            merge_responses(merged, part)
+        return merged
+    return run
+
+
+@benchmark("merge_rib_split", max_size=1_000_000)
+def _merge_rib(data):
+    parts = _split_routes(data.rib, 4)
+    return lambda: merge_rib(parts, {})
+
+
+@benchmark("merge_updates_split", max_size=1_000_000)
+def _merge_updates(data):
+    parts = _split_routes(data.updates, 4)
+    return lambda: merge_updates(parts, {"chronological_order": True})
+
+
+@benchmark("format_rib_response", max_size=1_000_000)
+def _format_rib(data):
+    rib = data.rib
+    return lambda: format_rib_response(rib)
+
+
+@benchmark("format_updates_response", max_size=1_000_000)
+def _format_updates(data):
+    updates = data.updates
+    return lambda: format_updates_response(updates)
+
+
+@benchmark("chunked_fan_out", max_size=1_000_000)
+def _fan_out(data):
+    items = list(range(data.size))
+    return lambda: sum(total for _, total in fan_out(sum, chunked(items, 10), max_workers=4))
+
+
+@benchmark("route_filter_rib")
+def _route_filter(data):
+    rib = data.rib
+    return lambda: RouteFilter(aspath_regexp="(^| )3356( |$)", rov_status_filter=[2]).filter_rib(rib)
+
+
+@benchmark("rib_table_from_response")
+def _rib_table(data):
+    rib = data.rib
+    return lambda: RibTable.from_response(rib, paths=aspath_pool(), communities=community_pool())
+
+
+@benchmark("rib_table_to_dict")
+def _rib_table_to_dict(data):
+    table = data.table
+    return table.to_dict
+
+
+@benchmark("rib_table_where")
+def _rib_table_where(data):
+    table = data.table
+    return lambda: table.where(rov=[2], aspa=[1])
+
+
+@benchmark("rib_table_path_mask", numpy=True)
+def _rib_table_path_mask(data):
+    table = data.table
+    return lambda: table.path_mask("(^| )3356( |$)")
+
+
+@benchmark("updates_frame_from_response", numpy=True)
+def _updates_frame(data):
+    from pybgproutesapi.utils.frame import UpdatesFrame
+
+    updates = data.updates
+    return lambda: UpdatesFrame.from_response(updates, paths=aspath_pool(), communities=community_pool())
+
+
+@benchmark("prefix_index_from_rib")
+def _prefix_index(data):
+    rib = data.rib
+    return lambda: PrefixIndex.from_rib(rib)
+
+
+@benchmark("topology_graph", numpy=True)
+def _topology_graph(data):
+    from pybgproutesapi.utils.graph import TopologyGraph
+
+    topology = data.topology
+    return lambda: TopologyGraph.from_topology(topology).degree()
+
+
+# ---------- Measurement ----------
+def measure(fn: Callable[[], Any], repeat: int, max_seconds: float) -> Dict[str, float]:
+    """Best and median time over at most `repeat` runs (fewer if they exceed `max_seconds`), then peak memory."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+        if sum(times) > max_seconds:
+            break
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "median": statistics.median(times), "runs": len(times), "peak_bytes": peak}
+
+
+def _metadata() -> Dict[str, Any]:
+    meta = {
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "json_decoders": list(available_backends()),
+    }
+    if HAS_NUMPY:
+        import numpy as np
+        meta["numpy"] = np.__version__
+    return meta
+
+
+def run(sizes: List[int], only: Optional[List[str]], repeat: int, max_seconds: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for size in sizes:
+        data = Synthetic(size)
+        for name, (max_size, needs_numpy, setup) in BENCHMARKS.items():
+            if only and not any(part in name for part in only):
+                continue
+            if (max_size is not None and size > max_size) or (needs_numpy and not HAS_NUMPY):
+                continue
+            fn = setup(data)
+            key = f"{name}@{size_label(size)}"
+            result = results[key] = {"name": name, "size": size, **measure(fn, repeat, max_seconds)}
+            print(f"{key:<42} {result['seconds'] * 1000:10.2f} ms  (median {result['median'] * 1000:10.2f} ms)"
+                  f"  peak {result['peak_bytes'] / 1e6:9.1f} MB", flush=True)
+        del data
+        gc.collect()
+    return {"meta": _metadata(), "results": results}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float,
+            memory_threshold: float) -> List[str]:
+    """Print the ratio of every common benchmark and return the keys of the regressions."""
+    regressions = []
+    base, cur = baseline["results"], current["results"]
+    print(f"{'benchmark':<42} {'base ms':>10} {'now ms':>10} {'time':>7} {'memory':>7}")
+    for key in sorted(set(base) & set(cur), key=lambda k: (cur[k]["name"], cur[k]["size"])):
+        b, c = base[key], cur[key]
+        time_ratio = c["seconds"] / b["seconds"] if b["seconds"] else 1.0
+        memory_ratio = c["peak_bytes"] / b["peak_bytes"] if b["peak_bytes"] else 1.0
+        slower = time_ratio > 1 + threshold and c["seconds"] - b["seconds"] > MIN_SECONDS
+        bigger = memory_ratio > 1 + memory_threshold and c["peak_bytes"] - b["peak_bytes"] > 1 << 20
+        flag = "REGRESSION" if slower or bigger else ("faster" if time_ratio < 1 - threshold else "")
+        if slower or bigger:
+            regressions.append(key)
+        print(f"{key:<42} {b['seconds'] * 1000:10.2f} {c['seconds'] * 1000:10.2f} "
+              f"{time_ratio:6.2f}x {memory_ratio:6.2f}x  {flag}")
+    missing = len(set(base) - set(cur))
+    if missing:
+        print(f"{missing} benchmark(s) of the baseline were not run")
+    return regressions
+
+
+def _load(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated sizes (default {DEFAULT_SIZES})")
+    run_parser.add_argument("--only", help="Comma-separated parts of benchmark names to run")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Maximum timed runs per benchmark")
+    run_parser.add_argument("--max-seconds", type=float, default=5.0, help="Stop repeating after this time")
+    run_parser.add_argument("--save", help="Write the results to this JSON file")
+    run_parser.add_argument("--compare", help="Baseline JSON file to compare the results with")
+
+    for p in (run_parser, commands.add_parser("compare", help="Compare two result files")):
+        p.add_argument("--threshold", type=float, default=0.25, help="Tolerated relative slowdown (default 0.25)")
+        p.add_argument("--memory-threshold", type=float, default=0.10,
+                       help="Tolerated relative peak memory increase (default 0.10)")
+    commands.choices["compare"].add_argument("baseline")
+    commands.choices["compare"].add_argument("current")
+    commands.add_parser("list", help="List the benchmarks")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, (max_size, needs_numpy, _) in BENCHMARKS.items():
+            limit = f"up to {size_label(max_size)}" if max_size else ""
+            print(f"{name:<32} {limit:<12} {'numpy' if needs_numpy else ''}")
+        return 0
+
+    baseline = args.baseline if args.command == "compare" else args.compare
+    if baseline and not os.path.exists(baseline):
+        parser.error(f"no baseline at {baseline}: create it first with `run --save {baseline}`")
+
+    if args.command == "compare":
+        regressions = compare(_load(args.baseline), _load(args.current), args.threshold, args.memory_threshold)
+    else:
+        sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+        only = [s.strip() for s in args.only.split(",")] if args.only else None
+        results = run(sizes, only, args.repeat, args.max_seconds)
+        if args.save:
+            os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+            with open(args.save, "w") as f:
+                json.dump(results, f, indent=1, sort_keys=True)
+            print(f"saved {args.save}")
+        if not args.compare:
+            return 0
+        regressions = compare(_load(args.compare), results, args.threshold, args.memory_threshold)
+
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
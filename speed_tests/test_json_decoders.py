@@ -0,0 +1,37 @@
+
+import json
+import random
+import time
+
+from pybgproutesapi.utils.decoder import available_backends
+
+# Synthetic bodies shaped like /rib and /updates responses (no API access needed)
+random.seed(0)
+paths = [" ".join(str(random.randint(1, 65000)) for _ in range(random.randint(2, 8))) for _ in range(20000)]
+
+rib_body = json.dumps({
+    "seconds": 1.0, "bytes": 0,
+    "data": {"bgp": {str(vp): {f"{random.randint(1, 223)}.{random.randint(0, 255)}.{random.randint(0, 255)}.0/24":
+                               [random.choice(paths), "3356:2 3356:22 3356:100", 0, 1, -1]
+                               for _ in range(20000)} for vp in range(10)}, "bmp": {}},
+}).encode()
+
+updates_body = json.dumps({
+    "seconds": 1.0, "bytes": 0,
+    "data": {"bgp": {str(vp): [[1.7e9 + i * 0.37, random.choice("AW"), f"10.{i % 256}.{i // 256 % 256}.0/24",
+                                random.choice(paths), "3356:2 3356:22", 0, 1, -1]
+                               for i in range(20000)] for vp in range(10)}, "bmp": {}},
+}).encode()
+
+# --- Decode each body with every installed backend --------------------------
+for label, body in (("rib", rib_body), ("updates", updates_body)):
+    mb = len(body) / 1e6
+    print(f"{label}: {mb:.1f} MB")
+    for name, loads in available_backends().items():
+        runs = []
+        for _ in range(5):
+            start = time.perf_counter()
+            loads(body)
+            runs.append(time.perf_counter() - start)
+        best = min(runs)
+        print(f"  {name:<9} {best / mb * 1000:7.1f} ms/MB   {mb / best:7.1f} MB/s")
@@ -0,0 +1,43 @@
+import random
+import time
+
+import numpy as np
+
+from pybgproutesapi.utils.intern import aspath_pool
+from pybgproutesapi.utils.pathmatch import PathMatcher
+from pybgproutesapi.utils.filters import _pg_regex
+
+# Synthetic pool of distinct AS paths and a path id column shaped like a
+# 50-VP full-table RIB (no API access needed)
+random.seed(0)
+asns = [random.randint(1, 400000) for _ in range(60000)] + [3356, 1299, 174, 2914, 6939]
+pool = aspath_pool()
+for _ in range(1000000):
+    pool.intern(" ".join(str(random.choice(asns)) for _ in range(random.randint(2, 7))))
+path_ids = np.random.default_rng(0).integers(0, len(pool), size=50_000_000, dtype=np.uint32)
+print(f"{len(pool)} distinct paths, {len(path_ids)} routes")
+
+patterns = [
+    r"(^| )3356($| )",
+    r"^174 ",
+    r"(^| )1853 (|.* )2914($| )|(^| )2914 (|.* )1853($| )",
+    r"\y6939\y",
+]
+
+matcher = PathMatcher(pool)
+for pattern in patterns:
+    regex = _pg_regex(pattern)
+    start = time.perf_counter()
+    [regex.search(p) is not None for p in pool if p is not None]
+    naive = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher.bitmap(pattern)
+    first = time.perf_counter() - start
+
+    start = time.perf_counter()
+    mask = matcher.mask(pattern, path_ids)
+    broadcast = time.perf_counter() - start
+
+    print(f"{pattern[:40]:<42} per-path regex {naive * 1000:7.1f} ms   "
+          f"bitmap {first * 1000:7.1f} ms   broadcast {broadcast * 1000:6.1f} ms   {int(mask.sum())} routes")
@@ -4,8 +4,7 @@ from datetime import datetime, timedelta
 
 from pybgproutesapi import (
     vantage_points,
-    rib,
-    chunked,
+    rib_many,
 )
 
 # Use current day minus one day
@@ -28,12 +27,12 @@ vps = vantage_points(
 random.shuffle(vps)
 vps = vps[: min(50, len(vps))]
 
-# --- RIB: run by batches of 10 VPs ----------------------------------------
-rib_merged = {"bgp": {}, "bmp": {}}
-for batch in chunked(vps, 10):
-    resp = rib(
-        batch,
-        date=start_date_str,
-        prefix_filter=[('<<', '8.0.0.0/8')]
-    )
+# --- RIB: run by batches of 10 VPs, 5 batches in parallel -----------------
+rib_merged = rib_many(
+    vps,
+    date=start_date_str,
+    batch_size=10,
+    max_workers=5,
+    prefix_filter=[('<<', '8.0.0.0/8')]
+)
 
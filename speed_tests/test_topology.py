@@ -0,0 +1,40 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from pybgproutesapi import (
+    vantage_points,
+    topology_graph,
+)
+
+# Use current day minus one day
+yesterday = datetime.utcnow() - timedelta(days=1)
+
+# Pick a number between 0 and 23 (included) randomly, and use that number as the hour below
+hour = random.randint(0, 23)
+start_time = yesterday.replace(hour=hour, minute=0, second=0, microsecond=0)
+
+# Format in ISO 8601
+start_date_str = start_time.strftime("%Y-%m-%dT%H:%M:%S")
+
+# Get vantage points with a full IPv4 table
+vps = vantage_points(
+    date=start_date_str,
+    rib_size_v4=('>', '900000'),
+    data_afi=4
+)
+
+random.shuffle(vps)
+vps = vps[: min(50, len(vps))]
+
+# --- TOPOLOGY: run by batches of 10 VPs, 4 batches in parallel ------------
+start = time.perf_counter()
+graph = topology_graph(
+    vps,
+    date=start_date_str,
+    batch_size=10,
+    max_workers=4,
+)
+elapsed = time.perf_counter() - start
+
+print(f"{len(vps)} VPs: {len(graph)} links, {graph.num_asns} ASNs in {elapsed:.2f}s")
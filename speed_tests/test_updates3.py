@@ -3,7 +3,7 @@ from datetime import datetime, timedelta
 
 from pybgproutesapi import (
     vantage_points,
-    updates,
+    updates_sharded,
     chunked,
 )
 
@@ -35,12 +35,13 @@ updates_merged = {"bgp": {}, "bmp": {}}
 for batch in chunked(vps, 1):
     print (batch)
     try:
-        resp = updates(
+        resp = updates_sharded(
             batch,
             start_date=start_date_str,
             end_date=end_date_str,
+            shards=4,
             return_count=True,
-            exact_prefix_match=['130.79.0.0/16', '65.169.6.0/23', '91.106.223.0/24', '105.77.0.0/16'],
+            prefix_exact_match=['130.79.0.0/16', '65.169.6.0/23', '91.106.223.0/24', '105.77.0.0/16'],
             data_afi=4
         )
     except:
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from pybgproutesapi import AsyncBGPRoutesClient, BGPRoutesClient, rib, updates
+from pybgproutesapi.testing import LocalServer
+
+DATE = "2030-01-01T00:00:00"
+
+
+@pytest.fixture(scope="module")
+def server():
+    with LocalServer() as server:
+        yield server
+
+
+def _run(server, call):
+    async def main():
+        async with AsyncBGPRoutesClient(base_url=server.url, api_key="test", max_concurrency=4) as client:
+            return await call(client)
+    return asyncio.run(main())
+
+
+def test_rib_matches_sync_client(server):
+    with BGPRoutesClient(base_url=server.url, api_key="test") as sync_client:
+        vps = sync_client.vantage_points()
+        expected = rib(vps, date=DATE, client=sync_client)
+
+    assert _run(server, lambda client: rib(vps, date=DATE, client=client)) == expected
+
+
+def test_updates_match_sync_client(server):
+    with BGPRoutesClient(base_url=server.url, api_key="test") as sync_client:
+        vps = sync_client.vantage_points()
+        expected = updates(vps[:2], start_date="1970-01-02T00:00:00", end_date=DATE, client=sync_client)
+
+    result = _run(server, lambda client: client.updates(vps[:2], start_date="1970-01-02T00:00:00", end_date=DATE))
+    assert result == expected
+
+
+def test_gathered_calls(server):
+    async def call(client):
+        vps = await client.vantage_points()
+        return vps, await asyncio.gather(*(client.rib(vp, date=DATE, return_count=True) for vp in vps))
+
+    vps, counts = _run(server, call)
+    assert len(counts) == len(vps)
+    assert all(count for count in counts)
+
+
+def test_stream_is_not_supported(server):
+    with pytest.raises(NotImplementedError):
+        _run(server, lambda client: client.rib([], date=DATE, stream=True))
@@ -0,0 +1,90 @@
+import os
+import time
+
+from pybgproutesapi import DiskCache
+
+
+def _disk_size(directory):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(directory) for name in files)
+
+
+def _content(i):
+    # Incompressible enough for each entry to take about 2 KB.
+    return {"data": [hash((i, j)) for j in range(200)]}
+
+
+def test_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path), ttl=60, settle=3600)
+    now = 1_700_000_000
+    assert cache.expires({"date": "2023-11-14T22:00:00"}, now=now) == now + 60    # recent: ttl
+    assert cache.expires({}, now=now) == now + 60                                 # no date: ttl
+
+    cache.set("a" * 64, {"data": 1}, expires=time.time() + 60)
+    cache.set("b" * 64, {"data": 2}, expires=time.time() - 1)
+    assert cache.get("a" * 64) == {"data": 1}
+    assert cache.get("b" * 64) is None
+    assert not os.path.exists(cache._path("b" * 64))
+    assert cache.size == _disk_size(tmp_path)
+
+
+def test_immutable_entries_expire_only_by_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path), settle=3600, max_bytes=10 * 1024)
+    now = 1_700_000_000
+    old = {"start_date": "2023-11-01T00:00:00", "end_date": "2023-11-02"}
+    assert cache.expires(old, now=now) is None
+    assert cache.expires({"start_date": "2023-11-01T00:00:00", "end_date": "2023-11-14T22:00:00"},
+                         now=now) is not None
+
+    cache.set("0" * 64, _content(0), expires=None)
+    assert cache.get("0" * 64) == _content(0)
+    os.utime(cache._path("0" * 64), (1, 1))   # least recently used
+    for i in range(1, 8):
+        cache.set(f"{i}" * 64, _content(i), expires=None)
+    assert cache.get("0" * 64) is None
+
+
+def test_eviction_is_lru_and_bounded(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=20 * 1024)
+    keys = [f"{i:064x}" for i in range(30)]
+    kept = keys[5]
+    for i, key in enumerate(keys):
+        cache.set(key, _content(i), expires=None)
+        # Entries are used in order, except `kept`, used more recently than all of them.
+        when = time.time() if key == kept else i
+        os.utime(cache._path(key), (when, when))
+    cache.evict()
+
+    assert cache.size == _disk_size(tmp_path) <= 20 * 1024
+    assert cache.get(kept) is not None
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[-1]) is not None
+
+
+def test_superset_index_is_pruned_and_counted(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=20 * 1024)
+    family = "f" * 64
+    keys = [f"{i:064x}" for i in range(30)]
+    for i, key in enumerate(keys):
+        cache.set(key, _content(i), expires=None)
+        os.utime(cache._path(key), (i, i))
+        cache.remember(family, key, {"prefix_filter": f"<<:{i}.0.0.0/8"})
+        cache.remember(family, key, {"prefix_filter": f"<<:{i}.0.0.0/8"})    # recorded once
+    cache.evict()
+
+    alive = [key for key in keys if os.path.exists(cache._path(key))]
+    assert 0 < len(alive) < len(keys)
+    assert sorted(key for key, _ in cache.supersets(family)) == sorted(alive)
+    with open(cache._family_path(family)) as f:
+        assert len(f.readlines()) == len(alive)
+    assert cache.size == _disk_size(tmp_path)
+
+    cache.clear()
+    assert cache.size == 0 == _disk_size(tmp_path)
+    assert cache.supersets(family) == []
+
+
+def test_size_survives_reopening(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.set("a" * 64, _content(1), expires=None)
+    cache.remember("f" * 64, "a" * 64, {})
+    assert DiskCache(str(tmp_path)).size == cache.size == _disk_size(tmp_path)
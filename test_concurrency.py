@@ -0,0 +1,117 @@
+import threading
+import time
+
+import pytest
+
+from pybgproutesapi import AdaptiveConcurrency
+from pybgproutesapi.utils.errors import BadRequestError, RateLimitError
+
+
+def _rate_limited(detail="Too many concurrent queries"):
+    return RateLimitError(f"Rate limit exceeded: {detail}", detail)
+
+
+def _raise_bad_request():
+    raise BadRequestError("Invalid request")
+
+
+class Limited:
+    """Fake request rate-limited `times` times, then answering "ok"."""
+
+    def __init__(self, times, detail="Too many concurrent queries, retry in 0 seconds"):
+        self.times = times
+        self.detail = detail
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.times:
+            raise _rate_limited(self.detail)
+        return "ok"
+
+
+def test_one_decrease_per_window():
+    governor = AdaptiveConcurrency(initial=8, max_limit=16, backoff=0)
+    epochs = [governor.acquire() for _ in range(8)]
+    assert governor.in_flight == 8
+    # A burst of 429s from requests admitted in the same window halves the limit once.
+    for epoch in epochs:
+        governor.release(epoch, success=False, rate_limited=True, retry_after=0)
+    assert governor.limit == 4
+    assert governor.in_flight == 0
+
+    # A 429 of the next window halves it again.
+    epoch = governor.acquire()
+    governor.release(epoch, success=False, rate_limited=True, retry_after=0)
+    assert governor.limit == 2
+    for _ in range(20):
+        governor.release(governor.acquire(), success=False, rate_limited=True, retry_after=0)
+    assert governor.limit == 1
+
+
+def test_concurrent_burst_of_429_halves_the_limit_once():
+    governor = AdaptiveConcurrency(initial=8, max_limit=8, backoff=0, max_retries=0)
+    barrier = threading.Barrier(8)
+
+    def request():
+        barrier.wait()
+        raise _rate_limited()
+
+    def worker():
+        with pytest.raises(RateLimitError):
+            governor.call(request)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert governor.limit == 4
+
+
+def test_additive_increase_up_to_max_limit():
+    governor = AdaptiveConcurrency(initial=2, max_limit=4)
+    # About one window of successes (+1/limit each) adds one slot.
+    for _ in range(3):
+        governor.release(governor.acquire())
+    assert governor.limit == 3
+    for _ in range(50):
+        governor.call(lambda: None)
+    assert governor.limit == 4
+    # Other errors neither retry nor change the limit.
+    with pytest.raises(BadRequestError):
+        governor.call(_raise_bad_request)
+    assert governor.limit == 4 and governor.in_flight == 0
+
+
+@pytest.mark.parametrize("detail, backoff, pause", [
+    ("Too many concurrent queries, retry in 300 ms", 10.0, 0.3),
+    ("Too many concurrent queries", 0.3, 0.3),
+])
+def test_pause_honours_retry_after(detail, backoff, pause):
+    governor = AdaptiveConcurrency(initial=4, backoff=backoff)
+    fn = Limited(1, detail)
+    start = time.monotonic()
+    assert governor.call(fn) == "ok"
+    elapsed = time.monotonic() - start
+    assert fn.calls == 2
+    assert pause <= elapsed < pause + 1.0
+
+    # Other requests wait too.
+    governor.release(governor.acquire(), success=False, rate_limited=True, retry_after=0.2)
+    start = time.monotonic()
+    governor.release(governor.acquire())
+    assert time.monotonic() - start >= 0.2
+
+
+def test_raises_after_max_retries():
+    governor = AdaptiveConcurrency(initial=4, backoff=0, max_retries=2)
+    fn = Limited(10)
+    with pytest.raises(RateLimitError):
+        governor.call(fn)
+    assert fn.calls == 3
+    assert governor.in_flight == 0
+
+    fn = Limited(2)
+    assert AdaptiveConcurrency(backoff=0, max_retries=2).call(fn) == "ok"
+    assert fn.calls == 3
@@ -0,0 +1,25 @@
+import subprocess
+import sys
+
+import pytest
+
+from pybgproutesapi.utils import decoder
+
+
+def test_no_backend_is_imported_with_the_package():
+    code = ("import sys, pybgproutesapi, pybgproutesapi.utils.decoder as d; "
+            "print(any(m in sys.modules for m in ('orjson', 'simdjson', 'ujson')), d._default)")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "None"]
+
+
+def test_default_decoder_is_the_first_installed_backend(monkeypatch):
+    def missing():
+        raise ImportError("not installed")
+
+    monkeypatch.setattr(decoder, "BACKENDS", {"orjson": missing, "json": decoder._stdlib})
+    monkeypatch.setattr(decoder, "_default", None)
+    assert decoder.loads(b'{"data": [1, "a"]}') == {"data": [1, "a"]}
+    assert decoder._default is decoder.json.loads
+    with pytest.raises(ImportError, match="pip install orjson"):
+        decoder.get_decoder("orjson")
@@ -2,6 +2,8 @@ import subprocess
 import os
 import pytest
 
+from pybgproutesapi.testing import LocalServer
+
 EXAMPLES_DIR = os.path.join(os.path.dirname(__file__), "examples")
 
 # List of all example script filenames
@@ -15,10 +17,21 @@ example_scripts = [
     "get_single_homed_ases.py"
 ]
 
+
+@pytest.fixture(scope="module")
+def api_env():
+    """Run the examples against a local stand-in server if BGP_LOCAL_SERVER=1, else against the API."""
+    if os.getenv("BGP_LOCAL_SERVER") != "1":
+        yield None
+        return
+    with LocalServer() as server:
+        yield {**os.environ, "BGP_API_URL": server.url, "BGP_API_KEY": os.getenv("BGP_API_KEY", "test")}
+
+
 @pytest.mark.parametrize("script", example_scripts)
-def test_example_script(script):
+def test_example_script(script, api_env):
     script_path = os.path.join(EXAMPLES_DIR, script)
-    result = subprocess.run(["python3", script_path], capture_output=True, text=True)
+    result = subprocess.run(["python3", script_path], capture_output=True, text=True, env=api_env)
     
     print(f"\n=== STDOUT for {script} ===\n{result.stdout}")
     print(f"\n=== STDERR for {script} ===\n{result.stderr}")
@@ -0,0 +1,62 @@
+import math
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from pybgproutesapi import UpdatesFrame
+from pybgproutesapi.testing import Fixtures
+
+
+@pytest.fixture(scope="module")
+def updates():
+    return Fixtures.synthetic(bgp_vps=3, bmp_vps=2, prefixes=200, updates_per_vp=300, seed=5).updates
+
+
+def _rows(updates):
+    return [(proto, vp_id, row) for proto, vps in updates.items() for vp_id, rows in vps.items() for row in rows]
+
+
+def test_to_dict_round_trip(updates):
+    frame = UpdatesFrame.from_response(updates)
+    assert len(frame) == len(_rows(updates))
+    assert frame.to_dict() == updates
+    assert UpdatesFrame.from_rows(frame).to_dict() == updates
+    assert UpdatesFrame.from_response({"bgp": {}, "bmp": {}}).to_dict() == {"bgp": {}, "bmp": {}}
+
+
+def test_selections_match_the_response(updates):
+    frame = UpdatesFrame.from_response(updates)
+    rows = _rows(updates)
+    rng = random.Random(5)
+
+    assert list(frame.sort()) == sorted(rows, key=lambda row: row[2][0])
+    times = sorted(row[2][0] for row in rows)
+    start, end = sorted(rng.sample(times, 2))
+    assert list(frame.between(start, end)) == [row for row in rows if start <= row[2][0] < end]
+    assert list(frame[frame.withdrawals]) == [row for row in rows if row[2][1] == "W"]
+    prefixes = {row[2][2] for row in rng.sample(rows, 10)}
+    assert list(frame[frame.prefix_mask(prefixes)]) == [row for row in rows if row[2][2] in prefixes]
+
+    for key, group in frame.group_by_vp().items():
+        assert list(group) == [row for row in rows if row[:2] == key]
+    for prefix, group in frame.group_by_prefix().items():
+        assert list(group) == [row for row in rows if row[2][2] == prefix]
+
+
+def test_rate_matches_counting(updates):
+    frame = UpdatesFrame.from_response(updates)
+    rows = _rows(updates)
+    start = min(row[2][0] for row in rows)
+    interval = 3600.0
+    bin_starts, rates = frame.rate(interval)
+    counts = [0] * len(bin_starts)
+    for row in rows:
+        counts[int((row[2][0] - start) // interval)] += 1
+    assert bin_starts[0] == start
+    assert (rates * interval).round().astype(int).tolist() == counts
+
+    _, by_vp = frame.rate(interval, by="vp")
+    assert by_vp.shape == (len(frame.vps), math.ceil((max(r[2][0] for r in rows) + interval - start) / interval))
+    assert (by_vp.sum(axis=0) * interval).round().astype(int).tolist() == counts
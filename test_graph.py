@@ -0,0 +1,109 @@
+import random
+from collections import deque
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from pybgproutesapi import TopologyGraph
+
+
+def _links(seed, count=600, asns=250):
+    rng = random.Random(seed)
+    # Few ASNs per link, so that there are duplicates, self-loops, large ASNs and several components.
+    pool = [rng.choice([rng.randint(1, 65535), rng.randint(65536, 4294967295)]) for _ in range(asns)]
+    return [(rng.choice(pool), rng.choice(pool)) for _ in range(count)] + [(pool[0], pool[0])]
+
+
+def _adjacency(links, directed, mode):
+    adjacency = {}
+    for as1, as2 in links:
+        adjacency.setdefault(as1, set())
+        adjacency.setdefault(as2, set())
+        if not directed or mode in ("out", "all"):
+            adjacency[as1].add(as2)
+        if not directed or mode in ("in", "all"):
+            adjacency[as2].add(as1)
+    return adjacency
+
+
+def _bfs(adjacency, start, k):
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        asn = queue.popleft()
+        if distances[asn] == k:
+            continue
+        for neighbor in adjacency[asn]:
+            if neighbor not in distances:
+                distances[neighbor] = distances[asn] + 1
+                queue.append(neighbor)
+    rings = {}
+    for asn, distance in distances.items():
+        if distance:
+            rings.setdefault(distance, set()).add(asn)
+    return rings
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_neighbors_degree_and_k_hop_match_bfs(directed, seed):
+    links = _links(seed)
+    graph = TopologyGraph(links[:200], directed=directed)
+    graph.add_links(links[200:])
+    expected_links = {link if directed else tuple(sorted(link)) for link in links}
+    assert graph.to_set() == expected_links
+    assert len(graph) == len(expected_links)
+    assert graph.num_asns == len({asn for link in links for asn in link})
+
+    rng = random.Random(seed)
+    for mode in ("out", "in", "all") if directed else ("all",):
+        adjacency = _adjacency(links, directed, mode)
+        assert graph.degree(mode=mode).tolist() == [len(adjacency[int(asn)]) for asn in graph.asns]
+        for asn in rng.sample(sorted(adjacency), 25):
+            assert set(graph.neighbors(asn, mode).tolist()) == adjacency[asn]
+            for k in (1, 2, 4, 50):
+                rings = graph.k_hop(asn, k, mode)
+                assert {d: set(ring.tolist()) for d, ring in rings.items()} == _bfs(adjacency, asn, k)
+    assert graph.k_hop(0, 3) == {}
+    assert not len(graph.neighbors(0))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_connected_components_match_bfs(directed, seed):
+    links = _links(seed, count=200)
+    graph = TopologyGraph(links, directed=directed)
+    adjacency = _adjacency(links, False, "all")
+    expected, seen = [], set()
+    for asn in sorted(adjacency):
+        if asn not in seen:
+            component = {asn} | set().union(*_bfs(adjacency, asn, len(adjacency)).values())
+            seen |= component
+            expected.append(component)
+
+    asns, labels = graph.connected_components()
+    by_asn = dict(zip(asns.tolist(), labels.tolist()))
+    for component in expected:
+        # Labelled with the dense index of the smallest ASN.
+        assert {by_asn[asn] for asn in component} == {graph.index(min(component))}
+    assert sorted(map(len, graph.components()), reverse=True) == [len(c) for c in graph.components()]
+    assert {frozenset(c.tolist()) for c in graph.components()} == set(map(frozenset, expected))
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_set_operations_match_python_sets(directed):
+    first = _links(1, count=300, asns=40)
+    second = first[::3] + _links(2, count=300, asns=40)
+    a, b = TopologyGraph(first, directed), TopologyGraph(second, directed)
+    sa, sb = a.to_set(), b.to_set()
+    assert sa & sb
+    assert (a | b).to_set() == sa | sb
+    assert (a & b).to_set() == sa & sb
+    assert (a - b).to_set() == sa - sb
+    assert (a ^ b).to_set() == sa ^ sb
+    assert (a | b) == (b | a)
+    assert (a - a) == TopologyGraph(directed=directed)
+    assert all(link in a for link in sa) and not any(link in a for link in sb - sa)
+    with pytest.raises(ValueError):
+        a | TopologyGraph(second, not directed)
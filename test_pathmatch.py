@@ -0,0 +1,55 @@
+import re
+import sys
+
+import pytest
+
+from pybgproutesapi.utils import pathmatch
+from pybgproutesapi.utils.filters import _pg_regex
+from pybgproutesapi.utils.intern import aspath_pool
+from pybgproutesapi.utils.pathmatch import PathMatcher
+
+PATTERNS = ["(^| )3356 (|.* )174($| )", "^1299 ", "(3356|6939)$", "64500"]
+
+
+def _pool():
+    pool = aspath_pool()
+    for path in ["3356 174 64500", "1299 3356", "6939 174", "174 3356 1299 6939", "64500 64501", None]:
+        pool.intern(path)
+    return pool
+
+
+def _expected(pool, pattern):
+    regex = _pg_regex(pattern)
+    return bytearray(path is not None and regex.search(path) is not None for path in pool)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_literal_prefilter_matches_regex(pattern):
+    pool = _pool()
+    assert PathMatcher(pool).bitmap(pattern) == _expected(pool, pattern)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_without_re_parser(monkeypatch, pattern):
+    monkeypatch.setattr(pathmatch, "_sre_parse", None)
+    pool = _pool()
+    assert pathmatch._literals(_pg_regex(pattern)) is None
+    assert PathMatcher(pool).bitmap(pattern) == _expected(pool, pattern)
+
+
+def test_re_parser_import_failure(monkeypatch):
+    monkeypatch.delattr(re, "_parser", raising=False)
+    for name in ("re._parser", "sre_constants", "sre_parse"):
+        monkeypatch.setitem(sys.modules, name, None)
+    assert pathmatch._sre_modules() == (None, None)
+
+
+def test_re_parser_errors(monkeypatch):
+    class Broken:
+        @staticmethod
+        def parse(*args):
+            raise AttributeError("changed parser")
+
+    monkeypatch.setattr(pathmatch, "_sre_parse", Broken)
+    pool = _pool()
+    assert PathMatcher(pool).bitmap(PATTERNS[0]) == _expected(pool, PATTERNS[0])
@@ -0,0 +1,49 @@
+import pytest
+
+from pybgproutesapi import BGPRoutesClient, QueryPlanner
+from pybgproutesapi.testing import LocalServer
+
+DATE = "2030-01-01T00:00:00"
+
+
+@pytest.fixture(scope="module")
+def client():
+    with LocalServer() as server:
+        with BGPRoutesClient(base_url=server.url, api_key="test") as client:
+            yield client
+
+
+def _two_paths(client, vp):
+    routes = client.rib(vp, date=DATE)[vp.peering_protocol][str(vp.unique_id)]
+    paths = sorted({route[0] for route in routes.values() if route[0]})
+    return paths[0], paths[-1]
+
+
+@pytest.mark.parametrize("return_aspath", [True, False])
+def test_aspath_exact_match_split_equals_direct_queries(client, return_aspath):
+    vp = client.vantage_points()[0]
+    paths = _two_paths(client, vp)
+
+    direct = [client.rib(vp, date=DATE, aspath_exact_match=[path], return_aspath=return_aspath) for path in paths]
+    assert all(result["bgp"][str(vp.unique_id)] for result in direct)
+
+    planner = QueryPlanner(client=client)
+    for path in paths:
+        planner.rib(vp, date=DATE, aspath_exact_match=[path], return_aspath=return_aspath)
+
+    # Without AS paths in the response, the lists cannot be narrowed locally: one call per query.
+    assert len(planner.plan()) == (1 if return_aspath else 2)
+    assert planner.run() == direct
+
+
+def test_prefix_exact_match_merged(client):
+    vps = client.vantage_points()[:3]
+    prefixes = sorted(client.rib(vps[0], date=DATE)["bgp"][str(vps[0].unique_id)])[:4]
+
+    planner = QueryPlanner(client=client)
+    for vp, prefix in zip(vps, prefixes):
+        planner.rib(vp, date=DATE, prefix_exact_match=[prefix], return_aspath=False)
+
+    assert len(planner.plan()) == 1
+    assert planner.run() == [client.rib(vp, date=DATE, prefix_exact_match=[prefix], return_aspath=False)
+                             for vp, prefix in zip(vps, prefixes)]
@@ -0,0 +1,84 @@
+import ipaddress
+import random
+
+import pytest
+
+from pybgproutesapi import PrefixIndex, RibTable
+
+
+def _prefixes(rng, count=400):
+    """Random nested IPv4 and IPv6 prefixes: each new one is often a subnet of an earlier one."""
+    prefixes = [ipaddress.ip_network("0.0.0.0/0"), ipaddress.ip_network("2001:db8::/32")]
+    while len(prefixes) < count:
+        if rng.random() < 0.7:
+            parent = rng.choice(prefixes)
+            if parent.prefixlen == parent.max_prefixlen:
+                continue
+            length = rng.randint(parent.prefixlen + 1, min(parent.max_prefixlen, parent.prefixlen + 12))
+            offset = rng.getrandbits(length - parent.prefixlen) << (parent.max_prefixlen - length)
+            network = ipaddress.ip_network((int(parent.network_address) + offset, length))
+        elif rng.random() < 0.5:
+            network = ipaddress.ip_network((rng.getrandbits(32), rng.randint(8, 24)), strict=False)
+        else:
+            network = ipaddress.ip_network((rng.getrandbits(128), rng.randint(16, 64)), strict=False)
+        if network not in prefixes:
+            prefixes.append(network)
+    return prefixes
+
+
+def _addresses(rng, prefixes, count=300):
+    addresses = []
+    for _ in range(count):
+        network = rng.choice(prefixes)
+        host = rng.getrandbits(network.max_prefixlen - network.prefixlen)
+        addresses.append(str(network.network_address + host))
+    return addresses + ["203.0.113.7", "2001:db8::1", "2a00::1"]
+
+
+def _linear_longest(prefixes, address):
+    address = ipaddress.ip_address(address)
+    matches = [p for p in prefixes if p.version == address.version and address in p]
+    return str(max(matches, key=lambda p: p.prefixlen)) if matches else None
+
+
+def _indexes(prefixes):
+    """The same prefixes indexed with add(), from a rib() response and from a RibTable."""
+    rib = {"bgp": {"1": {str(p): ["64500 64501", None, None, None, -1] for p in prefixes[::2]},
+                   "2": {str(p): ["64502", None, None, None, -1] for p in prefixes[1::2]}}, "bmp": {}}
+    added = PrefixIndex()
+    for p in prefixes:
+        added.add(str(p), str(p))
+    return {"add": added, "rib": PrefixIndex.from_rib(rib), "table": PrefixIndex.from_rib(RibTable.from_response(rib))}
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_longest_prefix_matches_linear_scan(seed):
+    rng = random.Random(seed)
+    prefixes = _prefixes(rng)
+    addresses = _addresses(rng, prefixes)
+    expected = [_linear_longest(prefixes, address) for address in addresses]
+    for kind, index in _indexes(prefixes).items():
+        assert len(index) == len(prefixes), kind
+        assert [index.longest_prefix(address) for address in addresses] == expected, kind
+        matches = index.longest_match_many(addresses)
+        assert [match and match[0] for match in matches] == expected, kind
+    assert _indexes(prefixes)["add"].longest_match(addresses[0]) == (expected[0], [expected[0]])
+    assert PrefixIndex().longest_match("192.0.2.1") is None
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_covering_and_covered_match_linear_scan(seed):
+    rng = random.Random(seed)
+    prefixes = _prefixes(rng)
+    index = _indexes(prefixes)["add"]
+    for query in rng.sample(prefixes, 60) + [ipaddress.ip_network("10.0.0.0/8")]:
+        same = [p for p in prefixes if p.version == query.version]
+        covering = sorted((p for p in same if query.subnet_of(p)), key=lambda p: p.prefixlen)
+        covered = sorted((p for p in same if p.subnet_of(query)), key=lambda p: (int(p.network_address), p.prefixlen))
+        expected = {
+            ">>=": covering, ">>": [p for p in covering if p != query],
+            "<<=": covered, "<<": [p for p in covered if p != query],
+            "=": [query] if query in prefixes else [],
+        }
+        for op, networks in expected.items():
+            assert [prefix for prefix, _ in index.select(op, str(query))] == [str(p) for p in networks], (op, query)
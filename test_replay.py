@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from pybgproutesapi import RibReplayer
+from pybgproutesapi.testing import Fixtures
+
+
+@pytest.fixture(scope="module")
+def data():
+    fixtures = Fixtures.synthetic(bgp_vps=3, bmp_vps=2, prefixes=200, updates_per_vp=400, seed=7)
+    rng = random.Random(7)
+    updates = {proto: {vp_id: list(rows) for vp_id, rows in vps.items()} for proto, vps in fixtures.updates.items()}
+    # Updates sharing a timestamp must be applied in the order they were received.
+    for vps in updates.values():
+        for rows in vps.values():
+            for row in rng.sample(rows, 40):
+                twin = list(row)
+                twin[1] = "W" if row[1] == "A" else "A"
+                twin[3] = twin[3] or "64500 64501"
+                rows.insert(rows.index(row) + 1, twin)
+    start = min(row[0] for vps in updates.values() for rows in vps.values() for row in rows) - 1
+    return fixtures.rib, updates, start
+
+
+def _chunks(updates, rng, count=4):
+    """Split the updates into time windows, returned out of order, each window's rows shuffled."""
+    times = sorted(row[0] for vps in updates.values() for rows in vps.values() for row in rows)
+    bounds = [times[0]] + sorted(rng.sample(times[1:-1], count - 1)) + [times[-1] + 1]
+    chunks = []
+    for low, high in zip(bounds, bounds[1:]):
+        chunk = {proto: {vp_id: [row for row in rows if low <= row[0] < high] for vp_id, rows in vps.items()}
+                 for proto, vps in updates.items()}
+        for vps in chunk.values():
+            for rows in vps.values():
+                # Shuffled, but rows sharing a timestamp keep their order.
+                groups = {}
+                for row in rows:
+                    groups.setdefault(row[0], []).append(row)
+                keys = list(groups)
+                rng.shuffle(keys)
+                rows[:] = [row for key in keys for row in groups[key]]
+        chunks.append(chunk)
+    rng.shuffle(chunks)
+    return chunks
+
+
+def _brute_force(rib, updates, time):
+    """Per VP and feed type, the snapshot with every update strictly before `time` applied in order."""
+    result = {}
+    for proto in ("bgp", "bmp"):
+        for vp_id, routes in rib.get(proto, {}).items():
+            feeds = result.setdefault((proto, vp_id), {})
+            for prefix, route in routes.items():
+                feeds.setdefault(route[4], {})[prefix] = route
+        for vp_id, rows in updates.get(proto, {}).items():
+            feeds = result.setdefault((proto, vp_id), {})
+            for row in sorted(rows, key=lambda row: row[0]):
+                if row[0] >= time:
+                    break
+                _, kind, prefix, aspath, community, aspa, rov, feed = row[:8]
+                if kind == "W":
+                    feeds.setdefault(feed, {}).pop(prefix, None)
+                else:
+                    feeds.setdefault(feed, {})[prefix] = [aspath, community, aspa, rov, feed]
+    return result
+
+
+def _check(replayer, rib, updates, time):
+    expected = _brute_force(rib, updates, time)
+    for (proto, vp_id), feeds in expected.items():
+        for feed, routes in feeds.items():
+            assert replayer.rib(time, feed=feed)[proto].get(vp_id, {}) == routes, (proto, vp_id, feed, time)
+
+
+def test_replay_matches_brute_force_with_out_of_order_updates_and_backward_seeks(data):
+    rib, updates, start = data
+    rng = random.Random(1)
+    replayer = RibReplayer(rib, start)
+    times = sorted(row[0] for vps in updates.values() for rows in vps.values() for row in rows)
+
+    added = {"bgp": {}, "bmp": {}}
+    for chunk in _chunks(updates, rng):
+        # Move somewhere before adding, so that some windows land before the current time.
+        replayer.seek(rng.choice(times))
+        replayer.add_updates(chunk)
+        for proto, vps in chunk.items():
+            for vp_id, rows in vps.items():
+                added[proto].setdefault(vp_id, []).extend(rows)
+        _check(replayer, rib, added, replayer.time)
+
+    # Every window was added: seek anywhere, backward or forward, including between timestamps.
+    for _ in range(25):
+        time = rng.choice(times + [start, times[-1] + 1]) + rng.choice([0, 0.0005])
+        _check(replayer, rib, updates, time)
+
+
+def test_checkpoint_and_restore(data):
+    rib, updates, start = data
+    replayer = RibReplayer(rib, start, updates)
+    times = sorted(row[0] for vps in updates.values() for rows in vps.values() for row in rows)
+
+    replayer.seek(times[len(times) // 3])
+    replayer.checkpoint()
+    snapshot = replayer.rib()
+    replayer.seek(times[-1] + 1)
+    assert replayer.rib() != snapshot
+    replayer.restore()
+    assert replayer.rib() == snapshot
+    assert replayer.rib(start)["bgp"] == rib["bgp"]
+
+
+def test_updates_before_snapshot_are_refused(data):
+    rib, updates, start = data
+    replayer = RibReplayer(rib, start + 10 ** 9)
+    with pytest.raises(ValueError):
+        replayer.add_updates(updates)
+    with pytest.raises(ValueError):
+        replayer.seek(start)
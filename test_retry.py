@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from pybgproutesapi import BGPRoutesClient, RetryPolicy
+from pybgproutesapi.utils import retry as retry_module
+from pybgproutesapi.utils.errors import BadRequestError, ServerError
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record the backoff delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(retry_module.time, "sleep", delays.append)
+    return delays
+
+
+class Flaky:
+    """Fake request raising the given errors, then returning "ok"."""
+
+    def __init__(self, *errors, delays=()):
+        self.errors = list(errors)
+        self.delays = list(delays)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            error = self.errors.pop(0) if self.errors else None
+            delay = self.delays.pop(0) if self.delays else 0
+        if delay:
+            threading.Event().wait(delay)
+        if error is not None:
+            raise error
+        return "ok"
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    policy = RetryPolicy(backoff=0.5, max_backoff=5.0, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(6)] == [0.5, 1.0, 2.0, 4.0, 5.0, 5.0]
+    policy.jitter = True
+    for attempt in range(6):
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0 <= delay <= min(5.0, 0.5 * 2 ** attempt) for delay in delays)
+        assert len(set(delays)) > 1
+
+
+def test_per_endpoint_budgets(sleeps):
+    policy = RetryPolicy(max_retries=3, budgets={"updates": 1}, jitter=False)
+    for path, calls in (("/updates", 2), ("/rib", 4)):
+        fn = Flaky(*[ServerError("down")] * 10)
+        with pytest.raises(ServerError):
+            policy.call("GET", path, fn)
+        assert fn.calls == calls
+    assert sleeps == [0.5, 0.5, 1.0, 2.0]
+
+    fn = Flaky(ServerError("down"), requests.Timeout())
+    assert policy.call("GET", "/rib", fn) == "ok"
+    assert fn.calls == 3
+
+
+def test_only_transient_errors_are_retried(sleeps):
+    fn = Flaky(BadRequestError("bad"))
+    with pytest.raises(BadRequestError):
+        RetryPolicy().call("GET", "/rib", fn)
+    assert fn.calls == 1
+
+
+def test_non_idempotent_requests_are_only_retried_on_connection_errors(sleeps):
+    policy = RetryPolicy(idempotent_methods=("GET",))
+    fn = Flaky(ServerError("down"))
+    with pytest.raises(ServerError):
+        policy.call("POST", "/rib", fn)
+    assert fn.calls == 1
+
+    fn = Flaky(requests.ConnectionError(), requests.ConnectionError())
+    assert policy.call("POST", "/rib", fn) == "ok"
+    assert fn.calls == 3
+
+    fn = Flaky(ServerError("down"))
+    assert RetryPolicy().call("POST", "/rib", fn) == "ok"
+    assert fn.calls == 2
+
+
+def _warmed_up(**options):
+    """A hedging policy with 10 fast measured requests to /rib."""
+    policy = RetryPolicy(hedge=True, hedge_min_samples=10, max_retries=0, **options)
+    for _ in range(10):
+        policy.call("GET", "/rib", Flaky(delays=[0.01]))
+    return policy
+
+
+def test_hedge_sent_after_the_latency_quantile():
+    policy = RetryPolicy(hedge=True, hedge_min_samples=10, max_retries=0)
+    fn = Flaky(delays=[0.3])
+    assert policy.call("GET", "/rib", fn) == "ok"
+    # Not enough samples yet: no hedge.
+    assert fn.calls == 1
+
+    policy = _warmed_up()
+    assert 0.01 <= policy.latency_quantile("/rib") < 0.1
+    # The hedge answers long before the first request.
+    fn = Flaky(delays=[2.0])
+    start = time.monotonic()
+    assert policy.call("GET", "/rib", fn) == "ok"
+    assert fn.calls == 2
+    assert time.monotonic() - start < 1.0
+
+    # POST and streamed requests are never hedged.
+    for method, hedge in (("POST", True), ("GET", False)):
+        fn = Flaky(delays=[0.2])
+        assert policy.call(method, "/rib", fn, hedge=hedge) == "ok"
+        assert fn.calls == 1
+    policy.close()
+
+
+def test_losing_hedge_is_cancelled_when_queued():
+    # With one thread, the hedge waits for the first request, which wins: the hedge never runs.
+    policy = _warmed_up(hedge_workers=1)
+    fn = Flaky(delays=[0.3])
+    assert policy.call("GET", "/rib", fn) == "ok"
+    time.sleep(0.1)
+    assert fn.calls == 1
+    policy.close()
+
+
+def test_both_hedge_errors_are_kept():
+    policy = _warmed_up()
+    fn = Flaky(ServerError("first"), ServerError("second"), delays=[0.3, 0.5])
+    with pytest.raises(ServerError, match="second") as info:
+        policy.call("GET", "/rib", fn)
+    assert str(info.value.__cause__) == "first"
+    assert fn.calls == 2
+    policy.close()
+
+
+def test_client_close_shuts_the_hedging_threads_down():
+    policy = _warmed_up()
+    assert policy.call("GET", "/rib", Flaky(delays=[0.2])) == "ok"
+    executor = policy._executor
+    BGPRoutesClient(api_key="key", retry=policy).close()
+    assert policy._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(print)
@@ -0,0 +1,47 @@
+import pytest
+
+from pybgproutesapi.utils.shard import RIB_SPLITS, query_size, shard_params
+
+TARGET = 64 * 1024
+
+
+def _params():
+    prefixes = ",".join(f"10.{i // 256}.{i % 256}.0/24" for i in range(5000))          # ~90 KB encoded
+    paths = ",".join(f"{3356 + i} {1299 + i % 7} {64500 + i % 13}" for i in range(5500))  # ~95 KB encoded
+    return {
+        "vp_bgp_ids": ",".join(str(i) for i in range(50)),
+        "date": "2025-05-10T12:00:00",
+        "prefix_exact_match": prefixes,
+        "aspath_exact_match": paths,
+    }
+
+
+def test_two_large_lists_are_budgeted_jointly():
+    params = _params()
+    assert query_size({"p": params["prefix_exact_match"]}) > TARGET
+    assert query_size({"a": params["aspath_exact_match"]}) > TARGET
+
+    shards = shard_params(params, RIB_SPLITS, TARGET)
+
+    assert 1 < len(shards) <= 16
+    assert all(query_size(shard) <= TARGET for shard in shards)
+    # The small VP list is not split.
+    assert all(shard["vp_bgp_ids"] == params["vp_bgp_ids"] for shard in shards)
+
+    # Every (prefix, AS path) combination is queried exactly once.
+    prefixes, paths = params["prefix_exact_match"].split(","), params["aspath_exact_match"].split(",")
+    prefix_parts = {shard["prefix_exact_match"] for shard in shards}
+    path_parts = {shard["aspath_exact_match"] for shard in shards}
+    assert len(shards) == len(prefix_parts) * len(path_parts)
+    assert sorted(v for part in prefix_parts for v in part.split(",")) == sorted(prefixes)
+    assert sorted(v for part in path_parts for v in part.split(",")) == sorted(paths)
+
+
+def test_small_query_is_not_split():
+    params = {"vp_bgp_ids": "1,2,3", "date": "2025-05-10T12:00:00"}
+    assert shard_params(params, RIB_SPLITS, TARGET) == [params]
+
+
+def test_too_many_shards_raises():
+    with pytest.raises(ValueError):
+        shard_params(_params(), RIB_SPLITS, 2048, max_shards=16)
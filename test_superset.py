@@ -0,0 +1,91 @@
+import pytest
+
+from pybgproutesapi import BGPRoutesClient, DiskCache
+from pybgproutesapi.testing import LocalServer
+
+DATE = "2030-01-01T00:00:00"
+START, END = "1970-01-02T00:00:00", DATE
+RETURNS = {"return_rov_status": True, "return_aspa_status": True}
+
+NARROWER = [
+    {"prefix_filter": [("<<", "1.0.0.0/16")]},
+    {"prefix_filter": [(">>=", "1.0.3.0/24"), ("=", "1.0.7.0/24")]},
+    {"prefix_exact_match": ["1.0.3.0/24", "1.0.9.0/24", "2001:db8:2::/48"]},
+    {"data_afi": 6},
+    {"aspath_regexp": "^[0-9]+ [0-9]+ "},
+    {"community_regexp": r":1[0-9][0-9]\y"},
+    {"rov_status_filter": [0]},
+    {"aspa_status_filter": [1, 2]},
+    {"prefix_filter": [("<<", "1.0.0.0/8")], "community_regexp": ":2"},
+]
+
+
+@pytest.fixture(scope="module")
+def server():
+    with LocalServer() as server:
+        yield server
+
+
+@pytest.fixture
+def clients(server, tmp_path):
+    cached = BGPRoutesClient(base_url=server.url, api_key="test", cache=DiskCache(str(tmp_path)))
+    direct = BGPRoutesClient(base_url=server.url, api_key="test")
+    with cached, direct:
+        yield cached, direct
+
+
+def _requests(server):
+    return server.stats.get("requests", 0)
+
+
+@pytest.mark.parametrize("filters", NARROWER)
+def test_rib_from_superset_equals_direct_query(server, clients, filters):
+    cached, direct = clients
+    vps = direct.vantage_points()[:4]
+    assert cached.rib(vps, date=DATE, **RETURNS)
+
+    sent = _requests(server)
+    result = cached.rib(vps, date=DATE, **RETURNS, **filters)
+    assert _requests(server) == sent, "answered from the cached superset"
+    assert result == direct.rib(vps, date=DATE, **RETURNS, **filters)
+
+
+@pytest.mark.parametrize("filters", NARROWER + [{"type_filter": "W"}, {"max_updates_to_return": 5}])
+def test_updates_from_superset_equals_direct_query(server, clients, filters):
+    cached, direct = clients
+    vps = direct.vantage_points()[:2]
+    assert cached.updates(vps, start_date=START, end_date=END, **RETURNS)
+
+    sent = _requests(server)
+    result = cached.updates(vps, start_date=START, end_date=END, **RETURNS, **filters)
+    assert _requests(server) == sent, "answered from the cached superset"
+    assert result == direct.updates(vps, start_date=START, end_date=END, **RETURNS, **filters)
+
+
+@pytest.mark.parametrize("filters, returns", [
+    ({"rov_status_filter": [0]}, {"return_rov_status": False}),
+    ({"aspa_status_filter": [1]}, {"return_aspa_status": False}),
+    ({"aspath_regexp": " 1"}, {"return_aspath": False}),
+    ({"aspath_exact_match": ["1 2 3"]}, {"return_aspath": False}),
+    ({"community_regexp": ":1"}, {"return_community": False}),
+])
+def test_superset_without_needed_field_is_refused(server, clients, filters, returns):
+    cached, direct = clients
+    vps = direct.vantage_points()[:4]
+    assert cached.rib(vps, date=DATE, **returns)
+
+    sent = _requests(server)
+    result = cached.rib(vps, date=DATE, **returns, **filters)
+    assert _requests(server) == sent + 1, "sent to the server"
+    assert result == direct.rib(vps, date=DATE, **returns, **filters)
+
+
+def test_truncated_updates_are_not_a_superset(server, clients):
+    cached, direct = clients
+    vps = direct.vantage_points()[:2]
+    cached.updates(vps, start_date=START, end_date=END, max_updates_to_return=50)
+
+    sent = _requests(server)
+    result = cached.updates(vps, start_date=START, end_date=END, max_updates_to_return=50, type_filter="A")
+    assert _requests(server) == sent + 1
+    assert result == direct.updates(vps, start_date=START, end_date=END, max_updates_to_return=50, type_filter="A")
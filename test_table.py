@@ -0,0 +1,40 @@
+import pytest
+
+from pybgproutesapi import RibTable
+from pybgproutesapi.testing import Fixtures
+
+
+@pytest.fixture(scope="module")
+def rib():
+    rib = Fixtures.synthetic(bgp_vps=3, bmp_vps=2, prefixes=300, updates_per_vp=0, seed=3).rib
+    # Routes without statuses, and an IPv6 prefix.
+    vp_id, routes = next(iter(rib["bgp"].items()))
+    for prefix in list(routes)[:20]:
+        routes[prefix] = routes[prefix][:2] + [None, None, None]
+    routes["2001:db8:1::/48"] = ["64500 {64501,64502}", None, 1, 0, -1]
+    return rib
+
+
+def test_to_dict_round_trip(rib):
+    table = RibTable.from_response(rib)
+    assert len(table) == sum(len(routes) for vps in rib.values() for routes in vps.values())
+    assert table.to_dict() == rib
+    assert RibTable.from_rows(table).to_dict() == rib
+    # Each distinct AS path and community is stored once.
+    assert len(table.paths) == len({route[0] for vps in rib.values() for routes in vps.values()
+                                    for route in routes.values()})
+
+
+def test_where_and_group_by_vp_match_the_response(rib):
+    table = RibTable.from_response(rib)
+    rows = [(proto, vp_id, prefix, route) for proto, vps in rib.items()
+            for vp_id, routes in vps.items() for prefix, route in routes.items()]
+    selected = table.where(rov=[0], feed=[-1], path=lambda aspath: aspath is not None and " 1" in aspath)
+    assert list(selected) == [row for row in rows if row[3][3] == 0 and row[3][4] == -1 and " 1" in row[3][0]]
+    assert list(table.where(afi=6)) == [row for row in rows if ":" in row[2]]
+    assert list(table.where(aspa=[None])) == [row for row in rows if row[3][2] is None]
+
+    groups = table.group_by_vp()
+    assert sorted(groups) == sorted((proto, vp_id) for proto, vps in rib.items() for vp_id in vps)
+    for (proto, vp_id), group in groups.items():
+        assert group.to_dict()[proto] == {vp_id: rib[proto][vp_id]}
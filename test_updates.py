@@ -0,0 +1,32 @@
+from pybgproutesapi.endpoints.updates import _extend_across_boundary
+
+
+def _row(ts, prefix, aspath="64500 64501"):
+    return [ts, "A", prefix, aspath, "", 0, 0, -1]
+
+
+def test_boundary_rows_returned_by_both_windows_are_kept_once():
+    rows = [_row(1, "10.0.0.0/8"), _row(5, "10.0.0.0/8"), _row(5, "10.1.0.0/16")]
+    _extend_across_boundary(rows, [_row(5, "10.1.0.0/16"), _row(5, "10.0.0.0/8"), _row(5, "10.2.0.0/16"),
+                                   _row(7, "10.1.0.0/16")])
+    assert rows == [_row(1, "10.0.0.0/8"), _row(5, "10.0.0.0/8"), _row(5, "10.1.0.0/16"),
+                    _row(5, "10.2.0.0/16"), _row(7, "10.1.0.0/16")]
+
+
+def test_identical_updates_at_the_boundary_are_not_merged():
+    # The same update sent twice in the boundary second, returned twice by both windows.
+    rows = [_row(1, "10.0.0.0/8"), _row(5, "10.0.0.0/8"), _row(5, "10.0.0.0/8")]
+    _extend_across_boundary(rows, [_row(5, "10.0.0.0/8"), _row(5, "10.0.0.0/8"), _row(5, "10.0.0.0/8")])
+    assert rows == [_row(1, "10.0.0.0/8")] + [_row(5, "10.0.0.0/8")] * 3
+
+    # Rows before the boundary are not compared.
+    rows = [_row(1, "10.0.0.0/8"), _row(5, "10.1.0.0/16")]
+    _extend_across_boundary(rows, [_row(5, "10.1.0.0/16"), _row(9, "10.0.0.0/8")])
+    assert rows == [_row(1, "10.0.0.0/8"), _row(5, "10.1.0.0/16"), _row(9, "10.0.0.0/8")]
+
+
+def test_empty_windows():
+    rows = []
+    _extend_across_boundary(rows, [_row(5, "10.0.0.0/8")])
+    _extend_across_boundary(rows, [])
+    assert rows == [_row(5, "10.0.0.0/8")]
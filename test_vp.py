@@ -0,0 +1,80 @@
+import copy
+import pickle
+
+import pytest
+
+from pybgproutesapi.endpoints.vantage_points import parse_vps
+from pybgproutesapi.utils.vp import VPBGP, VPBMP
+
+HISTORY = [["2024-01-01T00:00:00", "up"], ["2024-01-02T00:00:00", "down"]]
+
+
+def _items():
+    return {
+        "bgp": [
+            {"id": 1, "ip": "192.0.2.1", "asn": 64500, "source": "ris", "country": "FR", "org_name": "Example",
+             "status": "up", "status_history": HISTORY, "metadata": {"collector": "rrc00"}},
+            {"id": 2, "ip": "192.0.2.2", "asn": 64501},
+        ],
+        "bmp": [
+            {"id": 3, "ip": "198.51.100.1", "asn": 64502, "peer_id": 7, "rib_history": [1, 2, 3],
+             "bmp_info": {"parent_ip": "203.0.113.1", "parent_asn": 64510, "feed_types": ["2", "1"]}},
+        ],
+    }
+
+
+def test_lazy_fields_are_decoded_on_first_access():
+    bgp, plain, bmp = parse_vps(_items())
+    assert bgp._item == {"status_history": HISTORY, "metadata": {"collector": "rrc00"}}
+    assert bgp.status_history == HISTORY
+    assert bgp._item == {"metadata": {"collector": "rrc00"}}
+    assert bgp.metadata == {"collector": "rrc00"} and bgp.rib_history is None
+    assert bgp._item is None
+    assert plain._item is None and plain.status_history is None
+    assert bmp.rib_history == [1, 2, 3] and bmp.bmp_feed_types == [2, 1]
+
+    bgp.metadata = {"collector": "rrc01"}
+    assert bgp.metadata == {"collector": "rrc01"}
+    with pytest.raises(AttributeError):
+        bgp.unknown = 1
+
+
+def test_equality_and_hash():
+    bgp, plain, bmp = parse_vps(_items())
+    # BGP VPs are identified by their IP, BMP VPs also by their parent and feed types.
+    same = VPBGP(99, "192.0.2.1", 1)
+    assert bgp == same and hash(bgp) == hash(same)
+    assert bgp != plain and bgp != bmp and bgp != "192.0.2.1"
+    assert len({bgp, same, plain}) == 2
+
+    other_feeds = VPBMP(3, "198.51.100.1", 64502, bmp_parent_ip="203.0.113.1", bmp_parent_asn=64510,
+                        bmp_feed_types=[1, 2])
+    assert bmp == other_feeds and hash(bmp) == hash(other_feeds)
+    other_feeds.bmp_feed_types = [1]
+    assert bmp != other_feeds
+
+
+def test_constructor_matches_from_item():
+    _, _, bmp = parse_vps(_items())
+    built = VPBMP(3, "198.51.100.1", 64502, None, None, None, None, None, None, None, None, None, None, None,
+                  None, None, [1, 2, 3], None, None, 7, None, 64510, None, "203.0.113.1", None, [2, 1])
+    for name in VPBMP._FIELDS:
+        assert getattr(built, name) == getattr(bmp, name), name
+    assert built.peering_protocol == "bmp" and VPBGP(1, "192.0.2.1", 1).peering_protocol == "bgp"
+
+
+def test_pickle_and_copy_keep_every_field():
+    for vp in parse_vps(_items()):
+        for clone in (pickle.loads(pickle.dumps(vp)), copy.copy(vp), copy.deepcopy(vp)):
+            assert type(clone) is type(vp) and clone == vp and hash(clone) == hash(vp)
+            assert clone._item is None
+            for name in type(vp)._FIELDS:
+                assert getattr(clone, name) == getattr(vp, name), name
+
+
+def test_repr_and_str():
+    bgp, _, bmp = parse_vps(_items())
+    assert str(bgp) == "1 : bgp - 192.0.2.1 AS64500 [FR] Example | source: ris"
+    assert repr(bgp).startswith("VPBGP(unique_id=1, ip='192.0.2.1', asn=64500, source='ris', ")
+    assert "status_history=[['2024-01-01T00:00:00', 'up']" in repr(bgp)
+    assert repr(bmp) == str(bmp) == "3 : bmp (1, 2) - 198.51.100.1 AS64502"